@@ -0,0 +1,188 @@
+"""Shared fixtures: a stand-in for the UniDesign binary."""
+
+from __future__ import annotations
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+_MAIN_SOURCE = Path(__file__).resolve().parents[2] / "src" / "Main.cpp"
+
+_FAKE_BINARY = '''
+import os
+import random
+import sys
+import time
+
+LONG_OPTIONS = None
+
+
+def usage():
+    print("Usage: UniDesign [OPTIONS]")
+    for name, takes_value in LONG_OPTIONS.items():
+        print(f"   --{name}{'=arg' if takes_value else ''}")
+    sys.exit(0)
+
+
+def parse(argv):
+    """Match long options like getopt_long: exact names or unambiguous abbreviations."""
+
+    parsed = {}
+    position = 0
+    while position < len(argv):
+        argument = argv[position]
+        position += 1
+        if not argument.startswith("--"):
+            continue
+        name, has_value, value = argument[2:].partition("=")
+        matches = [option for option in LONG_OPTIONS if option == name]
+        matches = matches or [option for option in LONG_OPTIONS if option.startswith(name)]
+        if len(matches) != 1 or matches[0] == "help":
+            # Unknown or ambiguous: like the native binary, print the help and exit 0.
+            usage()
+        if LONG_OPTIONS[matches[0]] and not has_value:
+            value = argv[position]
+            position += 1
+        parsed[matches[0]] = value
+    return parsed
+
+
+options = parse(sys.argv[1:])
+
+
+def option(name, default=None):
+    return options.get(name[2:], default)
+
+
+prefix = option("--prefix")
+command = option("--command")
+time.sleep(float(os.environ.get("FAKE_SLEEP", "0")))
+if command == "ProteinDesign":
+    first = int(option("--ntraj_start_ndx", "1"))
+    last = int(option("--ntraj", "1"))
+    fail_at = os.environ.get("FAKE_FAIL_AT")
+    if fail_at and first <= int(fail_at) <= last:
+        print("annealing failed", file=sys.stderr)
+        sys.exit(3)
+    # Like the native annealing: seeded once per process, from the clock by default.
+    seed = int(option("--random_seed", str(int(time.time()))))
+    rng = random.Random(seed)
+    with open(f"{prefix}_bestseqs.txt", "w") as handle:
+        handle.write("# fake header\\n")
+        for index in range(first, last + 1):
+            sequence = "".join(rng.choice("ACDEFGHIKLMNPQRSTVWY") for _ in range(30))
+            handle.write(f"{sequence} {index} 0.5 {-float(index)} 1 2 3 0 seed={seed}\\n")
+    for index in range(first, last + 1):
+        with open(f"{prefix}_beststruct{index:04d}.pdb", "w") as handle:
+            handle.write(f"REMARK trajectory {index}\\n")
+elif command == "BuildMutant":
+    broken = os.environ.get("FAKE_BAD_MUTANTS", "").split(";")
+    with open(option("--mutant_file")) as handle:
+        mutants = [line.strip() for line in handle if line.strip()]
+    for index, mutant in enumerate(mutants, start=1):
+        if mutant in broken:
+            # Like the native binary: the first bad mutation ends the process.
+            print(f"cannot find mutation {mutant}")
+            sys.exit(11)
+        for suffix in ("", "_WT"):
+            with open(f"pdb_Model_{index:04d}{suffix}.pdb", "w") as handle:
+                handle.write(f"REMARK {mutant}{suffix}\\n")
+elif command == "ComputeStability" and option("--pdblist"):
+    with open(option("--pdblist")) as handle:
+        listed = [line.strip() for line in handle if line.strip()]
+    for number, path in enumerate(listed, start=1):
+        print(f"\\nComputeStability structure {number}: {path}")
+        if not os.path.isfile(path):
+            print(f"failed to parse pdb file {path}")
+            continue
+        with open(path) as handle:
+            text = handle.read()
+        print("Structure energy details:")
+        print(f"Total                 =             {-float(len(text))}")
+elif command == "ScreenLigPoses":
+    # Each pose block starts with "POSE <x> <ok|bad>"; RMSD is the distance in x.
+    blocks, block = [], None
+    with open(option("--read_lig_poses")) as handle:
+        for line in handle:
+            if line.startswith("MODEL"):
+                block = []
+            elif line.startswith("ENDMDL"):
+                blocks.append(block)
+            elif block is not None:
+                block.append(line)
+    kept, rejected = [], []
+    for block in blocks:
+        x = float(block[0].split()[1])
+        if option("--scrn_by_orien"):
+            (rejected if block[0].split()[2] == "bad" else kept).append(block)
+        elif all(
+            abs(x - float(other[0].split()[1])) >= float(option("--scrn_by_rmsd"))
+            for other in kept
+        ):
+            kept.append(block)
+    outputs = [(option("--write_lig_poses"), kept)]
+    if option("--scrn_by_orien"):
+        outputs.append((option("--write_lig_poses") + "_BAD_ORNT.pdb", rejected))
+    for path, selected in outputs:
+        with open(path, "w") as handle:
+            for number, lines in enumerate(selected, start=1):
+                handle.write(f"MODEL     {number}\\n{''.join(lines)}ENDMDL\\n")
+else:
+    with open(f"{prefix}_rotlist.txt", "w") as handle:
+        handle.write("A 1 ALA 1\\n")
+    print("Structure energy details:")
+    print("Total                 =             -1.0")
+status = int(os.environ.get("FAKE_EXIT", "0"))
+if status:
+    print("native failure", file=sys.stderr)
+sys.exit(status)
+'''
+
+
+def native_long_options(*, exclude: tuple[str, ...] = ()) -> dict[str, bool]:
+    """Return ``LONG_OPTS`` of ``src/Main.cpp`` as ``{name: takes_value}``."""
+
+    source = _MAIN_SOURCE.read_text(encoding="utf-8")
+    pattern = r'\{"(\w+)",\s*(no|required)_argument'
+    return {
+        name: kind == "required"
+        for name, kind in re.findall(pattern, source)
+        if name not in exclude
+    }
+
+
+def write_fake_binary(path: Path, long_options: dict[str, bool]) -> Path:
+    script = _FAKE_BINARY.replace("LONG_OPTIONS = None", f"LONG_OPTIONS = {long_options!r}")
+    path.write_text(f"#!{sys.executable}\n{script}", encoding="utf-8")
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def fake_binary(tmp_path: Path) -> Path:
+    """Executable mimicking the outputs of ``ProteinDesign`` and the energy commands.
+
+    Options are parsed like ``getopt_long`` does, from the option table of
+    ``src/Main.cpp``; an unknown option prints the help and exits 0. Design
+    trajectories are drawn from ``--random_seed`` or, like the native binary,
+    from the current second. ``ComputeStability --pdblist`` scores each listed
+    file with minus its length as the total. ``ScreenLigPoses`` screens poses
+    written as ``POSE <x> <ok|bad>`` blocks, greedily by distance in ``x`` or by
+    the ``ok``/``bad`` tag for the orientation screen. ``FAKE_SLEEP``,
+    ``FAKE_EXIT``, ``FAKE_FAIL_AT`` (a trajectory index) and
+    ``FAKE_BAD_MUTANTS`` (``;``-separated mutants that stop ``BuildMutant``)
+    inject delays and failures.
+    """
+
+    return write_fake_binary(tmp_path / "UniDesign", native_long_options())
+
+
+@pytest.fixture
+def legacy_binary(tmp_path: Path) -> Path:
+    """:func:`fake_binary` built without the options this package added to the native code."""
+
+    return write_fake_binary(
+        tmp_path / "UniDesign_legacy", native_long_options(exclude=("random_seed",))
+    )
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from unidesign import (
+    ComputeStabilityConfig,
+    UniDesignBatchRunner,
+    UniDesignProcessError,
+    UniDesignRunner,
+    UniDesignTimeoutError,
+)
+from unidesign.jobs import StabilityComputationJob
+
+
+def test_timed_out_jobs_are_reported_as_failed(fake_binary, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_SLEEP", "30")
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+    batch = UniDesignBatchRunner(runner, max_workers=2, timeout=0.5)
+    configs = [ComputeStabilityConfig(pdb_path="/x.pdb") for _ in range(2)]
+
+    started = time.perf_counter()
+    outcomes = batch.run_all(
+        configs, execute=lambda config: StabilityComputationJob(runner, config).run()
+    )
+    assert time.perf_counter() - started < 10
+    assert [outcome.ok for outcome in outcomes] == [False, False]
+    assert all(isinstance(outcome.error, UniDesignTimeoutError) for outcome in outcomes)
+    assert not any(tmp_path.glob("unidesign_*"))
+
+
+def test_async_runs_honour_the_timeout(fake_binary, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_SLEEP", "30")
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+    args = ComputeStabilityConfig(pdb_path="/x.pdb").to_cli_args()
+    with pytest.raises(UniDesignTimeoutError):
+        asyncio.run(runner.run_async(args, timeout=0.5))
+
+
+def test_batch_timeout_must_be_positive(fake_binary):
+    with pytest.raises(ValueError):
+        UniDesignBatchRunner(UniDesignRunner(fake_binary), timeout=0)
+
+
+def test_nonzero_exit_fails_the_outcome(fake_binary, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_EXIT", "3")
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+    batch = UniDesignBatchRunner(runner, max_workers=1)
+
+    [outcome] = batch.run_all([ComputeStabilityConfig(pdb_path="/x.pdb")])
+    assert not outcome.ok and outcome.result is None
+    assert isinstance(outcome.error, UniDesignProcessError)
+    assert outcome.error.result.returncode == 3
+    assert "status 3" in str(outcome.error) and "native failure" in str(outcome.error)
+    with pytest.raises(UniDesignProcessError):
+        outcome.unwrap()
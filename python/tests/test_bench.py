@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from unidesign.bench import RELOCATION_MODES, run_relocation_benchmark
+
+
+def test_relocation_benchmark_counts_copied_bytes(tmp_path):
+    results = run_relocation_benchmark(
+        n_files=3, file_bytes=4096, repeat=1, scratch_dir=tmp_path
+    )
+    assert list(results) == list(RELOCATION_MODES)
+    for mode in ("keep", "rename", "hardlink"):
+        assert (results[mode].files_copied, results[mode].bytes_copied) == (0, 0)
+    assert results["copy"].files_copied == results["copy"].files == 4
+    assert results["copy"].bytes_copied >= 3 * 4000
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from unidesign import ResultCache, UniDesignRunner
+from unidesign.runner import UniDesignRunResult
+
+_ARGS = ["--command", "ComputeStability", "--pdb", "/x.pdb"]
+
+
+def _result(tmp_path: Path, name: str, size: int) -> UniDesignRunResult:
+    workdir = tmp_path / name
+    workdir.mkdir()
+    (workdir / f"{name}_out.txt").write_bytes(b"x" * size)
+    return UniDesignRunResult(
+        args=tuple(_ARGS), returncode=0, stdout="", stderr="", workdir=workdir, prefix=name
+    )
+
+
+def test_repeated_run_hits_the_cache(fake_binary, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path, cache=cache)
+
+    first = runner.run(_ARGS)
+    second = runner.run(_ARGS)
+    assert second.stdout == first.stdout and second.resources is None
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.stores) == (1, 1, 1)
+
+    runner.run([*_ARGS[:-1], "/y.pdb"])
+    assert cache.stats.misses == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=250)
+    for name in ("a", "b"):
+        cache.store(name, _result(tmp_path, name, 100))
+    assert cache.restore("a", tmp_path / "replay", "p", _ARGS) is not None
+
+    cache.store("c", _result(tmp_path, "c", 100))
+    assert cache.stats.evictions == 1
+    assert cache.restore("b", tmp_path / "replay", "p", _ARGS) is None
+    assert cache.restore("a", tmp_path / "replay", "p", _ARGS) is not None
+    assert cache.restore("c", tmp_path / "replay", "p", _ARGS) is not None
+
+
+def test_stores_do_not_rescan_the_directory(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache", max_bytes=350)
+    scans = []
+    original = ResultCache._entries
+    monkeypatch.setattr(
+        ResultCache, "_entries", lambda self: scans.append(1) or original(self)
+    )
+    for index in range(10):
+        cache.store(f"k{index}", _result(tmp_path, f"r{index}", 100))
+    assert scans == [] and cache.stats.evictions == 7
+
+    reopened = ResultCache(tmp_path / "cache", max_bytes=350)
+    assert len(scans) == 1
+    assert reopened.restore("k9", tmp_path / "replay", "p", _ARGS) is not None
+
+
+def test_key_covers_the_default_resource_files(fake_binary, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    weights = fake_binary.parent / "wread" / "weight_all1.wgt"
+    weights.parent.mkdir()
+    weights.write_text("vdw_att 1.0\n", encoding="utf-8")
+    before = cache.key_for(fake_binary, _ARGS)
+
+    weights.write_text("vdw_att 2.00\n", encoding="utf-8")
+    assert cache.key_for(fake_binary, _ARGS) != before
+    custom = [*_ARGS, "--wread", str(tmp_path / "custom.wgt")]
+    first = cache.key_for(fake_binary, custom)
+    weights.write_text("vdw_att 3.000\n", encoding="utf-8")
+    assert cache.key_for(fake_binary, custom) == first
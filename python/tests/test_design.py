@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from unidesign import ProteinDesignConfig, UniDesignError, UniDesignRunner
+from unidesign.jobs.design import ProteinDesignJob, window_configs
+
+
+def _records(result) -> list[list[str]]:
+    path = next(Path(result.workspace).glob("*_bestseqs.txt"))
+    return [
+        line.split()
+        for line in path.read_text(encoding="utf-8").splitlines()
+        if line and not line.startswith("#")
+    ]
+
+
+def test_window_configs_give_each_window_its_own_seed():
+    config = ProteinDesignConfig(pdb_path="/x.pdb", n_trajectories=8)
+    configs = window_configs(config, [(1, 2), (3, 4), (5, 6), (7, 8)])
+    seeds = [entry.random_seed for entry in configs]
+    assert len(set(seeds)) == 4
+    assert all("--random_seed" in entry.to_cli_args() for entry in configs)
+
+
+def test_window_seeds_follow_an_explicit_seed():
+    config = ProteinDesignConfig(pdb_path="/x.pdb", n_trajectories=4, random_seed=100)
+    seeds = [entry.random_seed for entry in window_configs(config, [(1, 2), (3, 4)])]
+    assert seeds == [100, 102]
+
+
+def test_run_sharded_shards_sample_distinct_trajectories(fake_binary, tmp_path):
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+    config = ProteinDesignConfig(pdb_path="/x.pdb", n_trajectories=6)
+    result = ProteinDesignJob(runner, config).run_sharded(6)
+    try:
+        records = _records(result)
+        assert [record[1] for record in records] == [str(index) for index in range(1, 7)]
+        assert len({record[-1] for record in records}) == 6
+        assert len({record[0] for record in records}) == 6
+    finally:
+        result.close()
+
+
+def test_seeded_runs_refuse_a_binary_without_the_seed_option(legacy_binary, tmp_path):
+    runner = UniDesignRunner(legacy_binary, base_working_dir=tmp_path)
+    assert not runner.supports_option("--random_seed")
+    config = ProteinDesignConfig(pdb_path="/x.pdb", n_trajectories=4)
+    with pytest.raises(UniDesignError, match="--random_seed"):
+        ProteinDesignJob(runner, config).run_sharded(2)
+    assert not any(tmp_path.glob("unidesign_*"))
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from unidesign import InputCache, TmpfsWorkdirs, UniDesignRunner
+from unidesign.inputs import STAGED_INPUTS_DIR
+
+_SHM = Path("/dev/shm")
+
+
+@pytest.mark.skipif(not _SHM.is_dir(), reason="needs a tmpfs at /dev/shm")
+def test_prune_keeps_inputs_of_tmpfs_workdirs(fake_binary, tmp_path):
+    if os.stat(tmp_path).st_dev == os.stat(_SHM).st_dev:
+        pytest.skip("the temporary directory is on the tmpfs itself")
+    structure = tmp_path / "protein.pdb"
+    structure.write_text("ATOM\n", encoding="ascii")
+    cache = InputCache(tmp_path / "inputs")
+    runner = UniDesignRunner(
+        fake_binary,
+        base_working_dir=tmp_path,
+        input_cache=cache,
+        tmpfs_workdirs=TmpfsWorkdirs(_SHM, reserve_bytes=1 << 20),
+    )
+
+    args = ["--command", "ComputeStability", "--pdb", str(structure)]
+    run = runner.run(args, persist_workdir=True)
+    try:
+        assert run.workdir.parent == _SHM
+        [staged] = (run.workdir / STAGED_INPUTS_DIR).glob("*/protein.pdb")
+        assert not staged.is_symlink()
+
+        assert cache.prune(0) == 1
+        assert staged.read_text(encoding="ascii") == "ATOM\n"
+    finally:
+        shutil.rmtree(run.workdir, ignore_errors=True)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from unidesign import ComputeStabilityConfig, JobQueue, QueueWorker, UniDesignRunner
+from unidesign.config import config_to_dict
+from unidesign.jobqueue import main
+
+
+def test_nonzero_exit_is_recorded_as_failed(fake_binary, tmp_path, monkeypatch):
+    queue = JobQueue(tmp_path / "queue.db")
+    [job_id] = queue.enqueue([ComputeStabilityConfig(pdb_path="/x.pdb")])
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+
+    monkeypatch.setenv("FAKE_EXIT", "2")
+    job = QueueWorker(queue, runner).run_one()
+    assert job is not None and job.status == "failed"
+
+    [stored] = queue.jobs("failed")
+    assert stored.job_id == job_id
+    assert stored.result is not None and stored.result.returncode == 2
+    assert stored.error is not None
+    assert "status 2" in stored.error and "native failure" in stored.error
+    assert queue.counts()["done"] == 0
+
+
+def test_successful_run_is_recorded_as_done(fake_binary, tmp_path):
+    queue = JobQueue(tmp_path / "queue.db")
+    queue.enqueue([ComputeStabilityConfig(pdb_path="/x.pdb")])
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+
+    job = QueueWorker(queue, runner).run_one()
+    assert job is not None and job.status == "done" and job.error is None
+    [stored] = queue.jobs("done")
+    assert stored.result is not None and stored.result.returncode == 0
+
+
+def test_enqueue_stores_absolute_input_paths(tmp_path, monkeypatch):
+    (tmp_path / "in.pdb").write_text("ATOM\n")
+    monkeypatch.chdir(tmp_path)
+    queue = JobQueue(tmp_path / "queue.db")
+    queue.enqueue([ComputeStabilityConfig(pdb_path="in.pdb")])
+
+    [stored] = queue.jobs("pending")
+    assert stored.config.pdb_path == str((tmp_path / "in.pdb").resolve())
+
+
+def test_enqueue_command_stores_absolute_input_paths(tmp_path, monkeypatch):
+    (tmp_path / "in.pdb").write_text("ATOM\n")
+    configs = tmp_path / "configs.jsonl"
+    configs.write_text(json.dumps(config_to_dict(ComputeStabilityConfig(pdb_path="in.pdb"))) + "\n")
+    monkeypatch.chdir(tmp_path)
+    assert main(["enqueue", str(tmp_path / "queue.db"), str(configs)]) == 0
+
+    [stored] = JobQueue(tmp_path / "queue.db").jobs("pending")
+    assert stored.config.pdb_path == str((tmp_path / "in.pdb").resolve())
+
+
+def test_concurrent_workers_claim_each_job_once(fake_binary, tmp_path):
+    database = tmp_path / "queue.db"
+    queue = JobQueue(database)
+    ids = queue.enqueue(
+        ComputeStabilityConfig(pdb_path=f"/x{index}.pdb") for index in range(24)
+    )
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(Path(__file__).resolve().parents[1]),
+        "FAKE_SLEEP": "0.05",
+    }
+    argv = [
+        sys.executable, "-m", "unidesign.jobqueue", "worker", str(database),
+        "--binary", str(fake_binary), "--poll-interval", "0.1",
+    ]
+    workers = [
+        subprocess.Popen(argv, cwd=tmp_path, env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    reports = [worker.communicate(timeout=120)[0] for worker in workers]
+    assert [worker.returncode for worker in workers] == [0] * 4
+
+    ran = [int(re.search(r"ran (\d+) job", report).group(1)) for report in reports]
+    assert sum(ran) == len(ids)
+    jobs = list(queue.jobs())
+    assert queue.counts()["done"] == len(ids)
+    assert sorted(job.job_id for job in jobs) == sorted(ids)
+    assert all(job.attempts == 1 for job in jobs)
+    assert len({job.worker for job in jobs}) > 1
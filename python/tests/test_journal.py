@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from unidesign import (
+    CampaignJournal,
+    DesignCampaign,
+    ProteinDesignConfig,
+    UniDesignError,
+    UniDesignRunner,
+)
+
+
+def _records(directory: Path) -> list[list[str]]:
+    path = next(directory.glob("*_bestseqs.txt"))
+    return [
+        line.split()
+        for line in path.read_text(encoding="utf-8").splitlines()
+        if line and not line.startswith("#")
+    ]
+
+
+def test_resumed_windows_get_distinct_seeds(fake_binary, tmp_path, monkeypatch):
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+    config = ProteinDesignConfig(pdb_path="/x.pdb", n_trajectories=4)
+    journal_path = tmp_path / "campaign.jsonl"
+
+    monkeypatch.setenv("FAKE_FAIL_AT", "3")
+    with CampaignJournal(journal_path) as journal:
+        [outcome] = DesignCampaign(runner, journal, tmp_path / "out").run([config])
+        assert outcome.status == "failed"
+        assert sorted(journal.windows(outcome.key)) == [(1, 1), (2, 2), (4, 4)]
+
+    monkeypatch.delenv("FAKE_FAIL_AT")
+    with CampaignJournal(journal_path) as journal:
+        [outcome] = DesignCampaign(runner, journal, tmp_path / "out").run([config])
+    assert outcome.status == "completed"
+    records = _records(outcome.artifacts)
+    assert [record[1] for record in records] == ["1", "2", "3", "4"]
+    assert len({record[-1] for record in records}) == 4
+    assert len({record[0] for record in records}) == 4
+
+
+def test_journal_is_locked_while_open(tmp_path):
+    path = tmp_path / "campaign.jsonl"
+    with CampaignJournal(path):
+        with pytest.raises(UniDesignError):
+            CampaignJournal(path)
+        with CampaignJournal(path, read_only=True) as reader:
+            assert reader.status()["complete"] == 0
+    CampaignJournal(path).close()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from unidesign.config import BuildMutantConfig
+from unidesign.jobs.mutation import MutationScanJob
+from unidesign.runner import UniDesignRunner
+
+
+@pytest.fixture
+def structure(tmp_path):
+    path = tmp_path / "protein.pdb"
+    lines = [
+        f"ATOM  {serial:5d}  CA  {name} A{serial:4d}    "
+        f"{float(serial):8.3f}{0.0:8.3f}{0.0:8.3f}  1.00  0.00           C"
+        for serial, name in enumerate(("SER", "ALA", "GLY", "LYS"), start=1)
+    ]
+    path.write_text("\n".join(lines) + "\nEND\n", encoding="ascii")
+    return path
+
+
+def _scan(fake_binary, tmp_path, structure, mutants):
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+    job = MutationScanJob(runner, BuildMutantConfig(pdb_path=structure), mutants)
+    return job.run(max_workers=1)
+
+
+def test_missing_residues_fail_only_their_own_mutant(fake_binary, tmp_path, structure):
+    result = _scan(fake_binary, tmp_path, structure, ["SA1G", "AB2G", "AA2V", "GA9W", "KA4R"])
+    assert sorted(result.failures) == ["AB2G", "GA9W"]
+    assert "B2" in result.failures["AB2G"]
+    assert [math.isnan(value) for value in result.energies] == [
+        False, True, False, True, False
+    ]
+
+
+def test_binary_exit_rebuilds_the_rest_of_the_chunk(
+    fake_binary, tmp_path, structure, monkeypatch
+):
+    monkeypatch.setenv("FAKE_BAD_MUTANTS", "AA2V;GA3W")
+    result = _scan(fake_binary, tmp_path, structure, ["SA1G", "AA2V", "GA3W", "KA4R", "SA1T"])
+    assert sorted(result.failures) == ["AA2V", "GA3W"]
+    assert "cannot find mutation AA2V" in result.failures["AA2V"]
+    assert not math.isnan(result.energies[3]) and not math.isnan(result.energies[4])
+    assert not list(tmp_path.glob("unidesign_*"))
+
+
+def test_each_chunk_is_scored_by_one_process(fake_binary, tmp_path, structure, monkeypatch):
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+    commands: list[str] = []
+    run = runner.run
+
+    def counting_run(args, **kwargs):
+        commands.append(args[args.index("--command") + 1])
+        return run(args, **kwargs)
+
+    monkeypatch.setattr(runner, "run", counting_run)
+    mutants = ["SA1G", "AA2V", "GA3W", "KA4R", "SA1T", "AA2L"]
+    job = MutationScanJob(runner, BuildMutantConfig(pdb_path=structure), mutants)
+    result = job.run(max_workers=2)
+    assert not result.failures
+    assert sorted(commands) == ["BuildMutant"] * 2 + ["ComputeStability"] * 2
+
+
+def test_mutants_are_compared_with_the_repacked_wild_type(fake_binary, tmp_path, structure):
+    result = _scan(fake_binary, tmp_path, structure, ["SA1G", "KA4R"])
+    # The fake scores a model by its length: "REMARK SA1G" against "REMARK SA1G_WT".
+    assert result.energies.tolist() == [-12.0, -12.0]
+    assert result.reference_energies.tolist() == [-15.0, -15.0]
+    assert result.ddg.tolist() == [3.0, 3.0]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tarfile
+from pathlib import Path
+
+from unidesign import ArtifactPack
+
+_APPENDER = """
+import sys
+from pathlib import Path
+from unidesign import ArtifactPack
+
+pack_path, source_dir, worker = sys.argv[1], Path(sys.argv[2]), sys.argv[3]
+with ArtifactPack(pack_path, fsync=False) as pack:
+    for index in range(20):
+        source = source_dir / f"{worker}_{index}.txt"
+        source.write_text(f"{worker}:{index}\\n" * (index + 1), encoding="utf-8")
+        pack.add_files({f"{worker}/{index}.txt": source})
+"""
+
+
+def _write(path: Path, text: str) -> Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_appended_members_read_back_after_reopen(tmp_path):
+    archive = tmp_path / "runs.tar"
+    with ArtifactPack(archive) as pack:
+        pack.add_files({"a/out.txt": _write(tmp_path / "a.txt", "first\n")})
+        pack.add_files({"b/out.txt": _write(tmp_path / "b.txt", "second\n" * 200)})
+        assert pack.read_bytes("a/out.txt") == b"first\n"
+
+    with ArtifactPack(archive) as pack:
+        assert pack.names() == ["a/out.txt", "b/out.txt"]
+        assert pack.read_bytes("b/out.txt") == b"second\n" * 200
+    with tarfile.open(archive) as tar:
+        assert tar.getnames() == ["a/out.txt", "b/out.txt"]
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    archive = tmp_path / "runs.tar"
+    with ArtifactPack(archive) as pack:
+        pack.add_files({"a/out.txt": _write(tmp_path / "a.txt", "kept\n")})
+    size = archive.stat().st_size
+    # A writer that died mid-append leaves a header without its data.
+    info = tarfile.TarInfo("b/out.txt")
+    info.size = 4096
+    with archive.open("ab") as handle:
+        handle.write(info.tobuf(format=tarfile.PAX_FORMAT) + b"partial")
+
+    with ArtifactPack(archive) as pack:
+        assert archive.stat().st_size == size
+        assert pack.names() == ["a/out.txt"]
+        pack.add_files({"c/out.txt": _write(tmp_path / "c.txt", "after\n")})
+        assert pack.read_bytes("a/out.txt") == b"kept\n"
+        assert pack.read_bytes("c/out.txt") == b"after\n"
+
+
+def test_missing_index_is_rebuilt_from_the_archive(tmp_path):
+    archive = tmp_path / "runs.tar"
+    with ArtifactPack(archive) as pack:
+        for name in ("a", "b", "c"):
+            pack.add_files({f"{name}/out.txt": _write(tmp_path / name, name * 600)})
+    index = archive.with_name(archive.name + ".index")
+    index.unlink()
+
+    with ArtifactPack(archive) as pack:
+        assert pack.names() == ["a/out.txt", "b/out.txt", "c/out.txt"]
+        assert pack.read_bytes("b/out.txt") == b"b" * 600
+    assert len(index.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_concurrent_appends_from_several_processes(tmp_path):
+    archive = tmp_path / "runs.tar"
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])}
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", _APPENDER, str(archive), str(tmp_path), f"w{worker}"],
+            env=env,
+        )
+        for worker in range(4)
+    ]
+    assert [worker.wait(timeout=120) for worker in workers] == [0] * 4
+
+    expected = {f"w{worker}/{index}.txt" for worker in range(4) for index in range(20)}
+    with ArtifactPack(archive) as pack:
+        assert set(pack.names()) == expected
+        for name in expected:
+            worker, index = name.removesuffix(".txt").split("/")
+            assert pack.read_bytes(name) == f"{worker}:{index}\n".encode() * (int(index) + 1)
+    with tarfile.open(archive) as tar:
+        assert sorted(tar.getnames()) == sorted(expected)
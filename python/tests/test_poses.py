@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from unidesign import ScreenLigPosesConfig, UniDesignRunner
+from unidesign.jobs import LigandPoseScreeningJob
+from unidesign.poses import iter_pose_blocks
+
+
+def _write_poses(path: Path, poses: list[tuple[float, str]]) -> Path:
+    path.write_text(
+        "".join(
+            f"MODEL     {number}\nPOSE {x} {tag}\nENDMDL\n"
+            for number, (x, tag) in enumerate(poses, start=1)
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+def _xs(path: Path) -> list[float]:
+    return [float(block[0].split()[1]) for block in iter_pose_blocks(path)]
+
+
+@pytest.fixture
+def runner(fake_binary, tmp_path):
+    return UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+
+
+def test_rmsd_screen_matches_a_single_pass_by_default(runner, tmp_path, monkeypatch):
+    # Chunked as [5, 0] and [1, 2], 2 is dropped against 1, which the merge
+    # pass then drops against 0; a single pass keeps 2.
+    source = _write_poses(tmp_path / "poses.pdb", [(5, "ok"), (0, "ok"), (1, "ok"), (2, "ok")])
+    config = ScreenLigPosesConfig(ligand_pose_input=source, ligand_rmsd_cutoff=1.5)
+    commands = []
+    run = runner.run
+    monkeypatch.setattr(runner, "run", lambda args, **kw: commands.append(args) or run(args, **kw))
+
+    result = LigandPoseScreeningJob(runner, config).run(max_workers=2)
+    try:
+        assert _xs(result.pose_file) == [5, 0, 2] and result.pose_count == 3
+        assert len(commands) == 1 and result.rejected_pose_file is None
+    finally:
+        result.close()
+
+    chunked = LigandPoseScreeningJob(runner, config).run(max_workers=2, chunk_size=2)
+    try:
+        assert _xs(chunked.pose_file) == [5, 0]
+    finally:
+        chunked.close()
+
+
+def test_orientation_screen_keeps_the_rejected_poses(runner, tmp_path):
+    poses = [(0, "ok"), (1, "bad"), (2, "ok"), (3, "bad"), (4, "bad"), (5, "ok")]
+    source = _write_poses(tmp_path / "poses.pdb", poses)
+    config = ScreenLigPosesConfig(
+        ligand_pose_input=source,
+        ligand_orientation_screen=tmp_path / "orien.txt",
+        pdb_path=tmp_path / "scaffold.pdb",
+    )
+
+    result = LigandPoseScreeningJob(runner, config).run(max_workers=3)
+    try:
+        assert _xs(result.pose_file) == [0, 2, 5]
+        assert result.rejected_pose_file is not None
+        assert result.rejected_pose_file.name == "LIG_POSES2.pdb_BAD_ORNT.pdb"
+        assert _xs(result.rejected_pose_file) == [1, 3, 4]
+    finally:
+        result.close()
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from unidesign import ResultStore
+
+
+def test_top_k_fills_strings_missing_from_the_first_chunk(tmp_path):
+    store = ResultStore(tmp_path / "store", chunk_rows=1, format="npz")
+    store.append({"energy": -1.0})
+    store.append({"energy": -3.0, "label": "best"})
+    store.append({"energy": -2.0, "label": "next"})
+
+    top = store.query().top_k(3, "energy", columns=["label"])
+    assert top["energy"].tolist() == [-3.0, -2.0, -1.0]
+    assert top["label"].tolist() == ["best", "next", ""]
+    assert store.query().rows(["label"])["label"].tolist() == ["", "best", "next"]
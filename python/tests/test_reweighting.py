@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import numpy as np
+
+from unidesign.energy_terms import ENERGY_TERMS, EnergyBreakdownBatch
+from unidesign.reweighting import ReweightingEngine
+
+
+def test_save_and_load_round_trip(tmp_path):
+    matrix = np.arange(2 * len(ENERGY_TERMS), dtype=np.float64).reshape(2, -1)
+    engine = ReweightingEngine(
+        EnergyBreakdownBatch(matrix, matrix.sum(axis=1), ["first", "second"]),
+        ["/a.pdb", "/b.pdb"],
+        failures={"/c.pdb": "no energy details"},
+    )
+
+    path = engine.save(tmp_path / "terms")
+    assert path == tmp_path / "terms.npz" and path.is_file()
+    loaded = ReweightingEngine.load(path)
+    np.testing.assert_array_equal(loaded.terms.matrix, matrix)
+    np.testing.assert_array_equal(loaded.terms.totals, engine.terms.totals)
+    assert loaded.terms.labels.tolist() == ["first", "second"]
+    assert loaded.keys.tolist() == ["/a.pdb", "/b.pdb"]
+    assert loaded.failures == {"/c.pdb": "no energy details"}
+    assert ReweightingEngine.load(tmp_path / "terms").keys.tolist() == ["/a.pdb", "/b.pdb"]
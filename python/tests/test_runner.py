@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from unidesign import ComputeStabilityConfig, ResultCache, UniDesignRunner
+from unidesign.jobs import StabilityComputationJob
+
+_ARGS = ["--command", "ComputeStability", "--pdb", "/x.pdb"]
+
+
+def test_async_run_stores_outputs_that_a_sync_run_restores(fake_binary, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path, cache=cache)
+
+    first = asyncio.run(runner.run_async(_ARGS))
+    assert not first.workdir.exists()
+    assert cache.stats.stores == 1
+
+    second = runner.run(_ARGS, persist_workdir=True)
+    assert cache.stats.hits == 1
+    restored = second.workdir / f"{second.prefix}_rotlist.txt"
+    assert restored.read_text(encoding="utf-8") == "A 1 ALA 1\n"
+
+
+def test_cache_skips_runs_whose_workdir_is_gone(fake_binary, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+
+    result = runner.run(_ARGS)
+    cache.store("key", result)
+    assert cache.stats.stores == 0
+
+
+def test_async_jobs_collect_outputs_off_the_event_loop(fake_binary, tmp_path, monkeypatch):
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+    job = StabilityComputationJob(runner, ComputeStabilityConfig(pdb_path="/x.pdb"))
+    threads = []
+    collect = job._collect
+    monkeypatch.setattr(
+        job, "_collect", lambda *args: threads.append(threading.get_ident()) or collect(*args)
+    )
+
+    async def main():
+        result = await job.run_async()
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(main())
+    try:
+        assert result.energy_breakdown() is not None and result.rotamer_list is not None
+        assert threads and threads[0] != loop_thread
+    finally:
+        result.close()
+
+
+def test_failed_run_removes_a_persisted_workdir(fake_binary, tmp_path, monkeypatch):
+    runner = UniDesignRunner(fake_binary, base_working_dir=tmp_path)
+
+    def fail(argv, prefix, workdir, *args):
+        (workdir / "partial.txt").write_text("", encoding="utf-8")
+        raise OSError("cannot launch")
+
+    monkeypatch.setattr(runner, "_run_started", fail)
+    with pytest.raises(OSError, match="cannot launch"):
+        runner.run(_ARGS, persist_workdir=True)
+    assert not list(tmp_path.glob("unidesign_*"))
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from unidesign.sequences import SequenceRecord, SequenceStore
+
+
+def test_save_returns_the_file_it_wrote(tmp_path):
+    store = SequenceStore.from_records(
+        [SequenceRecord("ACD", 1, 0.5, -3.0), SequenceRecord("EFG", 2, 0.25, -1.0)]
+    )
+    saved = store.save(tmp_path / "designs")
+    assert saved == tmp_path / "designs.npz"
+    assert saved.is_file()
+    assert [record.sequence for record in SequenceStore.load(saved)] == ["ACD", "EFG"]
+    assert len(SequenceStore.load(tmp_path / "designs")) == 2
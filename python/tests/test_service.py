@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from unidesign import ComputeStabilityConfig, UniDesignError, UniDesignServiceClient
+from unidesign.inputs import resolve_config_paths
+from unidesign.service import main
+
+
+def test_resolve_config_paths_only_rewrites_existing_inputs(tmp_path):
+    (tmp_path / "x.pdb").write_text("END\n", encoding="utf-8")
+    config = ComputeStabilityConfig(pdb_path="x.pdb", weight_file="missing.wgt")
+    resolved = resolve_config_paths(config, tmp_path)
+    assert resolved.pdb_path == str(tmp_path / "x.pdb")
+    assert resolved.weight_file == "missing.wgt"
+    assert resolve_config_paths(resolved, tmp_path) is resolved
+
+
+@pytest.fixture
+def service_socket(fake_binary, tmp_path):
+    """A service process whose working directory differs from the client's."""
+
+    socket_path = tmp_path / "service.sock"
+    server_dir = tmp_path / "server"
+    server_dir.mkdir()
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])}
+    argv = [sys.executable, "-m", "unidesign.service", "--binary", str(fake_binary)]
+    argv += ["--socket", str(socket_path), "--workers", "1", "--prewarm", "0"]
+    process = subprocess.Popen(
+        argv,
+        cwd=server_dir,
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert process.stdout is not None and process.stdout.readline().startswith("unix://")
+        yield socket_path
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def test_batch_sends_paths_relative_to_the_client(service_socket, tmp_path, monkeypatch):
+    client_dir = tmp_path / "client"
+    client_dir.mkdir()
+    (client_dir / "x.pdb").write_text("END\n", encoding="utf-8")
+    monkeypatch.chdir(client_dir)
+
+    client = UniDesignServiceClient(service_socket, timeout=30)
+    [outcome] = list(client.map([ComputeStabilityConfig(pdb_path="x.pdb")]))
+    result = outcome.unwrap()
+    assert str(client_dir / "x.pdb") in result.args
+    assert str(client_dir / "x.pdb") in client.run(ComputeStabilityConfig(pdb_path="x.pdb")).args
+
+
+def test_socket_is_private_to_its_owner(service_socket):
+    assert stat.S_IMODE(service_socket.stat().st_mode) == 0o600
+
+
+def test_env_outside_the_allowlist_is_refused(service_socket):
+    client = UniDesignServiceClient(service_socket, timeout=30)
+    config = ComputeStabilityConfig(pdb_path="/x.pdb")
+    with pytest.raises(UniDesignError, match="400.*LD_PRELOAD"):
+        client.run(config, env={"LD_PRELOAD": "/tmp/evil.so"})
+    assert client.run(config, env={"OMP_NUM_THREADS": "1"}).returncode == 0
+
+
+def test_remote_host_needs_an_explicit_opt_in(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main(["--host", "0.0.0.0"])
+    assert excinfo.value.code == 2
+    assert "--allow-remote" in capsys.readouterr().err
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from unidesign.structure import parse_pdb_atoms
+
+
+def _atom(serial: str, resseq: str) -> str:
+    return (
+        f"ATOM  {serial:>5} CA   ALA A{resseq:>4}    "
+        "  11.104   6.134  -6.504  1.00  0.00           C\n"
+    )
+
+
+def test_overflowed_serials_parse_leniently():
+    text = "".join(
+        [
+            _atom("99999", "9999"),
+            _atom("A0000", "A000"),
+            _atom("a0000", "1"),
+            _atom("*****", "****"),
+            _atom("", "2"),
+        ]
+    )
+    atoms = parse_pdb_atoms(text.encode("ascii"))
+    assert atoms["serial"].tolist() == [99999, 100000, 43770016, -1, -1]
+    assert atoms["resseq"].tolist() == [9999, 10000, 1, -1, 2]
+    assert atoms["name"].tolist() == [b"CA"] * 5
+    assert atoms["xyz"][0].tolist() == [11.104, 6.134, -6.504]
@@ -2,38 +2,121 @@
 
 from __future__ import annotations
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from .batch import BatchOutcome, UniDesignBatchRunner
+from .cache import CacheStats, ResultCache
 from .config import (
+    AnalyzeLigPosesConfig,
+    BuildMutantConfig,
     CommandConfig,
     ComputeBindingConfig,
     ComputeStabilityConfig,
     MakeLigParamConfig,
+    MakeLigPosesConfig,
     ProteinDesignConfig,
+    ScreenLigPosesConfig,
+)
+from .exceptions import (
+    BinaryDiscoveryError,
+    UniDesignError,
+    UniDesignProcessError,
+    UniDesignTimeoutError,
 )
-from .exceptions import BinaryDiscoveryError, UniDesignError
+from .inputs import InputCache
 from .jobs import (
     BindingComputationJob,
     BindingComputationResult,
     LigandParameterizationJob,
     LigandParameterizationResult,
+    LigandParameterStore,
+    LigandPoseAnalysisJob,
+    LigandPoseAnalysisResult,
+    LigandPosePlacementJob,
+    LigandPoseResult,
+    LigandPoseScreeningJob,
+    MutationScanJob,
+    MutationScanResult,
     ProteinDesignJob,
     ProteinDesignResult,
     StabilityComputationJob,
     StabilityComputationResult,
 )
+from .packs import ArtifactPack
 from .paths import discover_binary
-from .runner import UniDesignRunResult, UniDesignRunner
+from .resources import ResourceSummary, RunResources
+from .results import ResultStore
+from .runner import UniDesignRunResult, UniDesignRunner, UniDesignRunStream
+from .tracing import InMemoryTracer, Tracer, write_chrome_trace
+from .workdirs import TmpfsWorkdirs, WorkdirPool
+
+if TYPE_CHECKING:  # pragma: no cover - resolved lazily by __getattr__
+    from .jobqueue import JobQueue, QueueWorker
+    from .journal import CampaignJournal, DesignCampaign
+    from .service import UniDesignService, UniDesignServiceClient
+
+# The command-line modules are imported on first use, so that
+# ``python -m unidesign.<module>`` does not run a second copy of a module the
+# package already imported, and ``import unidesign`` does not pull in sqlite3
+# or http.server.
+_LAZY_EXPORTS = {
+    "JobQueue": "jobqueue",
+    "QueueWorker": "jobqueue",
+    "CampaignJournal": "journal",
+    "DesignCampaign": "journal",
+    "UniDesignService": "service",
+    "UniDesignServiceClient": "service",
+}
+
+
+def __getattr__(name: str) -> object:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "discover_binary",
     "BinaryDiscoveryError",
     "UniDesignError",
+    "UniDesignProcessError",
+    "UniDesignTimeoutError",
     "UniDesignRunner",
     "UniDesignRunResult",
+    "UniDesignRunStream",
+    "UniDesignService",
+    "UniDesignServiceClient",
+    "WorkdirPool",
+    "TmpfsWorkdirs",
+    "ArtifactPack",
+    "InputCache",
+    "JobQueue",
+    "QueueWorker",
+    "CampaignJournal",
+    "DesignCampaign",
+    "RunResources",
+    "ResourceSummary",
+    "ResultStore",
+    "Tracer",
+    "InMemoryTracer",
+    "write_chrome_trace",
+    "UniDesignBatchRunner",
+    "BatchOutcome",
+    "ResultCache",
+    "CacheStats",
     "CommandConfig",
     "ProteinDesignConfig",
     "ComputeStabilityConfig",
     "ComputeBindingConfig",
+    "BuildMutantConfig",
     "MakeLigParamConfig",
+    "MakeLigPosesConfig",
+    "ScreenLigPosesConfig",
+    "AnalyzeLigPosesConfig",
     "ProteinDesignJob",
     "ProteinDesignResult",
     "StabilityComputationJob",
@@ -42,4 +125,12 @@ __all__ = [
     "BindingComputationResult",
     "LigandParameterizationJob",
     "LigandParameterizationResult",
+    "LigandParameterStore",
+    "MutationScanJob",
+    "MutationScanResult",
+    "LigandPosePlacementJob",
+    "LigandPoseScreeningJob",
+    "LigandPoseResult",
+    "LigandPoseAnalysisJob",
+    "LigandPoseAnalysisResult",
 ]
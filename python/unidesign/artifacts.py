@@ -2,10 +2,29 @@
 
 from __future__ import annotations
 
+import io
 import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import ClassVar, Dict, Optional
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    Iterator,
+    Mapping,
+    Optional,
+    TypeVar,
+)
+
+import numpy as np
+
+from .sequences import SequenceRecord, SequenceStore, iter_sequence_records
+from .structure import load_atoms, parse_pdb_atoms
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .packs import ArtifactPack, PackedMember
 
 
 @dataclass(slots=True)
@@ -15,21 +34,40 @@ class UniDesignArtifact:
     path: Path
     prefix: str
     logical_name: str
+    member: PackedMember | None = None
+    """Archive member holding the contents when outputs went to an
+    :class:`~unidesign.packs.ArtifactPack`; ``path`` is then only a label."""
 
     def read_text(self, encoding: str = "utf-8", errors: str = "strict") -> str:
         """Return the textual contents of the artifact."""
 
+        if self.member is not None:
+            return self.member.read_bytes().decode(encoding, errors)
         return self.path.read_text(encoding=encoding, errors=errors)
 
     def read_bytes(self) -> bytes:
         """Return the binary contents of the artifact."""
 
+        if self.member is not None:
+            return self.member.read_bytes()
         return self.path.read_bytes()
 
     def open(self, mode: str = "r", *args, **kwargs):
-        """Open the underlying file handle."""
+        """Open the underlying file handle.
+
+        Packed artifacts only support the read modes ``"r"``/``"rt"`` (which
+        accept the keyword arguments of :class:`io.TextIOWrapper`) and ``"rb"``.
+        """
 
-        return self.path.open(mode, *args, **kwargs)
+        if self.member is None:
+            return self.path.open(mode, *args, **kwargs)
+        if mode not in ("r", "rt", "rb"):
+            raise ValueError(f"packed artifacts are read-only (mode {mode!r})")
+        handle = self.member.open()
+        if mode == "rb":
+            return handle
+        kwargs.setdefault("encoding", "utf-8")
+        return io.TextIOWrapper(handle, *args, **kwargs)
 
     def default_filename(self) -> str:
         """Return the filename used when persisting the artifact."""
@@ -50,7 +88,10 @@ class UniDesignArtifact:
 
         target_dir.mkdir(parents=True, exist_ok=True)
         destination = target_dir / (filename or self.default_filename())
-        shutil.copy2(self.path, destination)
+        if self.member is not None:
+            destination.write_bytes(self.member.read_bytes())
+        else:
+            shutil.copy2(self.path, destination)
         return destination
 
 
@@ -103,6 +144,25 @@ class DesignSequenceSet(_PrefixedArtifact):
         "best_sequences": "_bestseqs",
     }
 
+    def iter_records(self) -> Iterator[SequenceRecord]:
+        """Stream the sequence records without loading the whole file."""
+
+        if self.member is None:
+            return iter_sequence_records(self.path)
+        return self._iter_packed_records()
+
+    def _iter_packed_records(self) -> Iterator[SequenceRecord]:
+        with self.open("r") as handle:
+            yield from iter_sequence_records(handle)
+
+    def to_store(self) -> SequenceStore:
+        """Pack every record into a compact :class:`~unidesign.sequences.SequenceStore`."""
+
+        if self.member is None:
+            return SequenceStore.from_file(self.path)
+        with self.open("r") as handle:
+            return SequenceStore.from_file(handle)
+
 
 @dataclass(slots=True)
 class StructureModel(_PrefixedArtifact):
@@ -112,6 +172,24 @@ class StructureModel(_PrefixedArtifact):
         "best_structure": "_beststruct.pdb",
     }
 
+    def atoms(self, *, cache: bool = True) -> np.ndarray:
+        """Return the atoms as a :data:`~unidesign.structure.ATOM_DTYPE` structured array.
+
+        The parsed array is cached in a ``.atoms.npy`` sidecar next to the
+        model and memory-mapped on later calls; see
+        :func:`~unidesign.structure.load_atoms`. Packed models are parsed
+        from the archive on every call.
+        """
+
+        if self.member is not None:
+            return parse_pdb_atoms(self.member.read_bytes())
+        return load_atoms(self.path, cache=cache)
+
+    def coordinates(self, *, cache: bool = True) -> np.ndarray:
+        """Return an ``(n_atoms, 3)`` view of the atom coordinates."""
+
+        return self.atoms(cache=cache)["xyz"]
+
 
 @dataclass(slots=True)
 class SiteSummary(_PrefixedArtifact):
@@ -152,8 +230,95 @@ class LigandTopology(UniDesignArtifact):
         return super().default_filename()
 
 
+A = TypeVar("A", bound=UniDesignArtifact)
+
+
+class TrajectoryArtifacts(Mapping[int, A], Generic[A]):
+    """Per-trajectory artifacts (``PREFIX_beststruct0001.pdb`` ...) keyed by trajectory index.
+
+    The collection is built from a single directory listing and only holds file
+    names; artifact objects are created on first access. With ``pack`` the
+    files are members ``<directory name>/<filename>`` of that archive.
+    """
+
+    __slots__ = (
+        "_directory",
+        "_prefix",
+        "_logical_name",
+        "_filenames",
+        "_factory",
+        "_cache",
+        "_pack",
+    )
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str,
+        logical_name: str,
+        filenames: Mapping[int, str],
+        factory: Callable[..., A],
+        pack: ArtifactPack | None = None,
+    ) -> None:
+        self._directory = directory
+        self._prefix = prefix
+        self._logical_name = logical_name
+        self._filenames = dict(sorted(filenames.items()))
+        self._factory = factory
+        self._cache: dict[int, A] = {}
+        self._pack = pack
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def indices(self) -> tuple[int, ...]:
+        """Trajectory indices present in the collection, in ascending order."""
+
+        return tuple(self._filenames)
+
+    def path(self, index: int) -> Path:
+        """Return the file path for trajectory ``index`` without creating an artifact."""
+
+        return self._directory / self._filenames[index]
+
+    def first(self) -> A | None:
+        """Return the artifact with the lowest trajectory index, if any."""
+
+        for index in self._filenames:
+            return self[index]
+        return None
+
+    def __getitem__(self, index: int) -> A:
+        artifact = self._cache.get(index)
+        if artifact is None:
+            artifact = self._factory(
+                path=self.path(index), prefix=self._prefix, logical_name=self._logical_name
+            )
+            if self._pack is not None:
+                artifact.member = self._pack.member(
+                    f"{self._directory.name}/{self._filenames[index]}"
+                )
+            self._cache[index] = artifact
+        return artifact
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._filenames)
+
+    def __len__(self) -> int:
+        return len(self._filenames)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self._logical_name!r}, "
+            f"indices={list(self._filenames)!r}, directory={str(self._directory)!r})"
+        )
+
+
 __all__ = [
     "UniDesignArtifact",
+    "TrajectoryArtifacts",
     "SelfEnergyReport",
     "RotamerList",
     "DesignRotamerIndices",
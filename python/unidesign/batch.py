@@ -0,0 +1,217 @@
+"""Bounded-concurrency batch execution of UniDesign commands."""
+
+from __future__ import annotations
+
+import contextvars
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, Iterator, Mapping, TypeVar
+
+from .config import CommandConfig
+from .exceptions import UniDesignProcessError
+from .runner import UniDesignRunner, UniDesignRunResult, run_timeout
+
+
+T = TypeVar("T")
+
+_STDERR_TAIL_LINES = 20
+"""Lines of standard error quoted in the error of a process that failed."""
+
+
+def default_worker_count() -> int:
+    """Return the number of CPU cores available to this process."""
+
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+@dataclass(slots=True)
+class BatchOutcome(Generic[T]):
+    """Outcome of a single configuration executed by :class:`UniDesignBatchRunner`."""
+
+    index: int
+    """Position of the configuration in the submitted iterable."""
+
+    config: CommandConfig
+    """Configuration that produced this outcome."""
+
+    result: T | None
+    """Value returned by the executor, or ``None`` when it raised."""
+
+    error: BaseException | None
+    """Exception raised while executing the configuration, if any."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the configuration executed without raising."""
+
+        return self.error is None
+
+    def unwrap(self) -> T:
+        """Return :attr:`result`, re-raising :attr:`error` when execution failed."""
+
+        if self.error is not None:
+            raise self.error
+        return self.result  # type: ignore[return-value]
+
+
+class UniDesignBatchRunner:
+    """Execute many configurations concurrently through a :class:`UniDesignRunner`.
+
+    Each configuration already runs in its own UniDesign process, so the batch
+    runner drives them from a thread pool rather than a process pool; the
+    threads only wait on the children and no configuration has to be pickled.
+    At most ``max_pending`` configurations are pulled from the input iterable
+    ahead of completion, which keeps memory bounded for very large campaigns.
+    Each configuration runs in a copy of the submitting thread's context, so
+    its spans nest under the caller's current :mod:`~unidesign.tracing` span.
+
+    With ``timeout`` set, every UniDesign process a configuration starts is
+    killed after that many seconds, including those started by a custom
+    ``execute`` callable; the configuration's outcome then carries a
+    :class:`~unidesign.exceptions.UniDesignTimeoutError`.
+    """
+
+    def __init__(
+        self,
+        runner: UniDesignRunner,
+        *,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        workers = max_workers if max_workers is not None else default_worker_count()
+        if workers <= 0:
+            raise ValueError("max_workers must be positive")
+        pending = max_pending if max_pending is not None else 2 * workers
+        if pending < workers:
+            raise ValueError("max_pending must be at least max_workers")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self._runner = runner
+        self._max_workers = workers
+        self._max_pending = pending
+        self._timeout = timeout
+
+    @property
+    def runner(self) -> UniDesignRunner:
+        return self._runner
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def timeout(self) -> float | None:
+        return self._timeout
+
+    def _default_execute(
+        self, env: Mapping[str, str] | None
+    ) -> Callable[[CommandConfig], UniDesignRunResult]:
+        def _execute(config: CommandConfig) -> UniDesignRunResult:
+            result = self._runner.run(config.to_cli_args(), env=env)
+            if result.returncode != 0:
+                message = f"UniDesign exited with status {result.returncode}"
+                tail = result.stderr.strip().splitlines()[-_STDERR_TAIL_LINES:]
+                raise UniDesignProcessError(
+                    "\n".join([f"{message}:", *tail]) if tail else message, result=result
+                )
+            return result
+
+        return _execute
+
+    def map(
+        self,
+        configs: Iterable[CommandConfig],
+        *,
+        execute: Callable[[CommandConfig], T] | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> Iterator[BatchOutcome[T]]:
+        """Run ``configs`` concurrently and yield outcomes as they complete.
+
+        Parameters
+        ----------
+        configs:
+            Iterable of configuration objects. It is consumed lazily.
+        execute:
+            Callable invoked for every configuration, e.g. a function that
+            wraps a job class. Defaults to :meth:`UniDesignRunner.run` on the
+            rendered CLI arguments; a process that exits with a nonzero status
+            then fails its outcome with a
+            :class:`~unidesign.exceptions.UniDesignProcessError` that carries
+            the run result.
+        env:
+            Environment overrides forwarded to the default executor.
+
+        Exceptions raised for one configuration are captured on its
+        :class:`BatchOutcome` and never interrupt the remaining work.
+        """
+
+        execute_one = execute if execute is not None else self._default_execute(env)
+        tracer = self._runner.tracer
+
+        def run_one(config: CommandConfig) -> T:
+            if self._timeout is None:
+                return execute_one(config)
+            with run_timeout(self._timeout):
+                return execute_one(config)
+
+        def _traced(index: int, config: CommandConfig) -> T:
+            with tracer.span("batch.item", index=index):
+                return run_one(config)
+
+        task = _traced if tracer.enabled else lambda index, config: run_one(config)
+        iterator = enumerate(configs)
+        in_flight: dict[Future, tuple[int, CommandConfig]] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="unidesign_batch"
+        )
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self._max_pending:
+                    try:
+                        index, config = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = executor.submit(
+                        contextvars.copy_context().run, task, index, config
+                    )
+                    in_flight[future] = (index, config)
+                if not in_flight:
+                    return
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, config = in_flight.pop(future)
+                    error = future.exception()
+                    yield BatchOutcome(
+                        index=index,
+                        config=config,
+                        result=None if error is not None else future.result(),
+                        error=error,
+                    )
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run_all(
+        self,
+        configs: Iterable[CommandConfig],
+        *,
+        execute: Callable[[CommandConfig], T] | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> list[BatchOutcome[T]]:
+        """Run every configuration and return outcomes in submission order.
+
+        Pass the outcomes to :meth:`~unidesign.resources.ResourceSummary.from_runs`
+        to aggregate the wall time, CPU time and memory of the batch.
+        """
+
+        outcomes = list(self.map(configs, execute=execute, env=env))
+        outcomes.sort(key=lambda outcome: outcome.index)
+        return outcomes
+
+
+__all__ = ["BatchOutcome", "UniDesignBatchRunner", "default_worker_count"]
@@ -0,0 +1,766 @@
+"""Reproducible benchmark suite over the bundled ``example`` scenarios.
+
+Run it as ``python -m unidesign.bench``. Every scenario runs ``ProteinDesign``
+through :class:`~unidesign.jobs.ProteinDesignJob` with a fixed trajectory
+count. The timing and resource profile of each run is written as JSON, together
+with the quality of the best designed sequence measured against the shipped
+``_bestseqs.txt`` reference. Passing ``--baseline`` compares the report with an
+earlier one and exits with status ``1`` when a scenario got slower, used more
+memory, designed worse sequences or stopped working, so regressions from a new
+binary build or wrapper change show up automatically.
+
+``python -m unidesign.bench --relocation`` instead measures how the outputs of
+a run leave its workdir under each :data:`~unidesign.runner.RelocationStrategy`:
+a synthetic ``ProteinDesign`` workdir is relocated repeatedly and the files and
+bytes whose data was rewritten are counted, which needs no binary and gives the
+same counts on every run. It exits with status ``1`` if a strategy that should
+not copy (``rename``, ``hardlink``) copied anything.
+
+Every scenario passes a fixed ``--random_seed``, so a binary reproduces its
+designed sequences exactly and the default quality tolerances only absorb the
+rounding of the energies written to ``_bestseqs.txt``; any larger change means
+the search or the energy function changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Mapping, Sequence, get_args
+
+import numpy as np
+
+from . import paths
+from .cache import _sha256_file
+from .config import ProteinDesignConfig
+from .artifacts import DesignSequenceSet, StructureModel
+from .jobs import ProteinDesignJob
+from .jobs._shared import ArtifactSpec, TrajectoryArtifactSpec, relocate_artifacts
+from .resources import ResourceSummary, RunResources
+from .runner import RelocationStrategy, UniDesignRunner
+from .sequences import SequenceRecord, iter_sequence_records
+
+
+REPORT_FORMAT = 1
+"""Version of the JSON document written by :class:`BenchReport`."""
+
+
+@dataclass(slots=True, frozen=True)
+class BenchScenario:
+    """One bundled example, described relative to the ``example`` directory."""
+
+    name: str
+    """Identifier used on the command line and in reports."""
+
+    directory: str
+    """Example directory holding the inputs and the shipped outputs."""
+
+    pdb: str
+    """Input structure passed via ``--pdb``."""
+
+    mode: str = "monomer"
+    """``ProteinDesign`` mode, as in :attr:`ProteinDesignConfig.mode`."""
+
+    resfile: str | None = None
+    """Resfile passed via ``--resfile``."""
+
+    interface_only: bool = False
+    """Restrict design to the interface (``--interface_only``)."""
+
+    mol2: str | None = None
+    """Ligand passed via ``--mol2``."""
+
+    ligand_parameters: str | None = None
+    """Ligand parameter file passed via ``--lig_param``."""
+
+    ligand_topology: str | None = None
+    """Ligand topology file passed via ``--lig_topo``."""
+
+    random_seed: int = 1
+    """Seed of the simulated annealing (``--random_seed``)."""
+
+    def reference_path(self, example_dir: Path) -> Path:
+        """Return the shipped ``_bestseqs.txt`` of this scenario."""
+
+        return example_dir / self.directory / f"{Path(self.pdb).stem}_bestseqs.txt"
+
+    def config(
+        self,
+        example_dir: Path,
+        *,
+        n_trajectories: int,
+        use_bbdep_rotlib: bool | None = None,
+    ) -> ProteinDesignConfig:
+        """Return the ``ProteinDesign`` configuration of the example's readme."""
+
+        # The runner executes in a scratch directory, so every input must be absolute.
+        base = (example_dir / self.directory).resolve()
+
+        def _input(name: str | None) -> Path | None:
+            return None if name is None else base / name
+
+        return ProteinDesignConfig(
+            pdb_path=base / self.pdb,
+            mode=self.mode,  # type: ignore[arg-type]
+            use_bbdep_rotlib=use_bbdep_rotlib,
+            n_trajectories=n_trajectories,
+            resfile_path=_input(self.resfile),
+            interface_only=self.interface_only,
+            mol2_path=_input(self.mol2),
+            ligand_parameter_path=_input(self.ligand_parameters),
+            ligand_topology_path=_input(self.ligand_topology),
+            random_seed=self.random_seed,
+        )
+
+
+SCENARIOS: tuple[BenchScenario, ...] = (
+    BenchScenario("1agy", "MonomerDesign/1agy", "1agy.pdb", resfile="RESFILE.txt"),
+    BenchScenario("1igd", "MonomerDesign/1igd", "1igd.pdb"),
+    BenchScenario(
+        "1ay7", "ProteinProteinInteractionDesign/1ay7", "1ay7.pdb", mode="ppi",
+        interface_only=True,
+    ),
+    BenchScenario("1e44", "ProteinProteinInteractionDesign/1e44", "1e44.pdb", mode="ppi"),
+    BenchScenario(
+        "1r091",
+        "ProteinLigandInteraction/1r091_BS01_JEN",
+        "rec_native.pdb",
+        mode="protlig",
+        mol2="lig_charge.mol2",
+        ligand_parameters="1r091_lig_param.prm",
+        ligand_topology="1r091_lig_topo.inp",
+    ),
+)
+"""The scenarios of the bundled examples, with the commands from their readmes."""
+
+
+def sequence_identity(first: str, second: str) -> float:
+    """Return the fraction of aligned positions at which two sequences agree.
+
+    Designed sequences keep the length of the input, so positions are compared
+    one to one; sequences of different length give ``NaN``.
+    """
+
+    if len(first) != len(second) or not first:
+        return float("nan")
+    left = np.frombuffer(first.encode("ascii"), dtype=np.uint8)
+    right = np.frombuffer(second.encode("ascii"), dtype=np.uint8)
+    return float(np.mean(left == right))
+
+
+def _best_record(path: Path) -> SequenceRecord | None:
+    best: SequenceRecord | None = None
+    for record in iter_sequence_records(path):
+        if best is None or record.total < best.total:
+            best = record
+    return best
+
+
+@dataclass(slots=True)
+class ScenarioQuality:
+    """Best designed sequence of a scenario compared with the shipped reference."""
+
+    best_total: float
+    """Weighted total energy of the lowest-energy designed sequence."""
+
+    best_recovery: float
+    """Native sequence recovery of that sequence."""
+
+    reference_total: float
+    """Weighted total energy of the shipped best sequence."""
+
+    reference_recovery: float
+    """Native sequence recovery of the shipped best sequence."""
+
+    identity: float
+    """Fraction of positions shared with the shipped best sequence."""
+
+    @property
+    def energy_gap(self) -> float:
+        """How much higher the designed energy is than the reference (negative is better)."""
+
+        return self.best_total - self.reference_total
+
+    def as_dict(self) -> dict[str, float]:
+        return {**asdict(self), "energy_gap": self.energy_gap}
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    """Measurements of one scenario over every repetition."""
+
+    name: str
+    """Scenario identifier."""
+
+    runs: list[RunResources] = field(default_factory=list)
+    """Resources of every successful repetition, in order."""
+
+    quality: ScenarioQuality | None = None
+    """Quality of the best sequence over all repetitions (``None`` if nothing was designed)."""
+
+    error: str | None = None
+    """Why the scenario failed, if it did."""
+
+    def profile(self) -> dict[str, dict[str, float]]:
+        """Return the :meth:`ResourceSummary.statistics` of the repetitions."""
+
+        return ResourceSummary.from_runs(self.runs).statistics()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "error": self.error,
+            "profile": self.profile(),
+            "runs": [asdict(run) for run in self.runs],
+            "quality": None if self.quality is None else self.quality.as_dict(),
+        }
+
+
+def run_scenario(
+    runner: UniDesignRunner,
+    scenario: BenchScenario,
+    *,
+    example_dir: Path | None = None,
+    n_trajectories: int = 1,
+    repeat: int = 1,
+    shards: int = 1,
+    use_bbdep_rotlib: bool | None = None,
+) -> ScenarioResult:
+    """Design ``scenario`` ``repeat`` times and measure every run.
+
+    A failing repetition ends the scenario and is recorded in
+    :attr:`ScenarioResult.error`; the repetitions before it are kept.
+    """
+
+    example_dir = example_dir or paths.project_root() / "example"
+    config = scenario.config(
+        example_dir, n_trajectories=n_trajectories, use_bbdep_rotlib=use_bbdep_rotlib
+    )
+    result = ScenarioResult(scenario.name)
+    best: SequenceRecord | None = None
+    for _ in range(repeat):
+        job = ProteinDesignJob(runner, config)
+        try:
+            design = job.run_sharded(shards) if shards > 1 else job.run()
+        except Exception as exc:  # noqa: BLE001 - recorded in the report
+            result.error = repr(exc)
+            break
+        try:
+            record = (
+                None
+                if design.best_sequences is None
+                else _best_record(design.best_sequences.path)
+            )
+            if design.run.returncode != 0 or record is None:
+                result.error = (
+                    design.run.stderr.strip()[-2000:]
+                    or f"no designed sequences (exit code {design.run.returncode})"
+                )
+                break
+            if design.run.resources is not None:
+                result.runs.append(design.run.resources)
+            if best is None or record.total < best.total:
+                best = record
+        finally:
+            design.close()
+
+    reference_path = scenario.reference_path(example_dir)
+    reference = _best_record(reference_path) if reference_path.is_file() else None
+    if best is not None and reference is not None:
+        result.quality = ScenarioQuality(
+            best_total=best.total,
+            best_recovery=best.recovery,
+            reference_total=reference.total,
+            reference_recovery=reference.recovery,
+            identity=sequence_identity(best.sequence, reference.sequence),
+        )
+    return result
+
+
+@dataclass(slots=True)
+class BenchSettings:
+    """Parameters that must match for two reports to be comparable."""
+
+    n_trajectories: int = 1
+    """Trajectories per design run (``--ntraj``)."""
+
+    repeat: int = 1
+    """Design runs per scenario."""
+
+    shards: int = 1
+    """Parallel processes the trajectories are split across."""
+
+    use_bbdep_rotlib: bool | None = None
+    """``--bbdep`` override; ``None`` keeps the binary's default."""
+
+
+@dataclass(slots=True)
+class BenchReport:
+    """Benchmark results of one binary build, serialisable as JSON."""
+
+    settings: BenchSettings
+    """How the scenarios were run."""
+
+    results: dict[str, ScenarioResult]
+    """Results keyed by scenario name."""
+
+    binary: Path
+    """Binary that was benchmarked."""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": REPORT_FORMAT,
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "binary": {"path": str(self.binary), "sha256": _sha256_file(self.binary)},
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "settings": asdict(self.settings),
+            "scenarios": {name: result.as_dict() for name, result in self.results.items()},
+        }
+
+    def write(self, path: Path) -> dict[str, Any]:
+        """Write the report to ``path`` and return the document."""
+
+        document = self.to_dict()
+        path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        return document
+
+
+def run_suite(
+    runner: UniDesignRunner,
+    scenarios: Sequence[BenchScenario] = SCENARIOS,
+    settings: BenchSettings | None = None,
+    *,
+    example_dir: Path | None = None,
+) -> BenchReport:
+    """Run ``scenarios`` one after another so their timings do not interfere."""
+
+    settings = settings or BenchSettings()
+    results = {
+        scenario.name: run_scenario(
+            runner,
+            scenario,
+            example_dir=example_dir,
+            n_trajectories=settings.n_trajectories,
+            repeat=settings.repeat,
+            shards=settings.shards,
+            use_bbdep_rotlib=settings.use_bbdep_rotlib,
+        )
+        for scenario in scenarios
+    }
+    return BenchReport(settings=settings, results=results, binary=runner.binary_path)
+
+
+@dataclass(slots=True)
+class BenchTolerances:
+    """How much worse than the baseline a scenario may get before it counts as a regression."""
+
+    wall_time: float = 0.25
+    """Allowed relative increase of the median wall time."""
+
+    wall_time_slack: float = 1.0
+    """Seconds of wall time added to the limit so short scenarios do not flap."""
+
+    max_rss: float = 0.10
+    """Allowed relative increase of the peak resident set size."""
+
+    energy: float = 1e-3
+    """Allowed increase of the best total energy."""
+
+    identity: float = 0.0
+    """Allowed drop of the identity with the shipped best sequence."""
+
+    reference_gap: float | None = None
+    """If set, the largest allowed energy gap to the shipped reference, baseline or not."""
+
+
+@dataclass(slots=True)
+class BenchRegression:
+    """A scenario metric that got worse than allowed."""
+
+    scenario: str
+    metric: str
+    baseline: float | None
+    current: float | None
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.scenario}: {self.metric}: {self.message}"
+
+
+def _statistic(entry: Mapping[str, Any], metric: str, name: str) -> float | None:
+    value = entry.get("profile", {}).get(metric, {}).get(name)
+    return None if value is None else float(value)
+
+
+def compare_reports(
+    current: Mapping[str, Any],
+    baseline: Mapping[str, Any],
+    tolerances: BenchTolerances | None = None,
+) -> list[BenchRegression]:
+    """Return the regressions of report document ``current`` against ``baseline``.
+
+    Scenarios missing from either report are not compared. Raises
+    :class:`ValueError` when the reports were produced with different
+    :class:`BenchSettings`, since their numbers are not comparable.
+    """
+
+    tolerances = tolerances or BenchTolerances()
+    if current.get("settings") != baseline.get("settings"):
+        raise ValueError(
+            f"benchmark settings differ: {current.get('settings')} "
+            f"vs baseline {baseline.get('settings')}"
+        )
+    regressions: list[BenchRegression] = []
+    for name, entry in current.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name)
+        if entry.get("error"):
+            if before is not None and not before.get("error"):
+                regressions.append(
+                    BenchRegression(name, "error", None, None, f"failed: {entry['error']}")
+                )
+            continue
+        quality = entry.get("quality") or {}
+        gap = quality.get("energy_gap")
+        if tolerances.reference_gap is not None and gap is not None:
+            if gap > tolerances.reference_gap:
+                regressions.append(
+                    BenchRegression(
+                        name, "energy_gap", None, gap,
+                        f"{gap:.3f} above the shipped reference "
+                        f"(allowed {tolerances.reference_gap:.3f})",
+                    )
+                )
+        if before is None or before.get("error"):
+            continue
+
+        old_wall = _statistic(before, "wall_time", "p50")
+        new_wall = _statistic(entry, "wall_time", "p50")
+        if old_wall is not None and new_wall is not None:
+            limit = old_wall * (1 + tolerances.wall_time) + tolerances.wall_time_slack
+            if new_wall > limit:
+                regressions.append(
+                    BenchRegression(
+                        name, "wall_time", old_wall, new_wall,
+                        f"median {new_wall:.2f}s exceeds {limit:.2f}s "
+                        f"(baseline {old_wall:.2f}s)",
+                    )
+                )
+        old_rss = _statistic(before, "max_rss", "max")
+        new_rss = _statistic(entry, "max_rss", "max")
+        if old_rss is not None and new_rss is not None:
+            limit = old_rss * (1 + tolerances.max_rss)
+            if new_rss > limit:
+                regressions.append(
+                    BenchRegression(
+                        name, "max_rss", old_rss, new_rss,
+                        f"peak {new_rss / 2**20:.1f} MiB exceeds {limit / 2**20:.1f} MiB",
+                    )
+                )
+
+        old_quality = before.get("quality") or {}
+        for metric, tolerance, sign in (
+            ("best_total", tolerances.energy, 1.0),
+            ("identity", tolerances.identity, -1.0),
+        ):
+            old_value, new_value = old_quality.get(metric), quality.get(metric)
+            if old_value is None or new_value is None:
+                continue
+            if np.isnan(old_value) or np.isnan(new_value):
+                continue
+            if sign * (new_value - old_value) > tolerance:
+                regressions.append(
+                    BenchRegression(
+                        name, metric, old_value, new_value,
+                        f"{new_value:.3f} vs baseline {old_value:.3f} "
+                        f"(allowed change {tolerance:.3f})",
+                    )
+                )
+    return regressions
+
+
+RELOCATION_MODES: tuple[str, ...] = ("keep", *get_args(RelocationStrategy))
+"""``"keep"`` retains the workdir (no relocation); the rest are relocation strategies."""
+
+_ZERO_COPY_STRATEGIES = frozenset({"rename", "hardlink"})
+_RELOCATION_PREFIX = "bench"
+
+
+@dataclass(slots=True)
+class RelocationResult:
+    """Cost of handing the outputs of one synthetic run over under one mode."""
+
+    mode: str
+    """One of :data:`RELOCATION_MODES`."""
+
+    files: int
+    """Artifact files the run left behind."""
+
+    files_copied: int = 0
+    """Artifact files whose data was rewritten, per run."""
+
+    bytes_copied: int = 0
+    """Bytes rewritten, per run."""
+
+    wall_times: list[float] = field(default_factory=list)
+    """Seconds spent relocating, per repetition."""
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "wall_time_p50": float(np.median(self.wall_times)) if self.wall_times else None,
+        }
+
+
+def _synthetic_workdir(parent: Path, n_files: int, file_bytes: int) -> Path:
+    """Write a workdir shaped like a ``ProteinDesign`` run with ``n_files`` models."""
+
+    workdir = Path(tempfile.mkdtemp(prefix="unidesign_", dir=parent))
+    line = b"ATOM      1  CA  ALA A   1      11.104   6.134  -6.504  1.00  0.00           C\n"
+    body = line * max(1, file_bytes // len(line))
+    for index in range(1, n_files + 1):
+        (workdir / f"{_RELOCATION_PREFIX}_beststruct{index:04d}.pdb").write_bytes(body)
+    (workdir / f"{_RELOCATION_PREFIX}_bestseqs.txt").write_bytes(b"A 1 -1.0\n")
+    (workdir / "energy_matrix.tmp").write_bytes(body)
+    return workdir
+
+
+def run_relocation_benchmark(
+    *,
+    n_files: int = 20,
+    file_bytes: int = 8 << 20,
+    repeat: int = 3,
+    scratch_dir: Path | None = None,
+) -> dict[str, RelocationResult]:
+    """Relocate a synthetic workdir ``repeat`` times under every mode.
+
+    A file counts as copied when it reaches its destination as a new inode.
+    """
+
+    candidates = {
+        "best_sequences": ArtifactSpec.from_type(
+            Path(f"{_RELOCATION_PREFIX}_bestseqs.txt"), DesignSequenceSet
+        ),
+        "best_structures": TrajectoryArtifactSpec.from_type(
+            f"{_RELOCATION_PREFIX}_beststruct", ".pdb", StructureModel
+        ),
+    }
+    results: dict[str, RelocationResult] = {}
+    with tempfile.TemporaryDirectory(prefix="unidesign_bench_", dir=scratch_dir) as scratch:
+        for mode in RELOCATION_MODES:
+            result = RelocationResult(mode, files=n_files + 1)
+            for _ in range(repeat):
+                workdir = _synthetic_workdir(Path(scratch), n_files, file_bytes)
+                inodes = {
+                    entry.name: (entry.stat().st_dev, entry.stat().st_ino)
+                    for entry in os.scandir(workdir)
+                }
+                started = time.perf_counter()
+                workspace, _, cleanup = relocate_artifacts(
+                    workdir,
+                    candidates,
+                    keep_workspace=mode == "keep",
+                    prefix=_RELOCATION_PREFIX,
+                    strategy="copy" if mode == "keep" else mode,  # type: ignore[arg-type]
+                )
+                result.wall_times.append(time.perf_counter() - started)
+                copied = [
+                    entry
+                    for entry in os.scandir(workspace)
+                    if entry.name in inodes
+                    and (entry.stat().st_dev, entry.stat().st_ino) != inodes[entry.name]
+                ]
+                result.files_copied = len(copied)
+                result.bytes_copied = sum(entry.stat().st_size for entry in copied)
+                cleanup()
+                shutil.rmtree(workdir, ignore_errors=True)
+            results[mode] = result
+    return results
+
+
+def _relocation_main(args: argparse.Namespace) -> int:
+    settings = {
+        "files": args.relocation_files,
+        "file_bytes": args.relocation_mib << 20,
+        "repeat": args.repeat,
+    }
+    results = run_relocation_benchmark(
+        n_files=args.relocation_files,
+        file_bytes=args.relocation_mib << 20,
+        repeat=args.repeat,
+        scratch_dir=args.scratch,
+    )
+    document = {
+        "format": REPORT_FORMAT,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "relocation": {mode: result.as_dict() for mode, result in results.items()},
+    }
+    text = json.dumps(document, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    status = 0
+    for mode in _ZERO_COPY_STRATEGIES:
+        if results[mode].bytes_copied:
+            print(
+                f"REGRESSION relocation {mode}: copied {results[mode].files_copied} file(s), "
+                f"{results[mode].bytes_copied} bytes",
+                file=sys.stderr,
+            )
+            status = 1
+    return status
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m unidesign.bench",
+        description="Benchmark ProteinDesign on the bundled examples.",
+    )
+    parser.add_argument(
+        "--binary", type=Path, help="UniDesign executable (discovered when omitted)"
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="scenarios to run (all by default)",
+    )
+    parser.add_argument("--ntraj", type=int, default=1, help="trajectories per design run")
+    parser.add_argument("--repeat", type=int, default=1, help="design runs per scenario")
+    parser.add_argument(
+        "--shards", type=int, default=1, help="processes to split the trajectories across"
+    )
+    parser.add_argument(
+        "--bbdep",
+        choices=("yes", "no"),
+        help="override the backbone-dependent rotamer library setting",
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument(
+        "--relocation",
+        action="store_true",
+        help="benchmark artifact relocation on synthetic outputs instead of the scenarios",
+    )
+    parser.add_argument(
+        "--relocation-files", type=int, default=20, help="model files per synthetic run"
+    )
+    parser.add_argument(
+        "--relocation-mib", type=int, default=8, help="size of each synthetic model file"
+    )
+    parser.add_argument(
+        "--scratch", type=Path, help="directory for the synthetic workdirs (default: TMPDIR)"
+    )
+    parser.add_argument("--baseline", type=Path, help="report to compare against")
+    defaults = BenchTolerances()
+    parser.add_argument(
+        "--time-tolerance", type=float, default=defaults.wall_time,
+        help="allowed relative wall-time increase",
+    )
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=defaults.max_rss,
+        help="allowed relative peak-memory increase",
+    )
+    parser.add_argument(
+        "--energy-tolerance", type=float, default=defaults.energy,
+        help="allowed increase of the best total energy",
+    )
+    parser.add_argument(
+        "--identity-tolerance", type=float, default=defaults.identity,
+        help="allowed drop of identity with the shipped best sequence",
+    )
+    parser.add_argument(
+        "--max-reference-gap", type=float,
+        help="fail when the best energy is this much above the shipped reference",
+    )
+    args = parser.parse_args(argv)
+    for name in ("ntraj", "repeat", "shards", "relocation_files", "relocation_mib"):
+        if getattr(args, name) <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be positive")
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command line entry point; returns the process exit status."""
+
+    args = _parse_args(argv)
+    if args.relocation:
+        return _relocation_main(args)
+    runner = UniDesignRunner(args.binary or paths.discover_binary())
+    selected = [
+        scenario
+        for scenario in SCENARIOS
+        if args.scenarios is None or scenario.name in args.scenarios
+    ]
+    settings = BenchSettings(
+        n_trajectories=args.ntraj,
+        repeat=args.repeat,
+        shards=args.shards,
+        use_bbdep_rotlib=None if args.bbdep is None else args.bbdep == "yes",
+    )
+    report = run_suite(runner, selected, settings)
+    document = report.write(args.output) if args.output else report.to_dict()
+    if not args.output:
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    status = 0
+    for name, result in report.results.items():
+        if result.error:
+            print(f"{name}: failed: {result.error}", file=sys.stderr)
+            status = 1
+    tolerances = BenchTolerances(
+        wall_time=args.time_tolerance,
+        max_rss=args.memory_tolerance,
+        energy=args.energy_tolerance,
+        identity=args.identity_tolerance,
+        reference_gap=args.max_reference_gap,
+    )
+    baseline = (
+        json.loads(args.baseline.read_text(encoding="utf-8"))
+        if args.baseline
+        else {"settings": document["settings"]}
+    )
+    try:
+        regressions = compare_reports(document, baseline, tolerances)
+    except ValueError as exc:
+        print(f"cannot compare with {args.baseline}: {exc}", file=sys.stderr)
+        return 2
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else status
+
+
+__all__ = [
+    "BenchRegression",
+    "BenchReport",
+    "BenchScenario",
+    "BenchSettings",
+    "BenchTolerances",
+    "RELOCATION_MODES",
+    "REPORT_FORMAT",
+    "RelocationResult",
+    "SCENARIOS",
+    "ScenarioQuality",
+    "ScenarioResult",
+    "compare_reports",
+    "main",
+    "run_relocation_benchmark",
+    "run_scenario",
+    "run_suite",
+    "sequence_identity",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
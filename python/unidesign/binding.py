@@ -0,0 +1,231 @@
+"""Parallel ``ComputeBinding`` over many complexes and chain splits."""
+
+from __future__ import annotations
+
+import itertools
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from .batch import UniDesignBatchRunner
+from .config import ComputeBindingConfig, _validate_split_parts
+from .energy_terms import (
+    ENERGY_TERMS,
+    TERM_INDEX,
+    EnergyBreakdown,
+    EnergyBreakdownBatch,
+    parse_energy_breakdown,
+)
+from .runner import UniDesignRunner
+from .structure import load_atoms
+
+
+_MAX_SPLIT_PART = 9
+"""``SPLIT_PART1``/``SPLIT_PART2`` are ``char[10]`` buffers in ``src/Main.cpp``."""
+
+
+def complex_chains(pdb_path: os.PathLike[str] | str) -> str:
+    """Return the chain identifiers of a structure in order of appearance."""
+
+    chains = load_atoms(pdb_path, cache=False)["chain"]
+    _, first = np.unique(chains, return_index=True)
+    return "".join(chain.decode() for chain in chains[np.sort(first)].tolist())
+
+
+def enumerate_chain_splits(chains: str) -> list[tuple[str, str]]:
+    """Return every bipartition of ``chains`` into two non-empty groups.
+
+    ``ComputeBindingWithChainSplitting`` counts every chain outside the first
+    group as part of the second, so a split and its mirror image give the same
+    energy; each bipartition is listed once, with the first chain in part one.
+    """
+
+    if not chains or any(not chain.strip() for chain in chains):
+        raise ValueError(f"every chain needs a non-blank identifier; got {chains!r}")
+    if len(set(chains)) != len(chains):
+        raise ValueError(f"chain identifiers must be unique; got {chains!r}")
+    first, rest = chains[0], chains[1:]
+    splits: list[tuple[str, str]] = []
+    for size in range(len(rest) + 1):
+        for extra in itertools.combinations(rest, size):
+            part1 = first + "".join(extra)
+            part2 = "".join(chain for chain in chains if chain not in part1)
+            if not part2:
+                continue
+            if len(part1) > _MAX_SPLIT_PART or len(part2) > _MAX_SPLIT_PART:
+                continue
+            _validate_split_parts(part1, part2)
+            splits.append((part1, part2))
+    return splits
+
+
+class BindingTable:
+    """Columnar binding energies: one row per complex and chain split.
+
+    ``terms`` holds the weighted energy breakdown of each row in the
+    :data:`~unidesign.energy_terms.ENERGY_TERMS` order. Runs that failed are
+    listed in :attr:`failures` as ``(complex, part1, part2, message)`` instead.
+    """
+
+    __slots__ = ("complexes", "part1", "part2", "terms", "failures")
+
+    def __init__(
+        self,
+        complexes: Sequence[str],
+        part1: Sequence[str],
+        part2: Sequence[str],
+        terms: EnergyBreakdownBatch,
+        failures: Sequence[tuple[str, str, str, str]] = (),
+    ) -> None:
+        if not (len(complexes) == len(part1) == len(part2) == len(terms)):
+            raise ValueError("every column must have one entry per row")
+        self.complexes = np.asarray(complexes, dtype=object)
+        self.part1 = np.asarray(part1, dtype=object)
+        self.part2 = np.asarray(part2, dtype=object)
+        self.terms = terms
+        self.failures = list(failures)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Weighted binding energy of every row."""
+
+        return self.terms.totals
+
+    def column(self, name: str) -> np.ndarray:
+        """Return ``complex``/``part1``/``part2``, ``Total`` or an energy term column."""
+
+        if name == "complex":
+            return self.complexes
+        if name in ("part1", "part2"):
+            return getattr(self, name)
+        return self.terms.column(name)
+
+    def select(self, rows: np.ndarray | Sequence[int]) -> BindingTable:
+        """Return the rows picked by an index array or boolean mask."""
+
+        rows = np.asarray(rows)
+        return BindingTable(
+            self.complexes[rows],
+            self.part1[rows],
+            self.part2[rows],
+            self.terms.select(rows),
+            self.failures,
+        )
+
+    def strongest_split(self) -> BindingTable:
+        """Return the lowest-energy split of every complex."""
+
+        if len(self) == 0:
+            return self
+        order = np.lexsort((self.totals, self.complexes.astype(str)))
+        names = self.complexes[order]
+        first = np.ones(order.shape[0], dtype=bool)
+        first[1:] = names[1:] != names[:-1]
+        return self.select(order[first])
+
+    def as_columns(self) -> dict[str, np.ndarray]:
+        """Return ``{column: array}`` with identifiers, ``Total`` and every term."""
+
+        columns: dict[str, np.ndarray] = {
+            "complex": self.complexes,
+            "part1": self.part1,
+            "part2": self.part2,
+            "Total": self.totals,
+        }
+        for term in ENERGY_TERMS:
+            columns[term] = self.terms.matrix[:, TERM_INDEX[term]]
+        return columns
+
+
+class BindingScan:
+    """Fan ``ComputeBinding`` out over complexes and their chain splits.
+
+    One process runs per (complex, split) pair through
+    :class:`~unidesign.batch.UniDesignBatchRunner`, whose bounded submission
+    keeps memory flat for panels of thousands of complexes.
+    """
+
+    def __init__(
+        self,
+        runner: UniDesignRunner,
+        *,
+        max_workers: int | None = None,
+    ) -> None:
+        self._batch = UniDesignBatchRunner(runner, max_workers=max_workers)
+
+    def _configs(
+        self,
+        pdb_paths: Iterable[os.PathLike[str] | str],
+        splits: Mapping[str, Sequence[tuple[str, str]]] | None,
+        failures: list[tuple[str, str, str, str]],
+    ) -> Iterator[ComputeBindingConfig]:
+        for pdb_path in pdb_paths:
+            path = Path(pdb_path)
+            chosen = None if splits is None else splits.get(str(pdb_path))
+            if chosen is None:
+                try:
+                    chosen = enumerate_chain_splits(complex_chains(path))
+                except (OSError, ValueError) as exc:
+                    failures.append((str(path), "", "", repr(exc)))
+                    continue
+            for part1, part2 in chosen:
+                yield ComputeBindingConfig(pdb_path=path, split_part1=part1, split_part2=part2)
+
+    def run(
+        self,
+        pdb_paths: Iterable[os.PathLike[str] | str],
+        *,
+        splits: Mapping[str, Sequence[tuple[str, str]]] | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> BindingTable:
+        """Compute binding energies for every complex in ``pdb_paths``.
+
+        Parameters
+        ----------
+        pdb_paths:
+            Complexes to analyse; consumed lazily.
+        splits:
+            Optional explicit ``(part1, part2)`` lists keyed by the path as
+            given. Complexes without an entry use every bipartition from
+            :func:`enumerate_chain_splits`.
+        env:
+            Environment overrides for every process.
+        """
+
+        rows: dict[int, tuple[str, str, str, EnergyBreakdown]] = {}
+        failures: list[tuple[str, str, str, str]] = []
+        configs = self._configs(pdb_paths, splits, failures)
+        for outcome in self._batch.map(configs, env=env):
+            config = outcome.config
+            key = (str(config.pdb_path), config.split_part1, config.split_part2)
+            if not outcome.ok:
+                failures.append((*key, repr(outcome.error)))
+                continue
+            breakdown = parse_energy_breakdown(outcome.result.stdout)
+            if outcome.result.returncode != 0 or breakdown is None:
+                message = outcome.result.stderr.strip() or "no binding energy details"
+                failures.append((*key, message))
+                continue
+            rows[outcome.index] = (*key, breakdown)
+
+        ordered = [rows[index] for index in sorted(rows)]
+        return BindingTable(
+            [row[0] for row in ordered],
+            [row[1] for row in ordered],
+            [row[2] for row in ordered],
+            EnergyBreakdownBatch.from_breakdowns(row[3] for row in ordered),
+            failures,
+        )
+
+
+__all__ = [
+    "BindingScan",
+    "BindingTable",
+    "complex_chains",
+    "enumerate_chain_splits",
+]
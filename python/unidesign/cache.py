@@ -0,0 +1,336 @@
+"""Content-addressed on-disk cache for deterministic UniDesign commands."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from .config import command_name, input_file_arguments, output_file_arguments
+from .runner import UniDesignRunResult
+
+
+DETERMINISTIC_COMMANDS = frozenset(
+    {"ComputeStability", "ComputeBinding", "MakeLigParamAndTopo"}
+)
+"""Commands whose outputs depend only on their arguments and input files."""
+
+_PREFIX_PLACEHOLDER = "{prefix}"
+_ENTRY_FILE = "entry.json"
+_FILES_DIR = "files"
+_HASH_CHUNK = 1 << 20
+
+_DEFAULT_RESOURCES = (
+    "library/toppar/param_charmm19_lk.prm",
+    "library/toppar/top_polh19.inp",
+    "library/eterms/aapropensity.nrg",
+    "library/eterms/ramachandran.nrg",
+)
+"""Files every command reads from the binary's directory (``PROGRAM_PATH`` in ``src/Main.cpp``)."""
+
+_DEFAULT_WEIGHTS = "wread/weight_all1.wgt"
+"""Weight file read unless ``--wread`` names another."""
+
+_DEFAULT_ROTAMER_LIBRARIES = (
+    "library/rotlib/ALLbbdep.bin",
+    "library/rotlib/dun2010bb3per.lib",
+    "library/rotlib/honig984.lib",
+)
+"""Rotamer libraries one of which is read unless ``--rotlib`` picks another."""
+
+
+def _option(args: Sequence[str], flag: str) -> str | None:
+    for name, value in zip(args, args[1:]):
+        if name == flag:
+            return value
+    return None
+
+
+def _implicit_resources(args: Sequence[str]) -> list[str]:
+    """Return the resource files, relative to the binary, that ``args`` read implicitly."""
+
+    resources = list(_DEFAULT_RESOURCES)
+    if _option(args, "--wread") is None:
+        resources.append(_DEFAULT_WEIGHTS)
+    library = _option(args, "--rotlib")
+    if library is None:
+        resources.extend(_DEFAULT_ROTAMER_LIBRARIES)
+    else:
+        resources.append(f"library/rotlib/{library}.lib")
+    return resources
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters describing how a :class:`ResultCache` has been used."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """Size-bounded LRU cache of UniDesign executions keyed by their inputs.
+
+    The key covers the rendered CLI arguments, the bytes of every input file
+    they reference, the binary itself and the parameter, weight and rotamer
+    files it reads from its own directory by default. Entries store the captured output
+    plus every file the run wrote into its workdir, with the per-run prefix
+    abstracted away so a hit can be replayed under a fresh prefix. Only
+    successful runs of :data:`DETERMINISTIC_COMMANDS` (or the ``commands``
+    supplied by the caller) are cached.
+
+    The size and recency of every entry are indexed in memory, so storing a
+    run costs no directory scan. The directory is scanned when the cache is
+    opened and again whenever the index turns out to be stale (an indexed
+    entry was removed behind its back, e.g. by another process sharing the
+    directory); entries other processes add are indexed when they are hit or
+    at the next scan.
+    """
+
+    def __init__(
+        self,
+        directory: os.PathLike[str] | str,
+        *,
+        max_bytes: int = 1 << 30,
+        commands: Iterable[str] = DETERMINISTIC_COMMANDS,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._commands = frozenset(commands)
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._total = 0
+        self._rescan()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the hit/miss/store/eviction counters."""
+
+        with self._lock:
+            return CacheStats(**asdict(self._stats))
+
+    def _count(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self._stats, field, getattr(self._stats, field) + amount)
+
+    def _file_digest(self, path: Path) -> str:
+        stat = path.stat()
+        memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._digests.get(memo_key)
+        if cached is None:
+            cached = _sha256_file(path)
+            with self._lock:
+                self._digests[memo_key] = cached
+        return cached
+
+    def key_for(self, binary_path: Path, args: Sequence[str]) -> str | None:
+        """Return the cache key for ``args`` or ``None`` when the run is not cacheable.
+
+        Runs writing outputs to absolute paths are never cached because a
+        replay could not recreate files outside the workdir.
+        """
+
+        if command_name(args) not in self._commands:
+            return None
+        if any(Path(path).is_absolute() for _, path in output_file_arguments(args)):
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(self._file_digest(binary_path).encode())
+        for arg in args:
+            digest.update(b"\0arg\0")
+            digest.update(arg.encode())
+        for position, value in input_file_arguments(args):
+            digest.update(f"\0input{position}\0".encode())
+            digest.update(self._content_digest(Path(value)))
+        for relative in _implicit_resources(args):
+            digest.update(f"\0resource\0{relative}\0".encode())
+            digest.update(self._content_digest(binary_path.parent / relative))
+        return digest.hexdigest()
+
+    def _content_digest(self, path: Path) -> bytes:
+        return self._file_digest(path).encode() if path.is_file() else b"missing"
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._directory / key[:2] / key
+
+    def restore(
+        self, key: str, workdir: Path, prefix: str, argv: Sequence[str]
+    ) -> UniDesignRunResult | None:
+        """Replay a cached run into ``workdir`` under ``prefix``; ``None`` on a miss."""
+
+        entry_dir = self._entry_dir(key)
+        try:
+            entry = json.loads((entry_dir / _ENTRY_FILE).read_text(encoding="utf-8"))
+            for relative in entry["files"]:
+                source = entry_dir / _FILES_DIR / relative
+                target = workdir / relative.replace(_PREFIX_PLACEHOLDER, prefix)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, target)
+            os.utime(entry_dir / _ENTRY_FILE)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                stale = key in self._index
+            if stale:
+                self._rescan()
+            self._count("misses")
+            return None
+
+        self._touch(key, entry["size"])
+        self._count("hits")
+        return UniDesignRunResult(
+            args=tuple(argv),
+            returncode=entry["returncode"],
+            stdout=entry["stdout"].replace(_PREFIX_PLACEHOLDER, prefix),
+            stderr=entry["stderr"].replace(_PREFIX_PLACEHOLDER, prefix),
+            workdir=workdir,
+            prefix=prefix,
+        )
+
+    def store(
+        self, key: str, result: UniDesignRunResult, *, exclude: Iterable[str] = ()
+    ) -> None:
+        """Record a successful run; top-level workdir entries in ``exclude`` are skipped.
+
+        Runs whose workdir no longer exists are not recorded, since their
+        outputs cannot be replayed.
+        """
+
+        if result.returncode != 0 or not result.workdir.is_dir():
+            return
+        excluded = set(exclude)
+        staging = Path(tempfile.mkdtemp(prefix=".staging_", dir=self._directory))
+        try:
+            files: list[str] = []
+            size = 0
+            for root, dirs, names in os.walk(result.workdir):
+                root_path = Path(root)
+                if root_path == result.workdir:
+                    dirs[:] = [name for name in dirs if name not in excluded]
+                    names = [name for name in names if name not in excluded]
+                for name in names:
+                    source = root_path / name
+                    if source.is_symlink():
+                        continue
+                    relative = source.relative_to(result.workdir).as_posix()
+                    relative = relative.replace(result.prefix, _PREFIX_PLACEHOLDER)
+                    target = staging / _FILES_DIR / relative
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(source, target)
+                    files.append(relative)
+                    size += target.stat().st_size
+            entry = {
+                "returncode": result.returncode,
+                "stdout": result.stdout.replace(result.prefix, _PREFIX_PLACEHOLDER),
+                "stderr": result.stderr.replace(result.prefix, _PREFIX_PLACEHOLDER),
+                "files": files,
+                "size": size + len(result.stdout) + len(result.stderr),
+            }
+            (staging / _ENTRY_FILE).write_text(json.dumps(entry), encoding="utf-8")
+            destination = self._entry_dir(key)
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(staging, destination)
+            except OSError:
+                return
+            self._touch(key, entry["size"])
+            self._count("stores")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries: list[tuple[float, int, Path]] = []
+        for shard in self._directory.iterdir():
+            if not shard.is_dir() or shard.name.startswith("."):
+                continue
+            for entry_dir in shard.iterdir():
+                marker = entry_dir / _ENTRY_FILE
+                try:
+                    stat = marker.stat()
+                    size = json.loads(marker.read_text(encoding="utf-8"))["size"]
+                except (OSError, ValueError, KeyError):
+                    continue
+                entries.append((stat.st_mtime, size, entry_dir))
+        return entries
+
+    def _rescan(self) -> None:
+        """Rebuild the in-memory index from the entries on disk."""
+
+        entries = sorted(self._entries(), key=lambda item: item[0])
+        with self._lock:
+            self._index = OrderedDict((entry_dir.name, size) for _, size, entry_dir in entries)
+            self._total = sum(self._index.values())
+
+    def _touch(self, key: str, size: int) -> None:
+        """Mark ``key`` as the most recently used entry, indexing it if needed."""
+
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+            else:
+                self._index[key] = size
+                self._total += size
+
+    def _evict(self) -> None:
+        victims: list[str] = []
+        with self._lock:
+            while self._total > self._max_bytes and self._index:
+                key, size = self._index.popitem(last=False)
+                self._total -= size
+                victims.append(key)
+        stale = False
+        for key in victims:
+            entry_dir = self._entry_dir(key)
+            if not entry_dir.is_dir():
+                stale = True
+                continue
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            self._count("evictions")
+        if stale:
+            self._rescan()
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+
+        for _, _, entry_dir in self._entries():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        with self._lock:
+            self._index.clear()
+            self._total = 0
+
+
+__all__ = ["CacheStats", "DETERMINISTIC_COMMANDS", "ResultCache"]
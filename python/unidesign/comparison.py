@@ -0,0 +1,388 @@
+"""Batched side-chain RMSD and chi-angle comparison across structure ensembles."""
+
+from __future__ import annotations
+
+import os
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from .artifacts import StructureModel
+from .structure import load_atoms
+
+
+_SIDE_CHAIN_ATOMS: dict[str, tuple[str, ...]] = {
+    "ALA": (),
+    "ARG": ("CG", "CD", "NE", "CZ", "NH1", "NH2"),
+    "ASN": ("CG", "OD1", "ND2"),
+    "ASP": ("CG", "OD1", "OD2"),
+    "CYS": ("SG",),
+    "GLN": ("CG", "CD", "OE1", "NE2"),
+    "GLU": ("CG", "CD", "OE1", "OE2"),
+    "GLY": (),
+    "HIS": ("CG", "ND1", "CD2", "CE1", "NE2"),
+    "ILE": ("CG1", "CG2", "CD1"),
+    "LEU": ("CG", "CD1", "CD2"),
+    "LYS": ("CG", "CD", "CE", "NZ"),
+    "MET": ("CG", "SD", "CE"),
+    "PHE": ("CG", "CD1", "CD2", "CE1", "CE2", "CZ"),
+    "PRO": ("CG", "CD"),
+    "SER": ("OG",),
+    "THR": ("OG1", "CG2"),
+    "TRP": ("CG", "CD1", "CD2", "NE1", "CE2", "CE3", "CZ2", "CZ3", "CH2"),
+    "TYR": ("CG", "CD1", "CD2", "CE1", "CE2", "CZ", "OH"),
+    "VAL": ("CG1", "CG2"),
+}
+"""Heavy side-chain atoms beyond ``CB``, the atoms ``CompareSideChain`` superposes."""
+
+_CHI_ATOMS: dict[str, tuple[tuple[str, str, str, str], ...]] = {
+    "ARG": (
+        ("N", "CA", "CB", "CG"),
+        ("CA", "CB", "CG", "CD"),
+        ("CB", "CG", "CD", "NE"),
+        ("CG", "CD", "NE", "CZ"),
+    ),
+    "ASN": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "OD1")),
+    "ASP": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "OD1")),
+    "CYS": (("N", "CA", "CB", "SG"),),
+    "GLN": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD"), ("CB", "CG", "CD", "OE1")),
+    "GLU": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD"), ("CB", "CG", "CD", "OE1")),
+    "HIS": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "ND1")),
+    "ILE": (("N", "CA", "CB", "CG1"), ("CA", "CB", "CG1", "CD1")),
+    "LEU": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD1")),
+    "LYS": (
+        ("N", "CA", "CB", "CG"),
+        ("CA", "CB", "CG", "CD"),
+        ("CB", "CG", "CD", "CE"),
+        ("CG", "CD", "CE", "NZ"),
+    ),
+    "MET": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "SD"), ("CB", "CG", "SD", "CE")),
+    "PHE": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD1")),
+    "PRO": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD")),
+    "SER": (("N", "CA", "CB", "OG"),),
+    "THR": (("N", "CA", "CB", "OG1"),),
+    "TRP": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD1")),
+    "TYR": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD1")),
+    "VAL": (("N", "CA", "CB", "CG1"),),
+}
+
+# Atom pairs swapped by SymmetricalResidueGenerate for the residues that
+# ResidueIsSymmetricalCheck accepts.
+_SYMMETRIC_PAIRS: dict[str, tuple[tuple[str, str], ...]] = {
+    "ARG": (("NH1", "NH2"),),
+    "ASP": (("OD1", "OD2"),),
+    "GLU": (("OE1", "OE2"),),
+    "PHE": (("CD1", "CD2"), ("CE1", "CE2")),
+    "TYR": (("CD1", "CD2"), ("CE1", "CE2")),
+}
+
+# Chi angles compared modulo 180 degrees by ResidueAndResidueCheckTorsionSimilarity.
+_PERIODIC_CHIS: dict[str, int] = {
+    "ARG": 3,
+    "ASN": 1,
+    "ASP": 1,
+    "GLN": 2,
+    "GLU": 2,
+    "HIS": 1,
+    "PHE": 1,
+    "TYR": 1,
+}
+
+_RESIDUE_ALIASES = {"HSD": "HIS", "HSE": "HIS"}
+
+RESIDUE_TYPES: tuple[str, ...] = tuple(sorted(_SIDE_CHAIN_ATOMS))
+"""Residue names indexed by the codes stored in :attr:`SideChainEnsemble.types`."""
+
+_BACKBONE_SLOTS = ("N", "CA", "CB")
+_N_BACKBONE = len(_BACKBONE_SLOTS)
+_N_SLOTS = _N_BACKBONE + max(len(atoms) for atoms in _SIDE_CHAIN_ATOMS.values())
+_MAX_CHI = 4
+
+
+def _slot_names(residue: str) -> tuple[str, ...]:
+    return _BACKBONE_SLOTS + _SIDE_CHAIN_ATOMS[residue]
+
+
+def _build_tables() -> tuple[np.ndarray, ...]:
+    keys: list[bytes] = []
+    slots: list[int] = []
+    swap = np.tile(np.arange(_N_SLOTS), (len(RESIDUE_TYPES), 1))
+    chis = np.full((len(RESIDUE_TYPES), _MAX_CHI, 4), -1, dtype=np.intp)
+    periodic = np.zeros((len(RESIDUE_TYPES), _MAX_CHI), dtype=bool)
+    for code, residue in enumerate(RESIDUE_TYPES):
+        position = {name: slot for slot, name in enumerate(_slot_names(residue))}
+        aliases = [alias for alias, target in _RESIDUE_ALIASES.items() if target == residue]
+        for resname in (residue, *aliases):
+            for name, slot in position.items():
+                keys.append(f"{resname}:{name}".encode())
+                slots.append(slot)
+        for first, second in _SYMMETRIC_PAIRS.get(residue, ()):
+            swap[code, position[first]] = position[second]
+            swap[code, position[second]] = position[first]
+        for chi, atoms in enumerate(_CHI_ATOMS.get(residue, ())):
+            chis[code, chi] = [position[name] for name in atoms]
+        if residue in _PERIODIC_CHIS:
+            periodic[code, _PERIODIC_CHIS[residue]] = True
+    order = np.argsort(keys)
+    names = sorted({*RESIDUE_TYPES, *_RESIDUE_ALIASES})
+    codes = [RESIDUE_TYPES.index(_RESIDUE_ALIASES.get(name, name)) for name in names]
+    return (
+        np.asarray(keys, dtype="S8")[order],
+        np.asarray(slots, dtype=np.intp)[order],
+        np.asarray(names, dtype="S3"),
+        np.asarray(codes, dtype=np.int8),
+        swap,
+        chis,
+        periodic,
+    )
+
+
+_SLOT_KEYS, _SLOT_INDEX, _RESIDUE_NAMES, _RESIDUE_CODES, _SWAP, _CHI_SLOTS, _CHI_PERIODIC = (
+    _build_tables()
+)
+
+RESIDUE_KEY_DTYPE = np.dtype([("chain", "S1"), ("resseq", np.int32), ("icode", "S1")])
+"""Layout of :attr:`SideChainEnsemble.residues`."""
+
+
+def _lookup(table: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    position = np.minimum(np.searchsorted(table, values), table.shape[0] - 1)
+    return position, table[position] == values
+
+
+def _load_residues(atoms: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return residue keys, type codes and slotted coordinates of one model."""
+
+    code_position, known = _lookup(_RESIDUE_NAMES, atoms["resname"])
+    keep = known & ~atoms["hetero"]
+    atoms = atoms[keep]
+    code_position = code_position[keep]
+
+    starts = np.ones(atoms.shape[0], dtype=bool)
+    starts[1:] = (
+        (atoms["chain"][1:] != atoms["chain"][:-1])
+        | (atoms["resseq"][1:] != atoms["resseq"][:-1])
+        | (atoms["icode"][1:] != atoms["icode"][:-1])
+    )
+    residue_of_atom = np.cumsum(starts) - 1
+    first_atoms = np.flatnonzero(starts)
+
+    keys = np.empty(first_atoms.shape[0], dtype=RESIDUE_KEY_DTYPE)
+    for field in RESIDUE_KEY_DTYPE.names:
+        keys[field] = atoms[field][first_atoms]
+    types = _RESIDUE_CODES[code_position[first_atoms]]
+
+    atom_keys = np.char.add(np.char.add(atoms["resname"], b":"), atoms["name"])
+    slot_position, found = _lookup(_SLOT_KEYS, atom_keys)
+    coordinates = np.full((first_atoms.shape[0], _N_SLOTS, 3), np.nan)
+    coordinates[residue_of_atom[found], _SLOT_INDEX[slot_position[found]]] = atoms["xyz"][found]
+    return keys, types, coordinates
+
+
+def _dihedrals(p0: np.ndarray, p1: np.ndarray, p2: np.ndarray, p3: np.ndarray) -> np.ndarray:
+    b0 = p0 - p1
+    b1 = p2 - p1
+    b2 = p3 - p2
+    b1 = b1 / np.linalg.norm(b1, axis=-1, keepdims=True)
+    v = b0 - np.sum(b0 * b1, axis=-1, keepdims=True) * b1
+    w = b2 - np.sum(b2 * b1, axis=-1, keepdims=True) * b1
+    x = np.sum(v * w, axis=-1)
+    y = np.sum(np.cross(b1, v) * w, axis=-1)
+    return np.arctan2(y, x)
+
+
+def _chi_angles(types: np.ndarray, coordinates: np.ndarray) -> np.ndarray:
+    slots = _CHI_SLOTS[types]
+    defined = slots >= 0
+    gathered = np.take_along_axis(
+        coordinates[..., None, :, :],
+        np.where(defined, slots, 0)[..., None],
+        axis=-2,
+    )
+    gathered[~defined] = np.nan
+    return _dihedrals(*(gathered[..., atom, :] for atom in range(4)))
+
+
+def _as_index(selection: np.ndarray | Sequence[int] | None, count: int) -> np.ndarray:
+    if selection is None:
+        return np.arange(count)
+    selection = np.asarray(selection)
+    if selection.dtype == bool:
+        return np.flatnonzero(selection)
+    return selection.astype(np.intp, copy=False)
+
+
+class SideChainEnsemble:
+    """Side chains of many models of the same protein, stacked for batched comparison.
+
+    Every model is parsed once (through the cached ``.atoms.npy`` sidecars of
+    :func:`~unidesign.structure.load_atoms`) into ``coordinates`` of shape
+    ``(n_models, n_residues, slots, 3)`` holding ``N``, ``CA``, ``CB`` and the
+    side-chain heavy atoms of each residue, ``NaN`` where absent. Models may
+    carry different amino acids at the same position, as design outputs do,
+    but must list the same residues.
+
+    Comparisons follow the native ``CompareSideChain`` rules: RMSD covers the
+    heavy atoms beyond ``CB``, the symmetric flips of ARG/ASP/GLU/PHE/TYR are
+    tried and the lower value kept, and chi angles agree when within a cutoff
+    (modulo 180 degrees for the symmetric chis). Residues of different type
+    compare as ``inf`` RMSD and never agree.
+    """
+
+    __slots__ = ("labels", "residues", "types", "coordinates", "chi_angles")
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        residues: np.ndarray,
+        types: np.ndarray,
+        coordinates: np.ndarray,
+    ) -> None:
+        self.labels = list(labels)
+        self.residues = np.asarray(residues, dtype=RESIDUE_KEY_DTYPE)
+        self.types = np.asarray(types, dtype=np.int8)
+        self.coordinates = np.asarray(coordinates, dtype=np.float64)
+        expected = (len(self.labels), self.residues.shape[0])
+        if self.types.shape != expected or self.coordinates.shape != (*expected, _N_SLOTS, 3):
+            raise ValueError("types and coordinates must be shaped (n_models, n_residues, ...)")
+        self.chi_angles = _chi_angles(self.types, self.coordinates)
+
+    @classmethod
+    def from_models(
+        cls,
+        models: Iterable[StructureModel | os.PathLike[str] | str],
+        *,
+        cache: bool = True,
+    ) -> SideChainEnsemble:
+        """Load ``models`` (artifacts or PDB paths) into one ensemble."""
+
+        labels: list[str] = []
+        types: list[np.ndarray] = []
+        coordinates: list[np.ndarray] = []
+        residues: np.ndarray | None = None
+        for model in models:
+            if isinstance(model, StructureModel):
+                path, atoms = model.path, model.atoms(cache=cache)
+            else:
+                path = model
+                atoms = load_atoms(model, cache=cache)
+            keys, model_types, model_coordinates = _load_residues(np.asarray(atoms))
+            if residues is None:
+                residues = keys
+            elif not np.array_equal(keys, residues):
+                raise ValueError(
+                    f"{os.fspath(path)} does not list the same residues as {labels[0]}"
+                )
+            labels.append(os.fspath(path))
+            types.append(model_types)
+            coordinates.append(model_coordinates)
+        if residues is None:
+            return cls(
+                [],
+                np.empty(0, dtype=RESIDUE_KEY_DTYPE),
+                np.empty((0, 0)),
+                np.empty((0, 0, _N_SLOTS, 3)),
+            )
+        return cls(labels, residues, np.stack(types), np.stack(coordinates))
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def residue_count(self) -> int:
+        return self.residues.shape[0]
+
+    def residue_names(self, model: int) -> np.ndarray:
+        """Return the three-letter residue names of ``model``."""
+
+        return np.asarray(RESIDUE_TYPES, dtype="S3")[self.types[model]]
+
+    def _side_chains(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        coordinates = self.coordinates[rows]
+        flipped = np.take_along_axis(coordinates, _SWAP[self.types[rows]][..., None], axis=-2)
+        return coordinates[..., _N_BACKBONE:, :], flipped[..., _N_BACKBONE:, :]
+
+    def pairwise_rmsd(
+        self,
+        rows: np.ndarray | Sequence[int] | None = None,
+        columns: np.ndarray | Sequence[int] | None = None,
+        *,
+        chunk_size: int = 16,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Return per-residue side-chain RMSD between every ``rows``/``columns`` model pair.
+
+        The result has shape ``(len(rows), len(columns), n_residues)``. Models
+        are compared ``chunk_size`` by ``chunk_size`` so temporaries stay
+        bounded; pass ``out`` (e.g. from ``numpy.lib.format.open_memmap``) to
+        write very large matrices straight to disk.
+        """
+
+        rows = _as_index(rows, len(self))
+        columns = _as_index(columns, len(self))
+        if out is None:
+            out = np.empty((rows.shape[0], columns.shape[0], self.residue_count), dtype=np.float32)
+        for i in range(0, rows.shape[0], chunk_size):
+            row_block = rows[i : i + chunk_size]
+            plain, flipped = self._side_chains(row_block)
+            for j in range(0, columns.shape[0], chunk_size):
+                column_block = columns[j : j + chunk_size]
+                other, _ = self._side_chains(column_block)
+                present = ~np.isnan(plain[:, None, ..., 0]) & ~np.isnan(other[None, ..., 0])
+                counts = present.sum(axis=-1)
+                best = None
+                for candidate in (plain, flipped):
+                    squared = np.sum((candidate[:, None] - other[None]) ** 2, axis=-1)
+                    total = np.where(present, squared, 0.0).sum(axis=-1)
+                    mean = np.divide(total, counts, out=np.zeros_like(total), where=counts > 0)
+                    rmsd = np.sqrt(mean)
+                    best = rmsd if best is None else np.minimum(best, rmsd)
+                same = self.types[row_block][:, None] == self.types[column_block][None]
+                out[i : i + chunk_size, j : j + chunk_size] = np.where(same, best, np.inf)
+        return out
+
+    def rmsd_to(self, reference: int, *, chunk_size: int = 16) -> np.ndarray:
+        """Return the ``(n_models, n_residues)`` side-chain RMSD of every model to ``reference``."""
+
+        return self.pairwise_rmsd(columns=[reference], chunk_size=chunk_size)[:, 0]
+
+    def chi_agreement(
+        self,
+        rows: np.ndarray | Sequence[int] | None = None,
+        columns: np.ndarray | Sequence[int] | None = None,
+        *,
+        cutoff: float = 20.0,
+        chunk_size: int = 64,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Return whether all chi angles of each residue agree within ``cutoff`` degrees.
+
+        Shapes and chunking follow :meth:`pairwise_rmsd`; the default cutoff
+        matches the binary's ``--torsion_deviation_cutoff``.
+        """
+
+        rows = _as_index(rows, len(self))
+        columns = _as_index(columns, len(self))
+        if out is None:
+            out = np.empty((rows.shape[0], columns.shape[0], self.residue_count), dtype=bool)
+        limit = np.deg2rad(cutoff)
+        for i in range(0, rows.shape[0], chunk_size):
+            row_block = rows[i : i + chunk_size]
+            chis = self.chi_angles[row_block]
+            periodic = _CHI_PERIODIC[self.types[row_block]]
+            for j in range(0, columns.shape[0], chunk_size):
+                column_block = columns[j : j + chunk_size]
+                delta = chis[:, None] - self.chi_angles[column_block][None]
+                delta = np.abs((delta + np.pi) % (2 * np.pi) - np.pi)
+                delta = np.where(periodic[:, None], np.minimum(delta, np.pi - delta), delta)
+                agree = np.all((delta <= limit) | np.isnan(delta), axis=-1)
+                same = self.types[row_block][:, None] == self.types[column_block][None]
+                out[i : i + chunk_size, j : j + chunk_size] = agree & same
+        return out
+
+
+__all__ = [
+    "RESIDUE_KEY_DTYPE",
+    "RESIDUE_TYPES",
+    "SideChainEnsemble",
+]
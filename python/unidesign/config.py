@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+from dataclasses import MISSING, dataclass, fields
 from pathlib import Path
-from typing import Iterable, Literal, Protocol, Sequence
+from typing import Iterable, Literal, Mapping, Protocol, Sequence
 
 
 def _as_path(value: str | Path) -> str:
@@ -19,6 +20,80 @@ def _format_bool(value: bool, *, true: str = "yes", false: str = "no") -> str:
     return true if value else false
 
 
+_INPUT_PATH_FLAGS = frozenset(
+    {
+        "--pdb",
+        "--pdb2",
+        "--pdblist",
+        "--mol2",
+        "--mutant_file",
+        "--wread",
+        "--seq",
+        "--resfile",
+        "--lig_catacons",
+        "--lig_placing",
+        "--read_lig_poses",
+        "--scrn_by_orien",
+    }
+)
+"""Flags whose value names a file the binary reads."""
+
+_LIGAND_LIBRARY_FLAGS = frozenset({"--lig_param", "--lig_topo"})
+"""Ligand parameter/topology flags: outputs for ``MakeLigParamAndTopo``, inputs otherwise."""
+
+
+def command_name(args: Sequence[str]) -> str | None:
+    """Return the value passed to ``--command`` in ``args``, if any."""
+
+    for flag, value in zip(args, args[1:]):
+        if flag == "--command":
+            return value
+    return None
+
+
+def config_hash(args: Sequence[str]) -> str:
+    """Return a short stable digest of a command's argument vector.
+
+    An injected ``--prefix`` is ignored, so repeated runs of the same
+    configuration share a hash.
+    """
+
+    args = tuple(args)
+    if args[:1] == ("--prefix",):
+        args = args[2:]
+    return hashlib.sha256("\0".join(args).encode("utf-8")).hexdigest()[:16]
+
+
+def _path_arguments(args: Sequence[str], *, inputs: bool) -> list[tuple[int, str]]:
+    generates_ligand_files = command_name(args) == "MakeLigParamAndTopo"
+    selected: list[tuple[int, str]] = []
+    for index in range(len(args) - 1):
+        flag = args[index]
+        if flag in _LIGAND_LIBRARY_FLAGS:
+            is_input = not generates_ligand_files
+        elif flag in _INPUT_PATH_FLAGS:
+            is_input = True
+        elif flag == "--write_lig_poses":
+            is_input = False
+        else:
+            continue
+        if is_input == inputs:
+            selected.append((index + 1, args[index + 1]))
+    return selected
+
+
+def input_file_arguments(args: Sequence[str]) -> list[tuple[int, str]]:
+    """Return ``(position, path)`` pairs for arguments that name files read by the binary."""
+
+    return _path_arguments(args, inputs=True)
+
+
+def output_file_arguments(args: Sequence[str]) -> list[tuple[int, str]]:
+    """Return ``(position, path)`` pairs for arguments that name files written by the binary."""
+
+    return _path_arguments(args, inputs=False)
+
+
 class CommandConfig(Protocol):
     """Protocol implemented by configuration objects that render CLI arguments."""
 
@@ -74,6 +149,9 @@ class ProteinDesignConfig:
     n_trajectory_start_index: int | None = None
     """Starting index for trajectory enumeration via ``--ntraj_start_ndx`` (default ``1``)."""
 
+    random_seed: int | None = None
+    """Non-negative seed for the simulated annealing via ``--random_seed`` (default: the clock)."""
+
     exclude_low_prob_rotamers_cutoff: float | None = None
     """Cut-off for ``--excl_low_prob``; the binary defaults to ``0.03``."""
 
@@ -122,6 +200,9 @@ class ProteinDesignConfig:
     binding_weight: float | None = None
     """Scalar for binding term weighting using ``--wbind`` (default ``1.0``)."""
 
+    mol2_path: str | Path | None = None
+    """Ligand MOL2 file supplied via ``--mol2`` for ``protlig``/``enzyme`` design."""
+
     ligand_parameter_path: str | Path | None = None
     """Ligand parameter override forwarded via ``--lig_param`` (default ``LIG_PARAM.prm``)."""
 
@@ -195,6 +276,10 @@ class ProteinDesignConfig:
             if self.n_trajectory_start_index <= 0:
                 raise ValueError("n_trajectory_start_index must be positive")
             args.extend(("--ntraj_start_ndx", str(self.n_trajectory_start_index)))
+        if self.random_seed is not None:
+            if self.random_seed < 0:
+                raise ValueError("random_seed must not be negative")
+            args.extend(("--random_seed", str(self.random_seed)))
         if self.exclude_low_prob_rotamers_cutoff is not None:
             args.extend(("--excl_low_prob", str(self.exclude_low_prob_rotamers_cutoff)))
         if self.ppi_shell1 is not None:
@@ -226,6 +311,8 @@ class ProteinDesignConfig:
             args.extend(("--within_range", str(self.reference_distance)))
         if self.binding_weight is not None:
             args.extend(("--wbind", str(self.binding_weight)))
+        if self.mol2_path is not None:
+            args.extend(("--mol2", _as_path(self.mol2_path)))
         if self.ligand_parameter_path is not None:
             args.extend(("--lig_param", _as_path(self.ligand_parameter_path)))
         if self.ligand_topology_path is not None:
@@ -262,6 +349,13 @@ class ComputeStabilityConfig:
     pdb_path: str | Path
     """Structure to analyse with ``--pdb``."""
 
+    pdb_list_path: str | Path | None = None
+    """File naming one structure per line, all scored by one process via ``--pdblist``.
+
+    Each energy block is then preceded by ``ComputeStability structure <n>: <path>``;
+    ``pdb_path`` is still read but not scored.
+    """
+
     use_bbdep_rotlib: bool | None = None
     """Optional override for ``--bbdep`` (defaults to ``yes``)."""
 
@@ -273,6 +367,51 @@ class ComputeStabilityConfig:
 
     def to_cli_args(self) -> list[str]:
         args: list[str] = ["--command", "ComputeStability", "--pdb", _as_path(self.pdb_path)]
+        if self.pdb_list_path is not None:
+            args.extend(("--pdblist", _as_path(self.pdb_list_path)))
+        if self.use_bbdep_rotlib is not None:
+            args.extend(("--bbdep", _format_bool(self.use_bbdep_rotlib)))
+        if self.rotamer_library is not None:
+            args.extend(("--rotlib", self.rotamer_library))
+        if self.weight_file is not None:
+            args.extend(("--wread", _as_path(self.weight_file)))
+        return args
+
+
+@dataclass(slots=True)
+class BuildMutantConfig:
+    """Configuration for the ``BuildMutant`` command.
+
+    Every line of the mutant file describes one mutant as comma-separated point
+    mutations such as ``SA12G`` (wild-type residue, chain, position, mutant
+    residue). The binary writes ``pdb_Model_NNNN.pdb`` and a repacked wild-type
+    reference ``pdb_Model_NNNN_WT.pdb`` for the ``NNNN``-th line.
+    """
+
+    pdb_path: str | Path
+    """Structure to mutate, supplied via ``--pdb``."""
+
+    mutant_file: str | Path = "mutant_file.txt"
+    """Mutant list passed through ``--mutant_file`` (native default ``mutant_file.txt``)."""
+
+    use_bbdep_rotlib: bool | None = None
+    """Optional override for ``--bbdep`` (defaults to ``yes``)."""
+
+    rotamer_library: str | None = None
+    """Named text rotamer library passed through ``--rotlib`` if provided."""
+
+    weight_file: str | Path | None = None
+    """Alternate weights via ``--wread`` (default ``wread/weight_all1.wgt``)."""
+
+    def to_cli_args(self) -> list[str]:
+        args: list[str] = [
+            "--command",
+            "BuildMutant",
+            "--pdb",
+            _as_path(self.pdb_path),
+            "--mutant_file",
+            _as_path(self.mutant_file),
+        ]
         if self.use_bbdep_rotlib is not None:
             args.extend(("--bbdep", _format_bool(self.use_bbdep_rotlib)))
         if self.rotamer_library is not None:
@@ -366,11 +505,259 @@ class MakeLigParamConfig:
         ]
 
 
+@dataclass(slots=True)
+class MakeLigPosesConfig:
+    """Configuration for the ``MakeLigPoses`` command.
+
+    The binary places the ``--mol2`` ligand on the scaffold following the catalytic
+    constraints and placing rules, then writes every pose as a ``MODEL`` block that ends
+    with an ``ENERGY INTERNAL: ... BACKBONE: ...`` line. Resfile sites are built from the
+    backbone-dependent rotamer library.
+    """
+
+    pdb_path: str | Path
+    """Scaffold structure supplied via ``--pdb``."""
+
+    mol2_path: str | Path
+    """Ligand (or one ligand conformer) supplied via ``--mol2``."""
+
+    ligand_pose_output: str | Path = "LIG_POSES2.pdb"
+    """Pose file written through ``--write_lig_poses`` (native default ``LIG_POSES2.pdb``)."""
+
+    ligand_parameter_path: str | Path | None = None
+    """Ligand parameters read via ``--lig_param`` (default ``LIG_PARAM.prm``)."""
+
+    ligand_topology_path: str | Path | None = None
+    """Ligand topology read via ``--lig_topo`` (default ``LIG_TOPO.inp``)."""
+
+    ligand_constraint_path: str | Path | None = None
+    """Catalytic constraints for ``--lig_catacons`` (default ``LIG_CATACONS.txt``)."""
+
+    ligand_placement_path: str | Path | None = None
+    """Placing rules for ``--lig_placing`` (default ``LIG_PLACING.txt``)."""
+
+    resfile_path: str | Path | None = None
+    """Resfile naming the catalytic sites via ``--resfile`` (default ``RESFILE.txt``)."""
+
+    def to_cli_args(self) -> list[str]:
+        args = [
+            "--command",
+            "MakeLigPoses",
+            "--pdb",
+            _as_path(self.pdb_path),
+            "--mol2",
+            _as_path(self.mol2_path),
+            "--write_lig_poses",
+            _as_path(self.ligand_pose_output),
+        ]
+        if self.ligand_parameter_path is not None:
+            args.extend(("--lig_param", _as_path(self.ligand_parameter_path)))
+        if self.ligand_topology_path is not None:
+            args.extend(("--lig_topo", _as_path(self.ligand_topology_path)))
+        if self.ligand_constraint_path is not None:
+            args.extend(("--lig_catacons", _as_path(self.ligand_constraint_path)))
+        if self.ligand_placement_path is not None:
+            args.extend(("--lig_placing", _as_path(self.ligand_placement_path)))
+        if self.resfile_path is not None:
+            args.extend(("--resfile", _as_path(self.resfile_path)))
+        return args
+
+
+@dataclass(slots=True)
+class ScreenLigPosesConfig:
+    """Configuration for the ``ScreenLigPoses`` command.
+
+    Exactly one screen must be selected. The orientation screen checks each pose
+    against binding-site residues of ``pdb_path`` and also writes the rejected poses
+    to ``<output>_BAD_ORNT.pdb``; the VDW-percentile and RMSD screens only read the
+    pose file.
+    """
+
+    ligand_pose_input: str | Path
+    """Poses to screen, read via ``--read_lig_poses``."""
+
+    ligand_pose_output: str | Path = "LIG_POSES2.pdb"
+    """Surviving poses written through ``--write_lig_poses`` (default ``LIG_POSES2.pdb``)."""
+
+    ligand_orientation_screen: str | Path | None = None
+    """Orientation rule file for ``--scrn_by_orien``."""
+
+    ligand_vdw_percentile: float | None = None
+    """Fraction kept when ranking by internal and backbone VDW (``--scrn_by_vdw_pctl``)."""
+
+    ligand_rmsd_cutoff: float | None = None
+    """Drop poses closer than this many Å to an accepted pose (``--scrn_by_rmsd``)."""
+
+    pdb_path: str | Path | None = None
+    """Scaffold structure for ``--pdb``; required by the orientation screen."""
+
+    def __post_init__(self) -> None:
+        selected = [
+            value
+            for value in (
+                self.ligand_orientation_screen,
+                self.ligand_vdw_percentile,
+                self.ligand_rmsd_cutoff,
+            )
+            if value is not None
+        ]
+        if len(selected) != 1:
+            raise ValueError(
+                "exactly one of ligand_orientation_screen, ligand_vdw_percentile and "
+                "ligand_rmsd_cutoff must be set"
+            )
+        if self.ligand_orientation_screen is not None and self.pdb_path is None:
+            raise ValueError("the orientation screen needs pdb_path")
+        if self.ligand_vdw_percentile is not None and not 0.0 < self.ligand_vdw_percentile <= 1.0:
+            raise ValueError("ligand_vdw_percentile must be in (0, 1]")
+        if self.ligand_rmsd_cutoff is not None and self.ligand_rmsd_cutoff <= 0.0:
+            raise ValueError("ligand_rmsd_cutoff must be positive")
+
+    def to_cli_args(self) -> list[str]:
+        args = ["--command", "ScreenLigPoses"]
+        if self.pdb_path is not None:
+            args.extend(("--pdb", _as_path(self.pdb_path)))
+        args.extend(
+            (
+                "--read_lig_poses",
+                _as_path(self.ligand_pose_input),
+                "--write_lig_poses",
+                _as_path(self.ligand_pose_output),
+            )
+        )
+        if self.ligand_orientation_screen is not None:
+            args.extend(("--scrn_by_orien", _as_path(self.ligand_orientation_screen)))
+        if self.ligand_vdw_percentile is not None:
+            args.extend(("--scrn_by_vdw_pctl", str(self.ligand_vdw_percentile)))
+        if self.ligand_rmsd_cutoff is not None:
+            args.extend(("--scrn_by_rmsd", str(self.ligand_rmsd_cutoff)))
+        return args
+
+
+@dataclass(slots=True)
+class AnalyzeLigPosesConfig:
+    """Configuration for the ``AnalyzeLigPoses`` command.
+
+    The binary compares every pose with the ``--mol2`` ligand and prints an RMSD and
+    VDW summary of the pose file.
+    """
+
+    pdb_path: str | Path
+    """Scaffold structure supplied via ``--pdb``."""
+
+    mol2_path: str | Path
+    """Reference ligand supplied via ``--mol2``."""
+
+    ligand_pose_input: str | Path
+    """Poses to analyse, read via ``--read_lig_poses``."""
+
+    ligand_parameter_path: str | Path | None = None
+    """Ligand parameters read via ``--lig_param`` (default ``LIG_PARAM.prm``)."""
+
+    ligand_topology_path: str | Path | None = None
+    """Ligand topology read via ``--lig_topo`` (default ``LIG_TOPO.inp``)."""
+
+    def to_cli_args(self) -> list[str]:
+        args = [
+            "--command",
+            "AnalyzeLigPoses",
+            "--pdb",
+            _as_path(self.pdb_path),
+            "--mol2",
+            _as_path(self.mol2_path),
+            "--read_lig_poses",
+            _as_path(self.ligand_pose_input),
+        ]
+        if self.ligand_parameter_path is not None:
+            args.extend(("--lig_param", _as_path(self.ligand_parameter_path)))
+        if self.ligand_topology_path is not None:
+            args.extend(("--lig_topo", _as_path(self.ligand_topology_path)))
+        return args
+
+
+CONFIG_TYPES: dict[str, type] = {
+    cls.__name__: cls
+    for cls in (
+        ProteinDesignConfig,
+        ComputeStabilityConfig,
+        BuildMutantConfig,
+        ComputeBindingConfig,
+        MakeLigParamConfig,
+        MakeLigPosesConfig,
+        ScreenLigPosesConfig,
+        AnalyzeLigPosesConfig,
+    )
+}
+"""Configuration classes that :func:`config_to_dict` can serialise, keyed by name."""
+
+
+def _plain(value: object) -> object:
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def config_to_dict(config: CommandConfig) -> dict[str, object]:
+    """Serialise one of :data:`CONFIG_TYPES` as ``{"type": name, "fields": {...}}``.
+
+    Paths become strings and tuples become lists, so the result can be
+    written as JSON. Only fields that differ from their defaults are kept.
+    """
+
+    name = type(config).__name__
+    if CONFIG_TYPES.get(name) is not type(config):
+        raise ValueError(f"cannot serialise configuration of type {name}")
+    values: dict[str, object] = {}
+    for entry in fields(config):  # type: ignore[arg-type]
+        value = getattr(config, entry.name)
+        if entry.default is not MISSING and value == entry.default:
+            continue
+        values[entry.name] = _plain(value)
+    return {"type": name, "fields": values}
+
+
+def config_from_dict(document: Mapping[str, object]) -> CommandConfig:
+    """Rebuild a configuration serialised by :func:`config_to_dict`.
+
+    Raises :class:`ValueError` for unknown types or fields, and re-runs the
+    validation of the configuration class.
+    """
+
+    name = document.get("type")
+    cls = CONFIG_TYPES.get(name) if isinstance(name, str) else None
+    if cls is None:
+        raise ValueError(f"unknown configuration type {name!r}")
+    values = document.get("fields") or {}
+    if not isinstance(values, Mapping):
+        raise ValueError("configuration fields must be a mapping")
+    known = {entry.name for entry in fields(cls)}
+    unknown = sorted(set(values) - known)
+    if unknown:
+        raise ValueError(f"unknown {name} field(s): {', '.join(unknown)}")
+    try:
+        return cls(**values)
+    except TypeError as exc:
+        raise ValueError(f"invalid {name}: {exc}") from None
+
+
 __all__ = [
+    "CONFIG_TYPES",
+    "command_name",
+    "config_hash",
+    "config_from_dict",
+    "config_to_dict",
+    "input_file_arguments",
+    "output_file_arguments",
     "CommandConfig",
     "ProteinDesignConfig",
     "ComputeStabilityConfig",
+    "BuildMutantConfig",
     "ComputeBindingConfig",
     "MakeLigParamConfig",
+    "MakeLigPosesConfig",
+    "ScreenLigPosesConfig",
+    "AnalyzeLigPosesConfig",
 ]
 
@@ -0,0 +1,264 @@
+"""Array-backed energy breakdowns parsed from UniDesign standard output."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+_TERM_LAYOUT: tuple[tuple[str, int], ...] = (
+    ("reference_ALA", 1),
+    ("reference_CYS", 2),
+    ("reference_ASP", 3),
+    ("reference_GLU", 4),
+    ("reference_PHE", 5),
+    ("reference_GLY", 6),
+    ("reference_HIS", 7),
+    ("reference_ILE", 8),
+    ("reference_LYS", 9),
+    ("reference_LEU", 10),
+    ("reference_MET", 11),
+    ("reference_ASN", 12),
+    ("reference_PRO", 13),
+    ("reference_GLN", 14),
+    ("reference_ARG", 15),
+    ("reference_SER", 16),
+    ("reference_THR", 17),
+    ("reference_VAL", 18),
+    ("reference_TRP", 19),
+    ("reference_TYR", 20),
+    ("intraR_vdwatt", 21),
+    ("intraR_vdwrep", 22),
+    ("intraR_electr", 23),
+    ("intraR_deslvP", 24),
+    ("intraR_deslvH", 25),
+    ("intraR_hbscbb_dis", 26),
+    ("intraR_hbscbb_the", 27),
+    ("intraR_hbscbb_phi", 28),
+    ("aapropensity", 91),
+    ("ramachandran", 92),
+    ("dunbrack", 93),
+    ("interS_vdwatt", 31),
+    ("interS_vdwrep", 32),
+    ("interS_electr", 33),
+    ("interS_deslvP", 34),
+    ("interS_deslvH", 35),
+    ("interS_ssbond", 36),
+    ("interS_hbbbbb_dis", 41),
+    ("interS_hbbbbb_the", 42),
+    ("interS_hbbbbb_phi", 43),
+    ("interS_hbscbb_dis", 44),
+    ("interS_hbscbb_the", 45),
+    ("interS_hbscbb_phi", 46),
+    ("interS_hbscsc_dis", 47),
+    ("interS_hbscsc_the", 48),
+    ("interS_hbscsc_phi", 49),
+    ("interD_vdwatt", 51),
+    ("interD_vdwrep", 52),
+    ("interD_electr", 53),
+    ("interD_deslvP", 54),
+    ("interD_deslvH", 55),
+    ("interD_ssbond", 56),
+    ("interD_hbbbbb_dis", 61),
+    ("interD_hbbbbb_the", 62),
+    ("interD_hbbbbb_phi", 63),
+    ("interD_hbscbb_dis", 64),
+    ("interD_hbscbb_the", 65),
+    ("interD_hbscbb_phi", 66),
+    ("interD_hbscsc_dis", 67),
+    ("interD_hbscsc_the", 68),
+    ("interD_hbscsc_phi", 69),
+    ("prolig_vdwatt", 71),
+    ("prolig_vdwrep", 72),
+    ("prolig_electr", 73),
+    ("prolig_deslvP", 74),
+    ("prolig_deslvH", 75),
+    ("prolig_hbscbb_dis", 81),
+    ("prolig_hbscbb_the", 82),
+    ("prolig_hbscbb_phi", 83),
+    ("prolig_hbscsc_dis", 84),
+    ("prolig_hbscsc_the", 85),
+    ("prolig_hbscsc_phi", 86),
+)
+
+ENERGY_TERMS: tuple[str, ...] = tuple(name for name, _ in _TERM_LAYOUT)
+"""Energy term names in the order printed by ``EnergyTermShowComplex``."""
+
+NATIVE_TERM_INDICES: tuple[int, ...] = tuple(index for _, index in _TERM_LAYOUT)
+"""Position of each :data:`ENERGY_TERMS` entry in the native ``energyTerms`` array."""
+
+TERM_INDEX: dict[str, int] = {name: column for column, name in enumerate(ENERGY_TERMS)}
+"""Column of each term in :attr:`EnergyBreakdown.values`."""
+
+_TERM_LINE = re.compile(r"^\s*(\w+)\s+=\s+(\S+)\s*$")
+_BLOCK_HEADER = re.compile(r"^(Structure energy details|Binding energy details)\b(.*)$")
+_BINDING_CHAINS = re.compile(
+    r"between chain(?:\(s\))? (\S+) and chain(?:\(s\))? ([^\s:]+)"
+)
+
+
+@dataclass(slots=True)
+class EnergyBreakdown:
+    """One "energy details" block as a fixed-order ``float64`` vector.
+
+    ``values`` follows :data:`ENERGY_TERMS`. The binary prints weighted terms,
+    so the values are weighted by whichever ``--wread`` file produced them.
+    """
+
+    values: np.ndarray
+    """Term values aligned with :data:`ENERGY_TERMS`."""
+
+    total: float
+    """The ``Total`` line reported by the binary."""
+
+    label: str = "structure"
+    """``"structure"`` for stability blocks or ``"PART1,PART2"`` for binding blocks."""
+
+    def __getitem__(self, term: str) -> float:
+        return float(self.values[TERM_INDEX[term]])
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the terms as an ordered ``{name: value}`` mapping."""
+
+        return dict(zip(ENERGY_TERMS, self.values.tolist()))
+
+
+def _block_label(header: str, detail: str) -> str:
+    if header.startswith("Structure"):
+        return "structure"
+    match = _BINDING_CHAINS.search(detail)
+    if match is None:
+        return "binding"
+    return f"{match.group(1)},{match.group(2)}"
+
+
+def iter_energy_breakdowns(stdout: str) -> Iterator[EnergyBreakdown]:
+    """Yield every energy details block found in ``stdout`` in order of appearance."""
+
+    values: np.ndarray | None = None
+    label = "structure"
+    for line in stdout.splitlines():
+        header = _BLOCK_HEADER.match(line)
+        if header is not None:
+            values = np.zeros(len(ENERGY_TERMS), dtype=np.float64)
+            label = _block_label(header.group(1), header.group(2))
+            continue
+        if values is None:
+            continue
+        term = _TERM_LINE.match(line)
+        if term is None:
+            continue
+        name, raw = term.groups()
+        if name == "Total":
+            yield EnergyBreakdown(values=values, total=float(raw), label=label)
+            values = None
+            continue
+        column = TERM_INDEX.get(name)
+        if column is not None:
+            values[column] = float(raw)
+
+
+def parse_energy_breakdowns(stdout: str) -> list[EnergyBreakdown]:
+    """Return every energy details block found in ``stdout``."""
+
+    return list(iter_energy_breakdowns(stdout))
+
+
+def parse_energy_breakdown(stdout: str) -> EnergyBreakdown | None:
+    """Return the first energy details block in ``stdout``, if any."""
+
+    return next(iter_energy_breakdowns(stdout), None)
+
+
+class EnergyBreakdownBatch:
+    """Many breakdowns stacked into an ``(n, len(ENERGY_TERMS))`` matrix."""
+
+    __slots__ = ("matrix", "totals", "labels")
+
+    def __init__(
+        self, matrix: np.ndarray, totals: np.ndarray, labels: Sequence[str]
+    ) -> None:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(ENERGY_TERMS):
+            raise ValueError(
+                f"matrix must have shape (n, {len(ENERGY_TERMS)}); got {matrix.shape}"
+            )
+        totals = np.asarray(totals, dtype=np.float64)
+        if totals.shape != (matrix.shape[0],) or len(labels) != matrix.shape[0]:
+            raise ValueError("totals and labels must have one entry per row")
+        self.matrix = matrix
+        self.totals = totals
+        self.labels = np.asarray(labels, dtype=object)
+
+    @classmethod
+    def from_breakdowns(cls, breakdowns: Iterable[EnergyBreakdown]) -> EnergyBreakdownBatch:
+        """Stack ``breakdowns`` into a single batch."""
+
+        items = list(breakdowns)
+        if not items:
+            return cls(np.empty((0, len(ENERGY_TERMS))), np.empty(0), [])
+        return cls(
+            np.stack([item.values for item in items]),
+            np.fromiter((item.total for item in items), dtype=np.float64, count=len(items)),
+            [item.label for item in items],
+        )
+
+    @classmethod
+    def from_stdout(cls, outputs: Iterable[str]) -> EnergyBreakdownBatch:
+        """Parse and stack every energy block found in each captured ``stdout``."""
+
+        return cls.from_breakdowns(
+            breakdown for stdout in outputs for breakdown in iter_energy_breakdowns(stdout)
+        )
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def __getitem__(self, row: int) -> EnergyBreakdown:
+        return EnergyBreakdown(
+            values=self.matrix[row], total=float(self.totals[row]), label=self.labels[row]
+        )
+
+    def column(self, term: str) -> np.ndarray:
+        """Return the values of ``term`` (or ``"Total"``) for every row."""
+
+        if term == "Total":
+            return self.totals
+        return self.matrix[:, TERM_INDEX[term]]
+
+    def select(self, rows: np.ndarray | Sequence[int]) -> EnergyBreakdownBatch:
+        """Return the rows picked by an index array or boolean mask."""
+
+        rows = np.asarray(rows)
+        return EnergyBreakdownBatch(self.matrix[rows], self.totals[rows], self.labels[rows])
+
+    def rank(self, term: str = "Total", *, descending: bool = False) -> np.ndarray:
+        """Return row indices ordered by ``term`` (lowest energy first by default)."""
+
+        order = np.argsort(self.column(term), kind="stable")
+        return order[::-1] if descending else order
+
+    def top_k(self, k: int, term: str = "Total") -> np.ndarray:
+        """Return the indices of the ``k`` lowest values of ``term``, sorted."""
+
+        values = self.column(term)
+        k = min(k, values.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        candidates = np.argpartition(values, k - 1)[:k]
+        return candidates[np.argsort(values[candidates], kind="stable")]
+
+
+__all__ = [
+    "ENERGY_TERMS",
+    "NATIVE_TERM_INDICES",
+    "TERM_INDEX",
+    "EnergyBreakdown",
+    "EnergyBreakdownBatch",
+    "iter_energy_breakdowns",
+    "parse_energy_breakdown",
+    "parse_energy_breakdowns",
+]
@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle at runtime
+    from .runner import UniDesignRunResult
+
 
 class UniDesignError(RuntimeError):
     """Base class for exceptions raised by the UniDesign helpers."""
@@ -20,3 +25,19 @@ class BinaryDiscoveryError(UniDesignError):
             attempts = ", ".join(str(path) for path in self.attempted_paths)
             return f"{base} (checked: {attempts})"
         return base
+
+
+class UniDesignTimeoutError(UniDesignError):
+    """Raised when a UniDesign process is killed for exceeding its time limit."""
+
+    def __init__(self, message: str, *, timeout: float) -> None:
+        super().__init__(message)
+        self.timeout = timeout
+
+
+class UniDesignProcessError(UniDesignError):
+    """Raised when a UniDesign process exits with a nonzero status."""
+
+    def __init__(self, message: str, *, result: UniDesignRunResult) -> None:
+        super().__init__(message)
+        self.result = result
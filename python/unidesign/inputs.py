@@ -0,0 +1,212 @@
+"""Resolution and node-local staging of the input files a command reads.
+
+The binary runs inside a fresh workdir, so an input given relative to the
+caller's directory would not be found there. :func:`resolve_input_paths`
+makes such arguments absolute before a run starts, and
+:func:`resolve_config_paths` does the same for a configuration that is sent
+to a process with another working directory, such as a
+:class:`~unidesign.service.UniDesignService`.
+
+An :class:`InputCache` goes further: every input file is copied once into a
+local content-addressed directory (``<digest[:2]>/<digest><suffix>``) and
+hard-linked into each workdir under :data:`STAGED_INPUTS_DIR` (copied when
+the workdir is on another filesystem, such as a tmpfs), with the
+argument rewritten to point at the link. Jobs on one node then share a single
+local copy of a structure that lives on slow network storage, and later
+changes to the original file cannot affect a run that already started.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import fields, replace
+from pathlib import Path
+from typing import Sequence, TypeVar
+
+from .config import CommandConfig, input_file_arguments
+
+
+STAGED_INPUTS_DIR = "_inputs"
+"""Workdir entry holding the files placed by :meth:`InputCache.stage`."""
+
+C = TypeVar("C", bound=CommandConfig)
+
+
+def resolve_input_paths(
+    args: Sequence[str], base: os.PathLike[str] | str | None = None
+) -> tuple[str, ...]:
+    """Make relative input file arguments that exist under ``base`` absolute.
+
+    ``base`` defaults to the current directory. Arguments that do not name an
+    existing file there are left alone, since they may refer to workdir
+    resources such as ``wread/weight_all1.wgt``.
+    """
+
+    resolved = list(args)
+    root = Path(base) if base is not None else Path.cwd()
+    for position, value in input_file_arguments(args):
+        path = Path(value)
+        if not path.is_absolute() and (root / path).exists():
+            resolved[position] = str((root / path).resolve())
+    return tuple(resolved)
+
+
+def resolve_config_paths(config: C, base: os.PathLike[str] | str | None = None) -> C:
+    """Return ``config`` with the input paths :func:`resolve_input_paths` would rewrite.
+
+    Only path fields rendered as input file arguments are touched, so the
+    result serialises with absolute paths wherever the caller's relative ones
+    named existing files.
+    """
+
+    inputs = {value for _, value in input_file_arguments(config.to_cli_args())}
+    root = Path(base) if base is not None else Path.cwd()
+    changes: dict[str, str] = {}
+    for entry in fields(config):  # type: ignore[arg-type]
+        value = getattr(config, entry.name)
+        if "Path" not in str(entry.type) or not isinstance(value, (str, Path)):
+            continue
+        path = Path(value)
+        if str(path) in inputs and not path.is_absolute() and (root / path).exists():
+            changes[entry.name] = str((root / path).resolve())
+    return replace(config, **changes) if changes else config  # type: ignore[type-var]
+
+
+def _place(source: Path, target: Path) -> None:
+    """Hard-link ``source`` at ``target``, falling back to a copy.
+
+    A symlink is never used: :meth:`InputCache.prune` only sees hard links,
+    and would delete an entry that a running workdir still points to.
+    """
+
+    try:
+        os.link(source, target)
+        return
+    except OSError as exc:
+        if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+    shutil.copyfile(source, target)
+
+
+class InputCache:
+    """Content-addressed local copies of input files, linked into each workdir.
+
+    Cached files are made read-only because every workdir link shares their
+    inode. Entries are never removed implicitly; call :meth:`prune` to bound
+    the cache, which skips files still linked into a workdir. Workdirs on
+    another filesystem get a private copy, which pruning cannot affect.
+    """
+
+    def __init__(self, directory: os.PathLike[str] | str) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._digests: dict[tuple[str, int, int], str] = {}
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def digest(self, path: os.PathLike[str] | str) -> str:
+        """Return the SHA-256 of ``path``, memoised on its size and modification time."""
+
+        path = Path(path)
+        stat = path.stat()
+        memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._digests.get(memo_key)
+        if cached is None:
+            with path.open("rb") as handle:
+                cached = hashlib.file_digest(handle, "sha256").hexdigest()
+            with self._lock:
+                self._digests[memo_key] = cached
+        return cached
+
+    def add(self, path: os.PathLike[str] | str) -> Path:
+        """Copy ``path`` into the cache unless its contents are already there."""
+
+        path = Path(path)
+        digest = self.digest(path)
+        entry = self._directory / digest[:2] / f"{digest}{path.suffix}"
+        if entry.exists():
+            try:
+                os.utime(entry)
+            except OSError:
+                pass
+            return entry
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        handle, staging = tempfile.mkstemp(prefix=".staging_", dir=entry.parent)
+        os.close(handle)
+        try:
+            shutil.copyfile(path, staging)
+            os.chmod(staging, 0o444)
+            # Concurrent stagers of the same contents race harmlessly here.
+            os.replace(staging, entry)
+        except BaseException:
+            Path(staging).unlink(missing_ok=True)
+            raise
+        return entry
+
+    def stage(self, args: Sequence[str], workdir: os.PathLike[str] | str) -> tuple[str, ...]:
+        """Link every existing input file of ``args`` into ``workdir`` and rewrite its argument.
+
+        Relative arguments are resolved against the current directory first.
+        Arguments naming no existing file are passed through unchanged.
+        """
+
+        workdir = Path(workdir)
+        staged = list(resolve_input_paths(args))
+        for position, value in input_file_arguments(staged):
+            source = Path(value)
+            if not source.is_file():
+                continue
+            entry = self.add(source)
+            relative = Path(STAGED_INPUTS_DIR, entry.stem[:16], source.name)
+            target = workdir / relative
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                _place(entry, target)
+            staged[position] = relative.as_posix()
+        return tuple(staged)
+
+    def prune(self, max_bytes: int) -> int:
+        """Delete least recently staged entries until at most ``max_bytes`` remain.
+
+        Entries with more than one link are in use by a workdir and are kept.
+        Returns the number of entries removed.
+        """
+
+        entries: list[tuple[int, int, Path, int]] = []
+        total = 0
+        for path in self._directory.glob("??/*"):
+            if path.name.startswith(".staging_"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            total += stat.st_size
+            entries.append((stat.st_mtime_ns, stat.st_size, path, stat.st_nlink))
+        removed = 0
+        for _, size, path, links in sorted(entries):
+            if total <= max_bytes:
+                break
+            if links > 1:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+__all__ = [
+    "InputCache",
+    "STAGED_INPUTS_DIR",
+    "resolve_config_paths",
+    "resolve_input_paths",
+]
@@ -0,0 +1,550 @@
+"""SQLite job queue shared by workers on many nodes.
+
+A coordinator :meth:`JobQueue.enqueue`\\ s configurations into a database file
+on a shared volume; any number of :class:`QueueWorker` processes, on any node
+that mounts the volume, lease jobs, run them through
+:class:`~unidesign.runner.UniDesignRunner` and record the result and the
+location of the run's outputs. A lease that is not renewed before it expires
+(the worker crashed or lost its node) makes the job available again, so
+scaling out is a matter of starting more workers::
+
+    python -m unidesign.jobqueue enqueue campaign.db configs.jsonl
+    python -m unidesign.jobqueue worker campaign.db --artifacts /shared/outputs
+    python -m unidesign.jobqueue status campaign.db
+
+The database uses SQLite's rollback journal with ``BEGIN IMMEDIATE``
+transactions, which rely on the filesystem's POSIX locks; WAL mode is avoided
+because it needs shared memory that network filesystems do not provide.
+Lease deadlines are wall-clock timestamps, so node clocks must agree to well
+within ``lease_timeout``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
+
+from .config import CommandConfig, config_from_dict, config_hash, config_to_dict
+from .inputs import InputCache, resolve_config_paths
+from .paths import discover_binary
+from .runner import UniDesignRunner, UniDesignRunResult
+from .service import result_from_dict, result_to_dict
+from .workdirs import TmpfsWorkdirs
+
+
+JOB_STATES: tuple[str, ...] = ("pending", "leased", "done", "failed")
+"""Lifecycle of a queued job."""
+
+_STDERR_TAIL_LINES = 20
+"""Lines of standard error recorded as the error of a job whose process failed."""
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY,
+        config TEXT NOT NULL,
+        config_hash TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL,
+        worker TEXT,
+        lease_expires REAL,
+        enqueued REAL NOT NULL,
+        finished REAL,
+        returncode INTEGER,
+        result TEXT,
+        artifacts TEXT,
+        error TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id)",
+)
+
+
+@dataclass(slots=True)
+class QueuedJob:
+    """A row of the queue."""
+
+    job_id: int
+    """Primary key of the job."""
+
+    config: CommandConfig
+    """Configuration to run."""
+
+    status: str
+    """One of :data:`JOB_STATES`."""
+
+    attempts: int
+    """How many times the job has been leased."""
+
+    worker: str | None = None
+    """Worker holding (or that last held) the lease."""
+
+    result: UniDesignRunResult | None = None
+    """Run result of a finished job."""
+
+    artifacts: Path | None = None
+    """Where the outputs of a finished job were stored, if they were kept."""
+
+    error: str | None = None
+    """Why the last attempt failed."""
+
+
+def _exit_error(result: UniDesignRunResult) -> str | None:
+    """Describe a nonzero exit by its status and the tail of standard error."""
+
+    if result.returncode == 0:
+        return None
+    message = f"UniDesign exited with status {result.returncode}"
+    tail = result.stderr.strip().splitlines()[-_STDERR_TAIL_LINES:]
+    return "\n".join([f"{message}:", *tail]) if tail else message
+
+
+class JobQueue:
+    """Lease-based job queue stored in one SQLite file.
+
+    Parameters
+    ----------
+    path:
+        Database file; created on first use.
+    lease_timeout:
+        Seconds a lease lasts unless renewed with :meth:`heartbeat`.
+    max_attempts:
+        Leases a job may receive before it is marked ``failed``.
+    busy_timeout:
+        Seconds to wait for another process's lock before giving up.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike[str] | str,
+        *,
+        lease_timeout: float = 600.0,
+        max_attempts: int = 3,
+        busy_timeout: float = 60.0,
+    ) -> None:
+        if lease_timeout <= 0:
+            raise ValueError("lease_timeout must be positive")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be positive")
+        self._path = Path(path)
+        self._lease_timeout = lease_timeout
+        self._max_attempts = max_attempts
+        self._busy_timeout = busy_timeout
+        with self._transaction() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def lease_timeout(self) -> float:
+        return self._lease_timeout
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation keeps no file locks or
+        # cached pages across calls, which matters on network filesystems.
+        connection = sqlite3.connect(
+            self._path, timeout=self._busy_timeout, isolation_level=None
+        )
+        try:
+            connection.execute("PRAGMA journal_mode=DELETE")
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def enqueue(self, configs: Iterable[CommandConfig]) -> list[int]:
+        """Add ``configs`` in one transaction and return their job ids.
+
+        Relative input paths that name existing files are made absolute first
+        (see :func:`~unidesign.inputs.resolve_config_paths`), since workers
+        resolve paths against their own working directory on their own node.
+        """
+
+        now = time.time()
+        rows = []
+        for config in configs:
+            config = resolve_config_paths(config)
+            document = config_to_dict(config)
+            rows.append(
+                (
+                    json.dumps(document),
+                    config_hash(config.to_cli_args()),
+                    self._max_attempts,
+                    now,
+                )
+            )
+        ids: list[int] = []
+        with self._transaction() as connection:
+            for row in rows:
+                cursor = connection.execute(
+                    "INSERT INTO jobs (config, config_hash, max_attempts, enqueued) "
+                    "VALUES (?, ?, ?, ?)",
+                    row,
+                )
+                ids.append(int(cursor.lastrowid))
+        return ids
+
+    def _expire(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute(
+            "UPDATE jobs SET status = 'failed', finished = ?, "
+            "error = 'lease expired on the last attempt' "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+            (now, now),
+        )
+        connection.execute(
+            "UPDATE jobs SET status = 'pending', worker = NULL, lease_expires = NULL "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (now,),
+        )
+
+    def lease(self, worker: str) -> QueuedJob | None:
+        """Lease the oldest available job to ``worker``, or return ``None``.
+
+        Jobs whose lease expired are returned to the queue first, or marked
+        ``failed`` when they have used up their attempts.
+        """
+
+        now = time.time()
+        with self._transaction() as connection:
+            self._expire(connection, now)
+            row = connection.execute(
+                "SELECT id, config, attempts FROM jobs WHERE status = 'pending' "
+                "ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, document, attempts = row
+            connection.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (worker, now + self._lease_timeout, job_id),
+            )
+        return QueuedJob(
+            job_id=job_id,
+            config=config_from_dict(json.loads(document)),
+            status="leased",
+            attempts=attempts + 1,
+            worker=worker,
+        )
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extend ``worker``'s lease on ``job_id``; ``False`` if the lease was lost."""
+
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time() + self._lease_timeout, job_id, worker),
+            )
+            return cursor.rowcount == 1
+
+    def complete(
+        self,
+        job_id: int,
+        worker: str,
+        result: UniDesignRunResult,
+        *,
+        artifacts: os.PathLike[str] | str | None = None,
+    ) -> bool:
+        """Record the result of a leased job; ``False`` if the lease was lost meanwhile.
+
+        A job whose process exited with a nonzero status is marked ``failed``
+        without a retry, with the tail of its standard error as the error; its
+        return code and result are kept like those of a ``done`` job.
+        ``artifacts`` is where the run's outputs were stored, if they were kept.
+        """
+
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, finished = ?, returncode = ?, result = ?, "
+                "artifacts = ?, error = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (
+                    "done" if result.returncode == 0 else "failed",
+                    time.time(),
+                    result.returncode,
+                    json.dumps(result_to_dict(result)),
+                    None if artifacts is None else str(artifacts),
+                    _exit_error(result),
+                    job_id,
+                    worker,
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """Release a leased job after an error; it is retried until attempts run out."""
+
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET "
+                "status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+                "finished = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END, "
+                "worker = NULL, lease_expires = NULL, error = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time(), error, job_id, worker),
+            )
+            return cursor.rowcount == 1
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of jobs in each of :data:`JOB_STATES`."""
+
+        with self._transaction() as connection:
+            self._expire(connection, time.time())
+            rows = connection.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        counts = dict.fromkeys(JOB_STATES, 0)
+        counts.update({status: int(count) for status, count in rows})
+        return counts
+
+    def jobs(self, status: str | None = None) -> Iterator[QueuedJob]:
+        """Yield jobs in id order, optionally only those in ``status``."""
+
+        if status is not None and status not in JOB_STATES:
+            raise ValueError(f"unknown job status {status!r}")
+        query = (
+            "SELECT id, config, status, attempts, worker, result, artifacts, error FROM jobs"
+        )
+        parameters: tuple[Any, ...] = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            parameters = (status,)
+        with self._transaction() as connection:
+            rows = connection.execute(query + " ORDER BY id", parameters).fetchall()
+        for job_id, document, state, attempts, worker, result, artifacts, error in rows:
+            yield QueuedJob(
+                job_id=job_id,
+                config=config_from_dict(json.loads(document)),
+                status=state,
+                attempts=attempts,
+                worker=worker,
+                result=None if result is None else result_from_dict(json.loads(result)),
+                artifacts=None if artifacts is None else Path(artifacts),
+                error=error,
+            )
+
+
+def default_worker_id() -> str:
+    """Return ``host:pid:random`` so worker names are unique across nodes."""
+
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class QueueWorker:
+    """Lease jobs from a :class:`JobQueue` and run them one at a time.
+
+    Run several workers (processes or nodes) to scale out. While a job runs a
+    background thread renews its lease every third of the lease timeout. With
+    ``artifact_dir`` every run's outputs are moved to
+    ``artifact_dir/job-<id>`` (on the shared volume) and that path is recorded
+    as the job's artifact location; otherwise the workdir is discarded and
+    only the captured output is kept.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        runner: UniDesignRunner,
+        *,
+        artifact_dir: os.PathLike[str] | str | None = None,
+        worker_id: str | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> None:
+        self._queue = queue
+        self._runner = runner
+        self._artifact_dir = Path(artifact_dir) if artifact_dir is not None else None
+        self._worker_id = worker_id or default_worker_id()
+        self._env = env
+
+    @property
+    def worker_id(self) -> str:
+        return self._worker_id
+
+    def _store_artifacts(self, job: QueuedJob, result: UniDesignRunResult) -> None:
+        assert self._artifact_dir is not None
+        UniDesignRunner.detach_resources(result.workdir)
+        target = self._artifact_dir / f"job-{job.job_id}"
+        if target.exists():
+            # A previous attempt whose lease expired may have left outputs behind.
+            shutil.rmtree(target, ignore_errors=True)
+        self._artifact_dir.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(result.workdir), str(target))
+        result.workdir = target
+
+    def _heartbeat(self, job: QueuedJob, stop: threading.Event) -> None:
+        interval = self._queue.lease_timeout / 3
+        while not stop.wait(interval):
+            try:
+                if not self._queue.heartbeat(job.job_id, self._worker_id):
+                    return
+            except sqlite3.Error:
+                continue
+
+    def run_one(self) -> QueuedJob | None:
+        """Lease and run one job; returns it, or ``None`` when the queue is empty."""
+
+        job = self._queue.lease(self._worker_id)
+        if job is None:
+            return None
+        stop = threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat, args=(job, stop), name="unidesign_lease", daemon=True
+        )
+        beat.start()
+        result: UniDesignRunResult | None = None
+        try:
+            result = self._runner.run(
+                job.config.to_cli_args(),
+                env=self._env,
+                persist_workdir=self._artifact_dir is not None,
+            )
+            if self._artifact_dir is not None:
+                self._store_artifacts(job, result)
+        except Exception as exc:  # noqa: BLE001 - recorded in the queue
+            if result is not None:
+                shutil.rmtree(result.workdir, ignore_errors=True)
+            job.error = str(exc) or repr(exc)
+            self._queue.fail(job.job_id, self._worker_id, job.error)
+            job.status = "failed"
+            return job
+        finally:
+            stop.set()
+            beat.join()
+        artifacts = result.workdir if self._artifact_dir is not None else None
+        if self._queue.complete(job.job_id, self._worker_id, result, artifacts=artifacts):
+            job.status = "done" if result.returncode == 0 else "failed"
+            job.result, job.artifacts, job.error = result, artifacts, _exit_error(result)
+        else:
+            job.status, job.error = "leased", "lease lost before completion"
+        return job
+
+    def run(
+        self,
+        *,
+        max_jobs: int | None = None,
+        idle_timeout: float | None = 0.0,
+        poll_interval: float = 5.0,
+    ) -> int:
+        """Process jobs until ``max_jobs`` ran or the queue stayed empty for ``idle_timeout``.
+
+        ``idle_timeout=None`` keeps polling forever. Returns the number of jobs run.
+        """
+
+        processed = 0
+        idle_since = time.monotonic()
+        while max_jobs is None or processed < max_jobs:
+            job = self.run_one()
+            if job is not None:
+                processed += 1
+                idle_since = time.monotonic()
+                continue
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+        return processed
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m unidesign.jobqueue", description="Shared-filesystem UniDesign job queue."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="add configurations from a JSON-lines file")
+    enqueue.add_argument("database", type=Path)
+    enqueue.add_argument(
+        "configs", type=Path, help="one config_to_dict() document per line ('-' for stdin)"
+    )
+
+    worker = commands.add_parser("worker", help="lease and run jobs")
+    worker.add_argument("database", type=Path)
+    worker.add_argument("--binary", type=Path, help="UniDesign executable")
+    worker.add_argument("--artifacts", type=Path, help="directory for the outputs of every job")
+    worker.add_argument("--max-jobs", type=int, help="stop after this many jobs")
+    worker.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=0.0,
+        help="seconds to keep polling an empty queue (negative polls forever)",
+    )
+    worker.add_argument("--poll-interval", type=float, default=5.0)
+    worker.add_argument("--lease-timeout", type=float, default=600.0)
+    worker.add_argument(
+        "--input-cache", type=Path, help="node-local directory to stage input files through"
+    )
+    worker.add_argument(
+        "--tmpfs", type=Path, help="RAM-backed directory for workdirs while memory allows"
+    )
+
+    status = commands.add_parser("status", help="print job counts as JSON")
+    status.add_argument("database", type=Path)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+
+    args = _parse_args(argv)
+    if args.command == "enqueue":
+        queue = JobQueue(args.database)
+        handle = sys.stdin if str(args.configs) == "-" else args.configs.open(encoding="utf-8")
+        with handle:
+            configs = [config_from_dict(json.loads(line)) for line in handle if line.strip()]
+        ids = queue.enqueue(configs)
+        print(f"enqueued {len(ids)} job(s)")
+        return 0
+    if args.command == "status":
+        print(json.dumps(JobQueue(args.database).counts()))
+        return 0
+
+    queue = JobQueue(args.database, lease_timeout=args.lease_timeout)
+    runner = UniDesignRunner(
+        args.binary or discover_binary(),
+        input_cache=InputCache(args.input_cache) if args.input_cache is not None else None,
+        tmpfs_workdirs=TmpfsWorkdirs(args.tmpfs) if args.tmpfs is not None else None,
+    )
+    worker = QueueWorker(queue, runner, artifact_dir=args.artifacts)
+    processed = worker.run(
+        max_jobs=args.max_jobs,
+        idle_timeout=None if args.idle_timeout < 0 else args.idle_timeout,
+        poll_interval=args.poll_interval,
+    )
+    print(f"{worker.worker_id}: ran {processed} job(s)")
+    return 0
+
+
+__all__ = [
+    "JOB_STATES",
+    "JobQueue",
+    "QueueWorker",
+    "QueuedJob",
+    "default_worker_id",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,20 @@ from .energy import (
     StabilityComputationJob,
     StabilityComputationResult,
 )
-from .ligand import LigandParameterizationJob, LigandParameterizationResult
+from .ligand import (
+    LigandParameterizationJob,
+    LigandParameterizationResult,
+    LigandParameterStore,
+    PreparedLigand,
+)
+from .mutation import MutationScanJob, MutationScanResult
+from .poses import (
+    LigandPoseAnalysisJob,
+    LigandPoseAnalysisResult,
+    LigandPosePlacementJob,
+    LigandPoseResult,
+    LigandPoseScreeningJob,
+)
 
 __all__ = [
     "ProteinDesignJob",
@@ -18,4 +31,13 @@ __all__ = [
     "BindingComputationResult",
     "LigandParameterizationJob",
     "LigandParameterizationResult",
+    "LigandParameterStore",
+    "PreparedLigand",
+    "MutationScanJob",
+    "MutationScanResult",
+    "LigandPosePlacementJob",
+    "LigandPoseScreeningJob",
+    "LigandPoseResult",
+    "LigandPoseAnalysisJob",
+    "LigandPoseAnalysisResult",
 ]
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import errno
+import os
 import shutil
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Mapping
 
-from ..artifacts import UniDesignArtifact
+from ..artifacts import TrajectoryArtifacts, UniDesignArtifact
+from ..packs import ArtifactPack
+from ..runner import RelocationStrategy, UniDesignRunner, UniDesignRunResult
 
 
 ArtifactFactory = Callable[[Path, str, str], UniDesignArtifact]
@@ -33,24 +37,102 @@ class ArtifactSpec:
         return cls(relative_path=relative_path, factory=_factory)
 
 
+@dataclass(slots=True)
+class TrajectoryArtifactSpec:
+    """Description of an artifact written once per design trajectory.
+
+    Matching files are named ``{stem}{index}{extension}`` where ``index`` is
+    the zero-padded trajectory number emitted by the binary.
+    """
+
+    stem: str
+    extension: str
+    factory: ArtifactFactory
+
+    @classmethod
+    def from_type(
+        cls, stem: str, extension: str, artifact_type: type[UniDesignArtifact]
+    ) -> TrajectoryArtifactSpec:
+        """Convenience constructor for simple artifact factories."""
+
+        base = ArtifactSpec.from_type(Path(stem), artifact_type)
+        return cls(stem=stem, extension=extension, factory=base.factory)
+
+    def match(self, filename: str) -> int | None:
+        """Return the trajectory index encoded in ``filename``, if it matches."""
+
+        if not (filename.startswith(self.stem) and filename.endswith(self.extension)):
+            return None
+        digits = filename[len(self.stem) : len(filename) - len(self.extension)]
+        return int(digits) if digits.isdigit() else None
+
+
+CandidateSpec = ArtifactSpec | TrajectoryArtifactSpec
+
+
+def _list_files(workdir: Path) -> set[str]:
+    with os.scandir(workdir) as entries:
+        return {entry.name for entry in entries if entry.is_file()}
+
+
 def _existing_artifacts(
-    workdir: Path, candidates: Mapping[str, ArtifactSpec]
-) -> dict[str, tuple[Path, ArtifactSpec]]:
+    workdir: Path, candidates: Mapping[str, CandidateSpec]
+) -> tuple[
+    dict[str, tuple[Path, ArtifactSpec]],
+    dict[str, tuple[dict[int, str], TrajectoryArtifactSpec]],
+]:
+    """Resolve candidates against one listing of ``workdir``."""
+
+    listing = _list_files(workdir)
     existing: dict[str, tuple[Path, ArtifactSpec]] = {}
+    trajectories: dict[str, tuple[dict[int, str], TrajectoryArtifactSpec]] = {}
     for name, spec in candidates.items():
+        if isinstance(spec, TrajectoryArtifactSpec):
+            matches: dict[int, str] = {}
+            for filename in listing:
+                index = spec.match(filename)
+                if index is not None:
+                    matches[index] = filename
+            trajectories[name] = (matches, spec)
+            continue
         candidate = workdir / spec.relative_path
-        if candidate.exists():
+        if len(spec.relative_path.parts) == 1 and not spec.relative_path.is_absolute():
+            found = spec.relative_path.name in listing
+        else:
+            found = candidate.exists()
+        if found:
             existing[name] = (candidate, spec)
-    return existing
+    return existing, trajectories
+
+
+def _transfer(source: Path, target: Path, strategy: RelocationStrategy) -> None:
+    """Place ``source`` at ``target`` without copying data when the strategy allows it."""
+
+    if strategy != "copy":
+        try:
+            if strategy == "hardlink":
+                os.link(source, target)
+            else:
+                os.replace(source, target)
+            return
+        except OSError as exc:
+            if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+    shutil.copy2(source, target)
 
 
 def relocate_artifacts(
     workdir: Path,
-    candidates: Mapping[str, ArtifactSpec],
+    candidates: Mapping[str, CandidateSpec],
     *,
     keep_workspace: bool,
     prefix: str,
-) -> tuple[Path, dict[str, UniDesignArtifact], Callable[[], None]]:
+    strategy: RelocationStrategy = "copy",
+    pack: ArtifactPack | None = None,
+    destination_dir: Path | None = None,
+) -> tuple[
+    Path, dict[str, UniDesignArtifact | TrajectoryArtifacts], Callable[[], None]
+]:
     """Relocate generated files based on caller preferences.
 
     Parameters
@@ -58,36 +140,62 @@ def relocate_artifacts(
     workdir:
         Temporary directory that holds the UniDesign execution artefacts.
     candidates:
-        Mapping of artifact names to :class:`ArtifactSpec` entries describing
-        potential files.
+        Mapping of artifact names to :class:`ArtifactSpec` or
+        :class:`TrajectoryArtifactSpec` entries describing potential files.
     keep_workspace:
         Whether the caller wants to retain the original ``workdir``.
+    strategy:
+        How artefacts reach the new directory when ``keep_workspace`` is
+        ``False``. ``"rename"`` and ``"hardlink"`` create the directory next to
+        ``workdir`` so no file contents are rewritten on a shared filesystem;
+        both degrade to copying across devices.
+    pack:
+        When given and ``keep_workspace`` is ``False``, the artefacts are
+        appended to this archive as ``<workdir name>/<filename>`` members
+        instead of being moved to a new directory.
+    destination_dir:
+        Parent of the new directory, overriding the one ``strategy`` picks;
+        used to flush the artefacts of a RAM-backed workdir to disk.
 
     Returns
     -------
     workspace:
         Directory retained for downstream consumers. When ``keep_workspace`` is
         ``False`` a new directory is created and populated with only the
-        generated artefacts.
+        generated artefacts. With ``pack`` this is a label,
+        ``<archive>/<workdir name>``, rather than a directory.
     artifacts:
         Mapping of artifact names to concrete :class:`~unidesign.artifacts.UniDesignArtifact`
-        instances.
+        instances. Trajectory candidates always map to a (possibly empty)
+        :class:`~unidesign.artifacts.TrajectoryArtifacts` collection.
     cleanup:
         Callable that removes ``workspace`` when invoked.
     """
 
-    existing = _existing_artifacts(workdir, candidates)
+    existing, trajectories = _existing_artifacts(workdir, candidates)
 
     if keep_workspace:
-        artifacts = {
+        artifacts: dict[str, UniDesignArtifact | TrajectoryArtifacts] = {
             name: spec.factory(path=path, prefix=prefix, logical_name=name)
             for name, (path, spec) in existing.items()
         }
+        for name, (filenames, spec) in trajectories.items():
+            artifacts[name] = TrajectoryArtifacts(
+                workdir, prefix, name, filenames, spec.factory
+            )
         cleanup = lambda: shutil.rmtree(workdir, ignore_errors=True)
         return workdir, artifacts, cleanup
 
-    destination = Path(tempfile.mkdtemp(prefix="unidesign_artifacts_"))
-    relocated: dict[str, UniDesignArtifact] = {}
+    if pack is not None:
+        return _pack_artifacts(workdir, existing, trajectories, prefix, pack)
+
+    destination = Path(
+        tempfile.mkdtemp(
+            prefix="unidesign_artifacts_",
+            dir=destination_dir or (None if strategy == "copy" else workdir.parent),
+        )
+    )
+    relocated: dict[str, UniDesignArtifact | TrajectoryArtifacts] = {}
 
     for name, (source, spec) in existing.items():
         try:
@@ -96,12 +204,114 @@ def relocate_artifacts(
             relative = Path(source.name)
         target = destination / relative
         target.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source, target)
+        _transfer(source, target, strategy)
         relocated[name] = spec.factory(path=target, prefix=prefix, logical_name=name)
 
+    for name, (filenames, spec) in trajectories.items():
+        for filename in filenames.values():
+            _transfer(workdir / filename, destination / filename, strategy)
+        relocated[name] = TrajectoryArtifacts(
+            destination, prefix, name, filenames, spec.factory
+        )
+
     shutil.rmtree(workdir, ignore_errors=True)
     cleanup = lambda: shutil.rmtree(destination, ignore_errors=True)
     return destination, relocated, cleanup
 
 
-__all__ = ["ArtifactSpec", "relocate_artifacts"]
+def _pack_artifacts(
+    workdir: Path,
+    existing: Mapping[str, tuple[Path, ArtifactSpec]],
+    trajectories: Mapping[str, tuple[dict[int, str], TrajectoryArtifactSpec]],
+    prefix: str,
+    pack: ArtifactPack,
+) -> tuple[
+    Path, dict[str, UniDesignArtifact | TrajectoryArtifacts], Callable[[], None]
+]:
+    """Append the artefacts of ``workdir`` to ``pack`` and remove the workdir."""
+
+    label = pack.path / workdir.name
+    sources: dict[str, Path] = {}
+    members: dict[str, str] = {}
+    for name, (source, _) in existing.items():
+        try:
+            relative = source.relative_to(workdir).as_posix()
+        except ValueError:
+            relative = source.name
+        members[name] = f"{workdir.name}/{relative}"
+        sources[members[name]] = source
+    for filenames, _ in trajectories.values():
+        for _, filename in sorted(filenames.items()):
+            sources[f"{workdir.name}/{filename}"] = workdir / filename
+
+    packed = pack.add_files(sources)
+    relocated: dict[str, UniDesignArtifact | TrajectoryArtifacts] = {}
+    for name, (_, spec) in existing.items():
+        artifact = spec.factory(
+            path=pack.path / members[name], prefix=prefix, logical_name=name
+        )
+        artifact.member = packed[members[name]]
+        relocated[name] = artifact
+    for name, (filenames, spec) in trajectories.items():
+        relocated[name] = TrajectoryArtifacts(
+            label, prefix, name, filenames, spec.factory, pack=pack
+        )
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    # Archive members are never removed; the cleanup only exists for symmetry.
+    return label, relocated, lambda: None
+
+
+def relocate_run(
+    runner: UniDesignRunner,
+    run_result: UniDesignRunResult,
+    candidates: Mapping[str, CandidateSpec],
+    *,
+    keep_workspace: bool,
+) -> tuple[
+    Path, dict[str, UniDesignArtifact | TrajectoryArtifacts], Callable[[], None]
+]:
+    """Apply :func:`relocate_artifacts` with the settings of ``runner``.
+
+    ``run_result.workdir`` is updated to point at the retained workspace.
+    Outputs of a workdir on :attr:`~unidesign.runner.UniDesignRunner.tmpfs_workdirs`
+    are flushed to :meth:`~unidesign.runner.UniDesignRunner.spill_dir`: only
+    the artefacts when the workspace is discarded, the whole workdir when
+    it is kept.
+    """
+
+    tracer = runner.tracer
+    workdir = run_result.workdir
+    spill_dir = runner.spill_dir(workdir)
+    with tracer.span(
+        "job.relocate", prefix=run_result.prefix, keep_workspace=keep_workspace
+    ) as span:
+        if keep_workspace and spill_dir is not None:
+            with tracer.span("job.spill"):
+                workdir = Path(shutil.move(str(workdir), str(spill_dir / workdir.name)))
+        workspace, artifacts, cleanup = relocate_artifacts(
+            workdir,
+            candidates,
+            keep_workspace=keep_workspace,
+            prefix=run_result.prefix,
+            strategy=runner.relocation_strategy,
+            pack=runner.artifact_pack,
+            destination_dir=spill_dir,
+        )
+        if tracer.enabled:
+            span.set(
+                artifacts=len(artifacts),
+                workspace_bytes=runner.workdir_bytes(workspace),
+                packed=runner.artifact_pack is not None and not keep_workspace,
+            )
+    run_result.workdir = workspace
+    return workspace, artifacts, cleanup
+
+
+__all__ = [
+    "ArtifactSpec",
+    "CandidateSpec",
+    "TrajectoryArtifactSpec",
+    "relocate_artifacts",
+    "relocate_run",
+]
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import os
+import re
+import secrets
+import shutil
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Callable, Mapping
+from typing import Any, Callable, Mapping, Sequence
 
 from ..artifacts import (
     DesignRotamerIndices,
@@ -14,15 +19,159 @@ from ..artifacts import (
     SelfEnergyReport,
     SiteSummary,
     StructureModel,
+    TrajectoryArtifacts,
 )
-from ..config import ProteinDesignConfig
+from ..batch import UniDesignBatchRunner
+from ..config import ProteinDesignConfig, config_hash
+from ..resources import RunResources
 from ..runner import UniDesignRunner, UniDesignRunResult
-from ._shared import ArtifactSpec, relocate_artifacts
+from ._shared import (
+    ArtifactSpec,
+    CandidateSpec,
+    TrajectoryArtifactSpec,
+    relocate_run,
+)
+
+
+_TRAJECTORY_OUTPUT = re.compile(
+    r"_(?P<kind>beststruct|bestsites|bestmutsites|bestlig)(?P<index>\d{4,})\.(?:pdb|mol2)$"
+)
+
+
+def trajectory_windows(start: int, end: int, shards: int) -> list[tuple[int, int]]:
+    """Split the inclusive trajectory range ``start..end`` into contiguous windows.
+
+    At most ``shards`` windows are returned; their sizes differ by at most one
+    trajectory and together they cover the range exactly once.
+    """
+
+    if start <= 0 or end < start:
+        raise ValueError(f"invalid trajectory range {start}..{end}")
+    if shards <= 0:
+        raise ValueError("shards must be positive")
+    total = end - start + 1
+    count = min(shards, total)
+    base, extra = divmod(total, count)
+    windows: list[tuple[int, int]] = []
+    first = start
+    for shard in range(count):
+        size = base + (1 if shard < extra else 0)
+        windows.append((first, first + size - 1))
+        first += size
+    return windows
+
+
+_SEED_LIMIT = 1 << 31
+
+
+def window_configs(
+    config: ProteinDesignConfig,
+    windows: Sequence[tuple[int, int]],
+    base_seed: int | None = None,
+) -> list[ProteinDesignConfig]:
+    """Return one copy of ``config`` per trajectory window, each with its own ``--random_seed``.
+
+    The native annealing seeds from the clock in whole seconds, so windows
+    started together would otherwise repeat each other's trajectories. The
+    window starting at trajectory ``first`` gets ``base_seed + first - 1``,
+    which keeps the seeds of one range distinct and lets a resumed window
+    reuse the seed it had before. ``base_seed`` defaults to
+    ``config.random_seed`` and otherwise to a fresh random value.
+    """
+
+    if base_seed is None:
+        base_seed = config.random_seed
+    if base_seed is None:
+        base_seed = secrets.randbelow(_SEED_LIMIT)
+    return [
+        replace(
+            config,
+            n_trajectory_start_index=first,
+            n_trajectories=last,
+            random_seed=(base_seed + first - 1) % _SEED_LIMIT,
+        )
+        for first, last in windows
+    ]
+
+
+def _split_bestseqs(path: Path) -> tuple[list[str], list[str]]:
+    header: list[str] = []
+    records: list[str] = []
+    if not path.is_file():
+        return header, records
+    with path.open("r", encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            if line.startswith("#"):
+                header.append(line)
+            elif line.strip():
+                records.append(line)
+    return header, records
+
+
+def _combined_resources(runs: Sequence[UniDesignRunResult]) -> RunResources | None:
+    parts = [run.resources for run in runs]
+    if any(part is None for part in parts):
+        return None
+    return RunResources.combine(parts)
+
+
+def merge_trajectory_workdirs(
+    runs: Sequence[UniDesignRunResult], args: Sequence[str]
+) -> UniDesignRunResult:
+    """Fold per-window ``ProteinDesign`` workdirs into the first one.
+
+    Trajectory outputs of later windows are renamed onto the prefix of the
+    first window and the ``_bestseqs.txt`` records are concatenated in window
+    order, so the merged workdir looks like the output of a single run over the
+    whole trajectory range. The other workdirs are removed.
+    """
+
+    if not runs:
+        raise ValueError("at least one run is required")
+    primary = runs[0]
+    prefix = primary.prefix
+    header, records = _split_bestseqs(primary.workdir / f"{prefix}_bestseqs.txt")
+    for run in runs[1:]:
+        shard_header, shard_records = _split_bestseqs(
+            run.workdir / f"{run.prefix}_bestseqs.txt"
+        )
+        header = header or shard_header
+        records.extend(shard_records)
+        with os.scandir(run.workdir) as entries:
+            for entry in entries:
+                if not entry.name.startswith(run.prefix):
+                    continue
+                remainder = entry.name[len(run.prefix):]
+                if _TRAJECTORY_OUTPUT.fullmatch(remainder):
+                    os.replace(entry.path, primary.workdir / f"{prefix}{remainder}")
+        shutil.rmtree(run.workdir, ignore_errors=True)
+    if header or records:
+        (primary.workdir / f"{prefix}_bestseqs.txt").write_text(
+            "".join(header + records), encoding="utf-8"
+        )
+
+    returncode = next((run.returncode for run in runs if run.returncode != 0), 0)
+    return UniDesignRunResult(
+        args=("--prefix", prefix, *args),
+        returncode=returncode,
+        stdout="".join(run.stdout for run in runs),
+        stderr="".join(run.stderr for run in runs),
+        workdir=primary.workdir,
+        prefix=prefix,
+        resources=_combined_resources(runs),
+    )
 
 
 @dataclass(slots=True)
 class ProteinDesignResult:
-    """Result bundle returned by :class:`ProteinDesignJob`."""
+    """Result bundle returned by :class:`ProteinDesignJob`.
+
+    The native binary writes one structure, site model and (for ligand modes)
+    pose per trajectory. Those are exposed through the ``best_structures``,
+    ``best_site_models``, ``best_mutation_site_models`` and ``best_ligand_poses``
+    collections keyed by trajectory index; the singular fields hold the entry
+    of the lowest trajectory index for convenience.
+    """
 
     run: UniDesignRunResult
     workspace: Path
@@ -36,6 +185,10 @@ class ProteinDesignResult:
     best_sites: SiteSummary | None
     best_mutation_sites: SiteSummary | None
     best_ligand_pose: LigandPoseEnsemble | None
+    best_structures: TrajectoryArtifacts[StructureModel]
+    best_site_models: TrajectoryArtifacts[SiteSummary]
+    best_mutation_site_models: TrajectoryArtifacts[SiteSummary]
+    best_ligand_poses: TrajectoryArtifacts[LigandPoseEnsemble]
     cleanup: Callable[[], None] | None
 
     def close(self) -> None:
@@ -53,7 +206,7 @@ class ProteinDesignJob:
         self._runner = runner
         self._config = config
 
-    def _candidate_files(self, prefix: str) -> Mapping[str, ArtifactSpec]:
+    def _candidate_files(self, prefix: str) -> Mapping[str, CandidateSpec]:
         return {
             "self_energy": ArtifactSpec.from_type(
                 Path(f"{prefix}_selfenergy.txt"), SelfEnergyReport
@@ -71,40 +224,53 @@ class ProteinDesignJob:
                 Path(f"{prefix}_desseqs"), DesignSequenceSet
             ),
             "best_sequences": ArtifactSpec.from_type(
-                Path(f"{prefix}_bestseqs"), DesignSequenceSet
+                Path(f"{prefix}_bestseqs.txt"), DesignSequenceSet
             ),
-            "best_structure": ArtifactSpec.from_type(
-                Path(f"{prefix}_beststruct"), StructureModel
+            "best_structures": TrajectoryArtifactSpec.from_type(
+                f"{prefix}_beststruct", ".pdb", StructureModel
             ),
-            "best_sites": ArtifactSpec.from_type(
-                Path(f"{prefix}_bestsites"), SiteSummary
+            "best_site_models": TrajectoryArtifactSpec.from_type(
+                f"{prefix}_bestsites", ".pdb", SiteSummary
             ),
-            "best_mutation_sites": ArtifactSpec.from_type(
-                Path(f"{prefix}_bestmutsites"), SiteSummary
+            "best_mutation_site_models": TrajectoryArtifactSpec.from_type(
+                f"{prefix}_bestmutsites", ".pdb", SiteSummary
             ),
-            "best_ligand_pose": ArtifactSpec.from_type(
-                Path(f"{prefix}_bestlig"), LigandPoseEnsemble
+            "best_ligand_poses": TrajectoryArtifactSpec.from_type(
+                f"{prefix}_bestlig", ".mol2", LigandPoseEnsemble
             ),
         }
 
-    def run(
-        self,
-        *,
-        keep_workspace: bool = False,
-        env: Mapping[str, str] | None = None,
-    ) -> ProteinDesignResult:
-        """Execute the UniDesign ``ProteinDesign`` command."""
+    def _span(self, method: str) -> Any:
+        """Open the span covering one execution of this job."""
 
-        run_result = self._runner.run(
-            self._config.to_cli_args(), env=env, persist_workdir=True
+        tracer = self._runner.tracer
+        if not tracer.enabled:
+            return tracer.span("job.protein_design")
+        return tracer.span(
+            "job.protein_design",
+            method=method,
+            config_hash=config_hash(self._config.to_cli_args()),
         )
-        workspace, artifacts, cleanup = relocate_artifacts(
-            run_result.workdir,
+
+    def _collect(
+        self, run_result: UniDesignRunResult, keep_workspace: bool
+    ) -> ProteinDesignResult:
+        with self._runner.tracer.span("job.collect", prefix=run_result.prefix):
+            return self._build_result(run_result, keep_workspace)
+
+    def _build_result(
+        self, run_result: UniDesignRunResult, keep_workspace: bool
+    ) -> ProteinDesignResult:
+        workspace, artifacts, cleanup = relocate_run(
+            self._runner,
+            run_result,
             self._candidate_files(run_result.prefix),
             keep_workspace=keep_workspace,
-            prefix=run_result.prefix,
         )
-        run_result.workdir = workspace
+        best_structures = artifacts["best_structures"]
+        best_site_models = artifacts["best_site_models"]
+        best_mutation_site_models = artifacts["best_mutation_site_models"]
+        best_ligand_poses = artifacts["best_ligand_poses"]
 
         return ProteinDesignResult(
             run=run_result,
@@ -115,12 +281,115 @@ class ProteinDesignJob:
             design_rotamer_indices=artifacts.get("design_rotamer_indices"),
             design_sequences=artifacts.get("design_sequences"),
             best_sequences=artifacts.get("best_sequences"),
-            best_structure=artifacts.get("best_structure"),
-            best_sites=artifacts.get("best_sites"),
-            best_mutation_sites=artifacts.get("best_mutation_sites"),
-            best_ligand_pose=artifacts.get("best_ligand_pose"),
+            best_structure=best_structures.first(),
+            best_sites=best_site_models.first(),
+            best_mutation_sites=best_mutation_site_models.first(),
+            best_ligand_pose=best_ligand_poses.first(),
+            best_structures=best_structures,
+            best_site_models=best_site_models,
+            best_mutation_site_models=best_mutation_site_models,
+            best_ligand_poses=best_ligand_poses,
             cleanup=cleanup,
         )
 
+    def run(
+        self,
+        *,
+        keep_workspace: bool = False,
+        env: Mapping[str, str] | None = None,
+    ) -> ProteinDesignResult:
+        """Execute the UniDesign ``ProteinDesign`` command."""
+
+        with self._span("run"):
+            run_result = self._runner.run(
+                self._config.to_cli_args(), env=env, persist_workdir=True
+            )
+            return self._collect(run_result, keep_workspace)
+
+    def run_sharded(
+        self,
+        shards: int,
+        *,
+        max_workers: int | None = None,
+        keep_workspace: bool = False,
+        env: Mapping[str, str] | None = None,
+    ) -> ProteinDesignResult:
+        """Run the trajectory range in ``shards`` parallel ``ProteinDesign`` processes.
+
+        The native loop visits trajectories ``n_trajectory_start_index`` through
+        ``n_trajectories`` inclusive. That range is split with
+        :func:`trajectory_windows`, each window runs with its own
+        ``--ntraj_start_ndx``/``--ntraj`` pair and ``--random_seed`` (see
+        :func:`window_configs`), and the outputs are merged with
+        :func:`merge_trajectory_workdirs` before artifacts are collected.
+        """
+
+        start = self._config.n_trajectory_start_index or 1
+        end = self._config.n_trajectories or 1
+        windows = trajectory_windows(start, end, shards)
+        if len(windows) == 1:
+            return self.run(keep_workspace=keep_workspace, env=env)
+        with self._span("run_sharded") as span:
+            span.set(shards=len(windows))
+            return self._run_windows(windows, max_workers, keep_workspace, env)
+
+    def _run_windows(
+        self,
+        windows: list[tuple[int, int]],
+        max_workers: int | None,
+        keep_workspace: bool,
+        env: Mapping[str, str] | None,
+    ) -> ProteinDesignResult:
+        configs = window_configs(self._config, windows)
+        batch = UniDesignBatchRunner(
+            self._runner, max_workers=max_workers or len(configs)
+        )
+        outcomes = batch.run_all(
+            configs,
+            execute=lambda config: self._runner.run(
+                config.to_cli_args(), env=env, persist_workdir=True
+            ),
+        )
+        failures = [outcome.error for outcome in outcomes if not outcome.ok]
+        if failures:
+            for outcome in outcomes:
+                if outcome.ok:
+                    shutil.rmtree(outcome.result.workdir, ignore_errors=True)
+            raise failures[0]
+
+        with self._runner.tracer.span("job.merge", shards=len(outcomes)):
+            merged = merge_trajectory_workdirs(
+                [outcome.unwrap() for outcome in outcomes], self._config.to_cli_args()
+            )
+        return self._collect(merged, keep_workspace)
+
+    async def run_async(
+        self,
+        *,
+        keep_workspace: bool = False,
+        env: Mapping[str, str] | None = None,
+        on_stdout_line: Callable[[str], None] | None = None,
+    ) -> ProteinDesignResult:
+        """Asyncio variant of :meth:`run` that can observe progress line by line.
+
+        The outputs are relocated and indexed in a worker thread, so the event
+        loop is not blocked by file I/O after the process exits.
+        """
+
+        with self._span("run_async"):
+            run_result = await self._runner.run_async(
+                self._config.to_cli_args(),
+                env=env,
+                persist_workdir=True,
+                on_stdout_line=on_stdout_line,
+            )
+            return await asyncio.to_thread(self._collect, run_result, keep_workspace)
+
 
-__all__ = ["ProteinDesignJob", "ProteinDesignResult"]
+__all__ = [
+    "ProteinDesignJob",
+    "ProteinDesignResult",
+    "merge_trajectory_workdirs",
+    "trajectory_windows",
+    "window_configs",
+]
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Mapping
 
 from ..artifacts import RotamerList
 from ..config import ComputeBindingConfig, ComputeStabilityConfig
+from ..energy_terms import EnergyBreakdown, parse_energy_breakdown, parse_energy_breakdowns
 from ..runner import UniDesignRunner, UniDesignRunResult
-from ._shared import ArtifactSpec, relocate_artifacts
+from ._shared import ArtifactSpec, relocate_run
 
 
 @dataclass(slots=True)
@@ -21,6 +23,11 @@ class StabilityComputationResult:
     rotamer_list: RotamerList | None
     cleanup: Callable[[], None] | None
 
+    def energy_breakdown(self) -> EnergyBreakdown | None:
+        """Parse the "Structure energy details" block from the captured output."""
+
+        return parse_energy_breakdown(self.run.stdout)
+
     def close(self) -> None:
         if self.cleanup is not None:
             self.cleanup()
@@ -34,27 +41,20 @@ class StabilityComputationJob:
         self._runner = runner
         self._config = config
 
-    def run(
-        self,
-        *,
-        keep_workspace: bool = False,
-        env: Mapping[str, str] | None = None,
+    def _collect(
+        self, run_result: UniDesignRunResult, keep_workspace: bool
     ) -> StabilityComputationResult:
-        run_result = self._runner.run(
-            self._config.to_cli_args(), env=env, persist_workdir=True
-        )
         candidates = {
             "rotamer_list": ArtifactSpec.from_type(
                 Path(f"{run_result.prefix}_rotlist.txt"), RotamerList
             ),
         }
-        workspace, artifacts, cleanup = relocate_artifacts(
-            run_result.workdir,
+        workspace, artifacts, cleanup = relocate_run(
+            self._runner,
+            run_result,
             candidates,
             keep_workspace=keep_workspace,
-            prefix=run_result.prefix,
         )
-        run_result.workdir = workspace
 
         return StabilityComputationResult(
             run=run_result,
@@ -63,6 +63,32 @@ class StabilityComputationJob:
             cleanup=cleanup,
         )
 
+    def run(
+        self,
+        *,
+        keep_workspace: bool = False,
+        env: Mapping[str, str] | None = None,
+    ) -> StabilityComputationResult:
+        run_result = self._runner.run(
+            self._config.to_cli_args(), env=env, persist_workdir=True
+        )
+        return self._collect(run_result, keep_workspace)
+
+    async def run_async(
+        self,
+        *,
+        keep_workspace: bool = False,
+        env: Mapping[str, str] | None = None,
+        on_stdout_line: Callable[[str], None] | None = None,
+    ) -> StabilityComputationResult:
+        run_result = await self._runner.run_async(
+            self._config.to_cli_args(),
+            env=env,
+            persist_workdir=True,
+            on_stdout_line=on_stdout_line,
+        )
+        return await asyncio.to_thread(self._collect, run_result, keep_workspace)
+
 
 @dataclass(slots=True)
 class BindingComputationResult:
@@ -72,6 +98,11 @@ class BindingComputationResult:
     workspace: Path
     cleanup: Callable[[], None] | None
 
+    def energy_breakdowns(self) -> list[EnergyBreakdown]:
+        """Parse every "Binding energy details" block from the captured output."""
+
+        return parse_energy_breakdowns(self.run.stdout)
+
     def close(self) -> None:
         if self.cleanup is not None:
             self.cleanup()
@@ -85,6 +116,21 @@ class BindingComputationJob:
         self._runner = runner
         self._config = config
 
+    def _collect(
+        self, run_result: UniDesignRunResult, keep_workspace: bool
+    ) -> BindingComputationResult:
+        workspace, _, cleanup = relocate_run(
+            self._runner,
+            run_result,
+            {},
+            keep_workspace=keep_workspace,
+        )
+        return BindingComputationResult(
+            run=run_result,
+            workspace=workspace,
+            cleanup=cleanup,
+        )
+
     def run(
         self,
         *,
@@ -94,18 +140,22 @@ class BindingComputationJob:
         run_result = self._runner.run(
             self._config.to_cli_args(), env=env, persist_workdir=True
         )
-        workspace, _, cleanup = relocate_artifacts(
-            run_result.workdir,
-            {},
-            keep_workspace=keep_workspace,
-            prefix=run_result.prefix,
-        )
-        run_result.workdir = workspace
-        return BindingComputationResult(
-            run=run_result,
-            workspace=workspace,
-            cleanup=cleanup,
+        return self._collect(run_result, keep_workspace)
+
+    async def run_async(
+        self,
+        *,
+        keep_workspace: bool = False,
+        env: Mapping[str, str] | None = None,
+        on_stdout_line: Callable[[str], None] | None = None,
+    ) -> BindingComputationResult:
+        run_result = await self._runner.run_async(
+            self._config.to_cli_args(),
+            env=env,
+            persist_workdir=True,
+            on_stdout_line=on_stdout_line,
         )
+        return await asyncio.to_thread(self._collect, run_result, keep_workspace)
 
 
 __all__ = [
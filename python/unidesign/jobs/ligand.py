@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Mapping
+from typing import Callable, Iterator, Mapping, Sequence
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
 
 from ..artifacts import LigandParameters, LigandTopology
-from ..config import MakeLigParamConfig
+from ..cache import _sha256_file
+from ..config import MakeLigParamConfig, ProteinDesignConfig, _normalise_atom_triplet
+from ..exceptions import UniDesignError
 from ..runner import UniDesignRunner, UniDesignRunResult
-from ._shared import ArtifactSpec, relocate_artifacts
+from ._shared import ArtifactSpec, relocate_run
 
 
 @dataclass(slots=True)
@@ -35,15 +51,9 @@ class LigandParameterizationJob:
         self._runner = runner
         self._config = config
 
-    def run(
-        self,
-        *,
-        keep_workspace: bool = False,
-        env: Mapping[str, str] | None = None,
+    def _collect(
+        self, run_result: UniDesignRunResult, keep_workspace: bool
     ) -> LigandParameterizationResult:
-        run_result = self._runner.run(
-            self._config.to_cli_args(), env=env, persist_workdir=True
-        )
         candidates = {
             "parameter_file": ArtifactSpec.from_type(
                 Path(self._config.ligand_parameter_path), LigandParameters
@@ -52,13 +62,12 @@ class LigandParameterizationJob:
                 Path(self._config.ligand_topology_path), LigandTopology
             ),
         }
-        workspace, artifacts, cleanup = relocate_artifacts(
-            run_result.workdir,
+        workspace, artifacts, cleanup = relocate_run(
+            self._runner,
+            run_result,
             candidates,
             keep_workspace=keep_workspace,
-            prefix=run_result.prefix,
         )
-        run_result.workdir = workspace
         return LigandParameterizationResult(
             run=run_result,
             workspace=workspace,
@@ -67,5 +76,215 @@ class LigandParameterizationJob:
             cleanup=cleanup,
         )
 
+    def run(
+        self,
+        *,
+        keep_workspace: bool = False,
+        env: Mapping[str, str] | None = None,
+    ) -> LigandParameterizationResult:
+        run_result = self._runner.run(
+            self._config.to_cli_args(), env=env, persist_workdir=True
+        )
+        return self._collect(run_result, keep_workspace)
+
+    async def run_async(
+        self,
+        *,
+        keep_workspace: bool = False,
+        env: Mapping[str, str] | None = None,
+        on_stdout_line: Callable[[str], None] | None = None,
+    ) -> LigandParameterizationResult:
+        run_result = await self._runner.run_async(
+            self._config.to_cli_args(),
+            env=env,
+            persist_workdir=True,
+            on_stdout_line=on_stdout_line,
+        )
+        return await asyncio.to_thread(self._collect, run_result, keep_workspace)
+
+
+_PARAMETER_FILE = "LIG_PARAM.prm"
+_TOPOLOGY_FILE = "LIG_TOPO.inp"
+_ENTRY_FILE = "ligand.json"
+
+
+@dataclass(slots=True)
+class PreparedLigand:
+    """Parameter and topology files generated once for a ligand."""
+
+    key: str
+    """Digest of the ``mol2`` bytes and the ``--init_3atoms`` triplet."""
+
+    parameter_path: Path
+    """Generated ``--lig_param`` file."""
+
+    topology_path: Path
+    """Generated ``--lig_topo`` file."""
+
+    def configure(self, config: ProteinDesignConfig) -> ProteinDesignConfig:
+        """Return a copy of ``config`` reading this ligand's parameter and topology."""
+
+        return dataclasses.replace(
+            config,
+            ligand_parameter_path=self.parameter_path,
+            ligand_topology_path=self.topology_path,
+        )
+
+
+class LigandParameterStore:
+    """Directory of ``MakeLigParamAndTopo`` outputs keyed by ligand content.
+
+    A ligand is parameterized the first time it is requested; later requests
+    for the same ``mol2`` bytes and initial atoms reuse the stored files, so
+    any number of design jobs can share one prepared ligand. Generation is
+    serialized per key across threads and, where ``fcntl`` is available,
+    across processes sharing ``directory``. Entries are published with an
+    atomic rename and never modified afterwards.
+    """
+
+    def __init__(self, runner: UniDesignRunner, directory: os.PathLike[str] | str) -> None:
+        self._runner = runner
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @staticmethod
+    def key_for(
+        mol2_path: os.PathLike[str] | str, initial_atoms: Sequence[str] = ("C1", "C2", "C3")
+    ) -> str:
+        """Return the store key of ``mol2_path`` parameterized from ``initial_atoms``."""
+
+        atoms = _normalise_atom_triplet(initial_atoms)
+        digest = hashlib.sha256()
+        digest.update(_sha256_file(Path(mol2_path)).encode())
+        digest.update(b"\0init_3atoms\0")
+        digest.update(",".join(atoms).encode())
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._directory / key[:2] / key
+
+    def _load(self, key: str) -> PreparedLigand | None:
+        entry_dir = self._entry_dir(key)
+        if not (entry_dir / _ENTRY_FILE).is_file():
+            return None
+        return PreparedLigand(
+            key=key,
+            parameter_path=entry_dir / _PARAMETER_FILE,
+            topology_path=entry_dir / _TOPOLOGY_FILE,
+        )
+
+    def get(
+        self,
+        mol2_path: os.PathLike[str] | str,
+        initial_atoms: Sequence[str] = ("C1", "C2", "C3"),
+    ) -> PreparedLigand | None:
+        """Return the stored ligand without generating it, or ``None``."""
+
+        return self._load(self.key_for(mol2_path, initial_atoms))
+
+    @contextmanager
+    def _exclusive(self, key: str) -> Iterator[None]:
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            shard = self._entry_dir(key).parent
+            shard.mkdir(parents=True, exist_ok=True)
+            with (shard / f".{key}.lock").open("a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _generate(
+        self,
+        key: str,
+        mol2_path: Path,
+        initial_atoms: tuple[str, str, str],
+        env: Mapping[str, str] | None,
+    ) -> None:
+        config = MakeLigParamConfig(
+            mol2_path=mol2_path.resolve(),
+            ligand_parameter_path=_PARAMETER_FILE,
+            ligand_topology_path=_TOPOLOGY_FILE,
+            initial_atoms=initial_atoms,
+        )
+        result = LigandParameterizationJob(self._runner, config).run(env=env)
+        try:
+            if (
+                result.run.returncode != 0
+                or result.parameter_file is None
+                or result.topology_file is None
+            ):
+                message = result.run.stderr.strip() or result.run.stdout.strip()[-500:]
+                raise UniDesignError(
+                    f"MakeLigParamAndTopo failed for {mol2_path}: {message or 'no output files'}"
+                )
+            destination = self._entry_dir(key)
+            staging = Path(tempfile.mkdtemp(prefix=".staging_", dir=destination.parent))
+            try:
+                result.parameter_file.persist(staging, _PARAMETER_FILE)
+                result.topology_file.persist(staging, _TOPOLOGY_FILE)
+                entry = {"mol2": str(mol2_path), "initial_atoms": list(initial_atoms)}
+                (staging / _ENTRY_FILE).write_text(json.dumps(entry), encoding="utf-8")
+                os.rename(staging, destination)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        finally:
+            result.close()
+
+    def prepare(
+        self,
+        mol2_path: os.PathLike[str] | str,
+        initial_atoms: Sequence[str] = ("C1", "C2", "C3"),
+        *,
+        env: Mapping[str, str] | None = None,
+    ) -> PreparedLigand:
+        """Return the stored ligand, running ``MakeLigParamAndTopo`` on a miss.
+
+        Raises :class:`~unidesign.exceptions.UniDesignError` when the binary
+        does not produce both files.
+        """
+
+        mol2_path = Path(mol2_path)
+        atoms = _normalise_atom_triplet(initial_atoms)
+        key = self.key_for(mol2_path, atoms)
+        prepared = self._load(key)
+        if prepared is not None:
+            return prepared
+        with self._exclusive(key):
+            prepared = self._load(key)
+            if prepared is None:
+                self._generate(key, mol2_path, atoms, env)
+                prepared = self._load(key)
+        assert prepared is not None
+        return prepared
+
+    def configure(
+        self,
+        config: ProteinDesignConfig,
+        mol2_path: os.PathLike[str] | str,
+        initial_atoms: Sequence[str] = ("C1", "C2", "C3"),
+        *,
+        env: Mapping[str, str] | None = None,
+    ) -> ProteinDesignConfig:
+        """Prepare the ligand if needed and point ``config`` at its files."""
+
+        return self.prepare(mol2_path, initial_atoms, env=env).configure(config)
+
 
-__all__ = ["LigandParameterizationJob", "LigandParameterizationResult"]
+__all__ = [
+    "LigandParameterStore",
+    "LigandParameterizationJob",
+    "LigandParameterizationResult",
+    "PreparedLigand",
+]
@@ -0,0 +1,494 @@
+"""Batched mutant construction and ddG scanning around ``BuildMutant``."""
+
+from __future__ import annotations
+
+import heapq
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Iterable, Literal, Mapping, Sequence
+
+import numpy as np
+
+from ..artifacts import StructureModel
+from ..batch import UniDesignBatchRunner, default_worker_count
+from ..config import BuildMutantConfig, ComputeStabilityConfig
+from ..energy_terms import parse_energy_breakdown, parse_energy_breakdowns
+from ..exceptions import UniDesignError
+from ..runner import UniDesignRunner, UniDesignRunResult
+from ..structure import load_atoms
+from ._shared import _transfer
+
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+"""One-letter codes accepted by ``BuildMutant``."""
+
+_THREE_TO_ONE = dict(
+    zip(
+        "ALA CYS ASP GLU PHE GLY HIS ILE LYS LEU MET ASN PRO GLN ARG SER THR VAL TRP TYR".split(),
+        AMINO_ACIDS,
+    ),
+    HSD="H",
+    HSE="H",
+)
+
+_POINT_MUTATION = re.compile(r"^([A-Z])([A-Za-z0-9])(-?\d+)([A-Z])$")
+
+# BuildMutant names its outputs after the hard-coded PDBID "pdb"; the
+# repacked wild-type reference of each model adds a "_WT" suffix.
+_MODEL_NAME = "pdb_Model_{index:04d}.pdb"
+
+# ``ComputeStability --pdblist`` announces each listed structure with this line.
+_LISTED_STRUCTURE = re.compile(r"^ComputeStability structure (\d+): ", re.MULTILINE)
+
+
+def normalize_mutant(mutant: str | Sequence[str]) -> str:
+    """Return ``mutant`` as the comma-separated form written to the mutant file.
+
+    Each point mutation must look like ``SA12G``: wild-type residue, chain,
+    position and mutant residue. Invalid entries raise ``ValueError`` here
+    instead of aborting a whole ``BuildMutant`` process.
+    """
+
+    parts = mutant.split(",") if isinstance(mutant, str) else list(mutant)
+    parts = [part.strip().rstrip(";") for part in parts if part.strip()]
+    if not parts:
+        raise ValueError("a mutant needs at least one point mutation")
+    for part in parts:
+        match = _POINT_MUTATION.match(part)
+        if match is None or not {match.group(1), match.group(4)} <= set(AMINO_ACIDS):
+            raise ValueError(f"invalid point mutation {part!r}; expected e.g. 'SA12G'")
+    return ",".join(parts)
+
+
+def saturation_mutants(
+    pdb_path: os.PathLike[str] | str,
+    *,
+    chains: str | None = None,
+    positions: Iterable[int] | None = None,
+    alphabet: str = AMINO_ACIDS,
+) -> list[str]:
+    """Enumerate every single-point substitution of a structure.
+
+    ``chains`` and ``positions`` restrict the residues that are mutated; the
+    wild-type residue itself is never emitted.
+    """
+
+    atoms = load_atoms(pdb_path, cache=False)
+    atoms = atoms[(atoms["name"] == b"CA") & ~atoms["hetero"]]
+    wanted = set(positions) if positions is not None else None
+    mutants: list[str] = []
+    for chain, resseq, resname in zip(
+        atoms["chain"].tolist(), atoms["resseq"].tolist(), atoms["resname"].tolist()
+    ):
+        chain, residue = chain.decode(), _THREE_TO_ONE.get(resname.decode())
+        if residue is None or (chains is not None and chain not in chains):
+            continue
+        if wanted is not None and resseq not in wanted:
+            continue
+        mutants.extend(
+            f"{residue}{chain}{resseq}{target}" for target in alphabet if target != residue
+        )
+    return mutants
+
+
+def _balanced_chunks(mutants: Sequence[str], count: int) -> list[list[int]]:
+    """Assign mutant indices to ``count`` chunks, balancing the point-mutation load."""
+
+    heap = [(0, chunk) for chunk in range(count)]
+    chunks: list[list[int]] = [[] for _ in range(count)]
+    order = sorted(range(len(mutants)), key=lambda index: -mutants[index].count(","))
+    for index in order:
+        load, chunk = heapq.heappop(heap)
+        chunks[chunk].append(index)
+        heapq.heappush(heap, (load + mutants[index].count(",") + 1, chunk))
+    return [sorted(chunk) for chunk in chunks if chunk]
+
+
+def _total_energy(run_result: UniDesignRunResult) -> float:
+    breakdown = parse_energy_breakdown(run_result.stdout)
+    if run_result.returncode != 0 or breakdown is None:
+        return float("nan")
+    return breakdown.total
+
+
+def _failure_message(run_result: UniDesignRunResult) -> str:
+    text = run_result.stderr.strip() or run_result.stdout.strip()
+    return text.splitlines()[-1] if text else f"exit status {run_result.returncode}"
+
+
+def _listed_energies(run_result: UniDesignRunResult, count: int) -> tuple[np.ndarray, list[str]]:
+    """Split the output of ``ComputeStability --pdblist`` into per-structure totals.
+
+    Returns the total energy of each of the ``count`` listed structures
+    (``NaN`` when missing) and the reason for every missing one.
+    """
+
+    energies = np.full(count, np.nan)
+    messages = [_failure_message(run_result)] * count
+    markers = list(_LISTED_STRUCTURE.finditer(run_result.stdout))
+    if not markers and parse_energy_breakdowns(run_result.stdout):
+        raise UniDesignError(
+            "the UniDesign binary ignored --pdblist for ComputeStability; "
+            "rebuild it from this source tree"
+        )
+    for number, marker in enumerate(markers):
+        end = markers[number + 1].start() if number + 1 < len(markers) else None
+        segment = run_result.stdout[marker.end():end]
+        position = int(marker.group(1)) - 1
+        if not 0 <= position < count:
+            continue
+        breakdown = parse_energy_breakdown(segment)
+        if breakdown is not None:
+            energies[position] = breakdown.total
+        else:
+            lines = segment.strip().splitlines()[1:]
+            messages[position] = lines[-1] if lines else "no energy details"
+    return energies, messages
+
+
+@dataclass(slots=True)
+class _ChunkOutcome:
+    workdirs: list[Path]
+    models: dict[int, Path]
+    energies: np.ndarray
+    reference_energies: np.ndarray
+    errors: dict[int, str]
+
+
+@dataclass(slots=True)
+class MutationScanResult:
+    """ddG table produced by :class:`MutationScanJob`."""
+
+    mutants: np.ndarray
+    """Normalised mutant strings, in submission order."""
+
+    energies: np.ndarray
+    """Total energy of each mutant model (``NaN`` when it could not be built or scored)."""
+
+    reference_energies: np.ndarray
+    """Wild-type energy each mutant is compared against."""
+
+    failures: dict[str, str]
+    """Error message for every mutant whose energy is missing."""
+
+    workspace: Path | None
+    """Directory holding the mutant models when ``keep_models`` was requested."""
+
+    models: dict[str, StructureModel]
+    """Mutant models keyed by mutant string when ``keep_models`` was requested."""
+
+    cleanup: Callable[[], None] | None
+
+    @property
+    def ddg(self) -> np.ndarray:
+        """``energies - reference_energies``; negative values are stabilising."""
+
+        return self.energies - self.reference_energies
+
+    def rank(self) -> np.ndarray:
+        """Return mutant indices ordered from most to least stabilising; failures last."""
+
+        return np.argsort(self.ddg, kind="stable")
+
+    def as_columns(self) -> dict[str, np.ndarray]:
+        """Return the table as ``{column: array}`` for DataFrame or Arrow constructors."""
+
+        return {
+            "mutant": self.mutants,
+            "energy": self.energies,
+            "reference_energy": self.reference_energies,
+            "ddg": self.ddg,
+        }
+
+    def close(self) -> None:
+        if self.cleanup is not None:
+            self.cleanup()
+            self.cleanup = None
+
+
+class MutationScanJob:
+    """Build many mutants of one structure with few processes and score each one.
+
+    Mutants are packed into mutant-list files so each ``BuildMutant`` process
+    loads the rotamer library and parameters once for a whole chunk. Chunks are
+    balanced by point-mutation count and run concurrently through
+    :class:`~unidesign.batch.UniDesignBatchRunner`; the worker that built a
+    chunk then scores all of its models with a single
+    ``ComputeStability --pdblist`` process.
+
+    ``BuildMutant`` exits at the first mutation naming a chain or position
+    the structure lacks. Such mutants are reported as failures up front and
+    never sent to the binary; if a chunk still stops early, the mutants after
+    the one that stopped it are built again by a new process.
+
+    By default (``reference="paired"``) each mutant is compared with the
+    repacked ``_WT.pdb`` model the binary writes next to it, so repacking
+    around the mutation site cancels out of the ddG. ``reference="structure"``
+    compares every mutant with the unrepacked input structure instead.
+    """
+
+    def __init__(
+        self,
+        runner: UniDesignRunner,
+        config: BuildMutantConfig,
+        mutants: Iterable[str | Sequence[str]],
+        *,
+        reference: Literal["structure", "paired"] = "paired",
+    ) -> None:
+        if reference not in ("structure", "paired"):
+            raise ValueError("reference must be 'structure' or 'paired'")
+        self._runner = runner
+        self._config = config
+        self._mutants = [normalize_mutant(mutant) for mutant in mutants]
+        self._reference = reference
+        self._unbuildable = self._missing_residues()
+
+    @property
+    def mutants(self) -> tuple[str, ...]:
+        return tuple(self._mutants)
+
+    def _missing_residues(self) -> dict[str, str]:
+        """Map every mutant naming a residue absent from the structure to an error."""
+
+        try:
+            atoms = load_atoms(self._config.pdb_path, cache=False)
+        except OSError:
+            # Left to the binary, which reports an unreadable structure itself.
+            return {}
+        residues = set(
+            zip(
+                (chain.decode() for chain in atoms["chain"].tolist()),
+                atoms["resseq"].tolist(),
+            )
+        )
+        missing: dict[str, str] = {}
+        for mutant in self._mutants:
+            for part in mutant.split(","):
+                chain, position = part[1], int(part[2:-1])
+                if (chain, position) not in residues:
+                    missing[mutant] = f"cannot find residue {chain}{position} for mutation {part}"
+                    break
+        return missing
+
+    def _stability_config(
+        self, pdb_path: Path | str, pdb_list_path: Path | None = None
+    ) -> ComputeStabilityConfig:
+        return ComputeStabilityConfig(
+            pdb_path=pdb_path,
+            pdb_list_path=pdb_list_path,
+            use_bbdep_rotlib=self._config.use_bbdep_rotlib,
+            rotamer_library=self._config.rotamer_library,
+            weight_file=self._config.weight_file,
+        )
+
+    def _score(self, pdb_path: Path | str, env: Mapping[str, str] | None) -> UniDesignRunResult:
+        return self._runner.run(self._stability_config(pdb_path).to_cli_args(), env=env)
+
+    def _build_chunk(
+        self, config: BuildMutantConfig, env: Mapping[str, str] | None
+    ) -> tuple[list[Path], dict[int, Path], dict[int, str]]:
+        """Build every mutant of a chunk, restarting after one that stops the binary.
+
+        Returns the workdirs, the model of every built position and the error
+        of every position that could not be built.
+        """
+
+        chunk_file = Path(config.mutant_file)
+        lines = chunk_file.read_text().splitlines()
+        workdirs: list[Path] = []
+        models: dict[int, Path] = {}
+        errors: dict[int, str] = {}
+        start = 0
+        try:
+            while start < len(lines):
+                if start:
+                    mutant_file = chunk_file.with_name(f"{chunk_file.stem}_{start:05d}.txt")
+                    mutant_file.write_text("".join(f"{line}\n" for line in lines[start:]))
+                    config = replace(config, mutant_file=mutant_file)
+                built = self._runner.run(config.to_cli_args(), env=env, persist_workdir=True)
+                workdirs.append(built.workdir)
+                for offset in range(len(lines) - start):
+                    model = built.workdir / _MODEL_NAME.format(index=offset + 1)
+                    if not model.is_file():
+                        message = _failure_message(built)
+                        if start == offset == 0:
+                            # Nothing was built at all, so the failure is not this mutant's.
+                            errors.update(dict.fromkeys(range(start, len(lines)), message))
+                            start = len(lines)
+                            break
+                        # The binary stopped at this mutant; rebuild the ones after it.
+                        errors[start + offset] = message
+                        start += offset + 1
+                        break
+                    models[start + offset] = model
+                else:
+                    start = len(lines)
+        except BaseException:
+            for workdir in workdirs:
+                shutil.rmtree(workdir, ignore_errors=True)
+            raise
+        return workdirs, models, errors
+
+    def _run_chunk(
+        self, config: BuildMutantConfig, env: Mapping[str, str] | None
+    ) -> _ChunkOutcome:
+        workdirs, models, errors = self._build_chunk(config, env)
+        count = len(models) + len(errors)
+        energies = np.full(count, np.nan)
+        reference_energies = np.full(count, np.nan)
+        try:
+            if models:
+                paired = self._reference == "paired"
+                listed: list[Path] = []
+                for model in models.values():
+                    listed.append(model)
+                    if paired:
+                        listed.append(model.with_name(f"{model.stem}_WT.pdb"))
+                chunk_file = Path(config.mutant_file)
+                pdb_list = chunk_file.with_name(f"{chunk_file.stem}_models.txt")
+                pdb_list.write_text("".join(f"{path}\n" for path in listed))
+                scored = self._runner.run(
+                    self._stability_config(self._config.pdb_path, pdb_list).to_cli_args(),
+                    env=env,
+                )
+                totals, messages = _listed_energies(scored, len(listed))
+                stride = 2 if paired else 1
+                for number, position in enumerate(models):
+                    energies[position] = totals[stride * number]
+                    if np.isnan(energies[position]):
+                        errors[position] = messages[stride * number]
+                    if paired:
+                        reference_energies[position] = totals[stride * number + 1]
+                        if np.isnan(reference_energies[position]):
+                            errors.setdefault(position, messages[stride * number + 1])
+        except BaseException:
+            for workdir in workdirs:
+                shutil.rmtree(workdir, ignore_errors=True)
+            raise
+        return _ChunkOutcome(workdirs, models, energies, reference_energies, errors)
+
+    def _wildtype_energy(self, env: Mapping[str, str] | None) -> float:
+        result = self._score(self._config.pdb_path, env)
+        energy = _total_energy(result)
+        if np.isnan(energy):
+            raise UniDesignError(
+                f"failed to score wild-type structure {self._config.pdb_path}: "
+                f"{_failure_message(result)}"
+            )
+        return energy
+
+    def run(
+        self,
+        *,
+        max_workers: int | None = None,
+        chunk_size: int | None = None,
+        keep_models: bool = False,
+        env: Mapping[str, str] | None = None,
+    ) -> MutationScanResult:
+        """Build and score every mutant and return the ddG table.
+
+        Parameters
+        ----------
+        max_workers:
+            Concurrent ``BuildMutant`` processes (defaults to the available cores).
+        chunk_size:
+            Target number of mutants per process. By default the mutants are
+            split into one chunk per worker.
+        keep_models:
+            Keep the mutant models in :attr:`MutationScanResult.workspace`.
+        env:
+            Environment overrides for every process.
+        """
+
+        mutants = self._mutants
+        count = len(mutants)
+        buildable = [
+            index for index, mutant in enumerate(mutants) if mutant not in self._unbuildable
+        ]
+        workers = max_workers if max_workers is not None else default_worker_count()
+        if chunk_size is None:
+            chunk_count = min(workers, len(buildable))
+        else:
+            chunk_count = -(-len(buildable) // max(chunk_size, 1))
+        chunks: list[list[int]] = []
+        if buildable:
+            chunks = [
+                [buildable[position] for position in chunk]
+                for chunk in _balanced_chunks([mutants[index] for index in buildable], chunk_count)
+            ]
+
+        energies = np.full(count, np.nan)
+        reference_energies = np.full(count, np.nan)
+        if self._reference == "structure":
+            reference_energies[:] = self._wildtype_energy(env)
+
+        failures = dict(self._unbuildable)
+        workdirs: list[Path] = []
+        destination: Path | None = None
+        models: dict[str, StructureModel] = {}
+        staging = Path(tempfile.mkdtemp(prefix="unidesign_mutants_"))
+        try:
+            configs: list[BuildMutantConfig] = []
+            for number, chunk in enumerate(chunks):
+                mutant_file = staging / f"mutants_{number:04d}.txt"
+                mutant_file.write_text("".join(f"{mutants[index]}\n" for index in chunk))
+                configs.append(replace(self._config, mutant_file=mutant_file))
+
+            batch = UniDesignBatchRunner(self._runner, max_workers=workers)
+            if keep_models:
+                destination = Path(tempfile.mkdtemp(prefix="unidesign_mutant_models_"))
+            for outcome in batch.map(
+                configs, execute=lambda config: self._run_chunk(config, env)
+            ):
+                chunk = chunks[outcome.index]
+                if not outcome.ok:
+                    for index in chunk:
+                        failures[mutants[index]] = repr(outcome.error)
+                    continue
+                result = outcome.result
+                workdirs.extend(result.workdirs)
+                energies[chunk] = result.energies
+                if self._reference == "paired":
+                    reference_energies[chunk] = result.reference_energies
+                for position, message in result.errors.items():
+                    failures[mutants[chunk[position]]] = message
+                if destination is not None:
+                    for position, source in result.models.items():
+                        if position in result.errors:
+                            continue
+                        index = chunk[position]
+                        target = destination / f"mutant_{index + 1:05d}.pdb"
+                        _transfer(source, target, self._runner.relocation_strategy)
+                        models[mutants[index]] = StructureModel(
+                            path=target, prefix="", logical_name="mutant_model"
+                        )
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+            for workdir in workdirs:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        cleanup = None
+        if destination is not None:
+            cleanup = lambda: shutil.rmtree(destination, ignore_errors=True)
+        return MutationScanResult(
+            mutants=np.asarray(mutants, dtype=object),
+            energies=energies,
+            reference_energies=reference_energies,
+            failures=failures,
+            workspace=destination,
+            models=models,
+            cleanup=cleanup,
+        )
+
+
+__all__ = [
+    "AMINO_ACIDS",
+    "MutationScanJob",
+    "MutationScanResult",
+    "normalize_mutant",
+    "saturation_mutants",
+]
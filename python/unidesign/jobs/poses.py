@@ -0,0 +1,343 @@
+"""Parallel ligand pose placement, screening and analysis."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from ..batch import UniDesignBatchRunner, default_worker_count
+from ..config import (
+    AnalyzeLigPosesConfig,
+    CommandConfig,
+    MakeLigPosesConfig,
+    ProteinDesignConfig,
+    ScreenLigPosesConfig,
+)
+from ..exceptions import UniDesignError
+from ..poses import (
+    LigandPoseAnalysis,
+    iter_pose_blocks,
+    merge_pose_files,
+    parse_pose_analysis,
+    pose_energies,
+    split_pose_file,
+    vdw_percentile_mask,
+    write_pose_blocks,
+)
+from ..runner import UniDesignRunner, UniDesignRunResult
+
+
+# Every worker writes its poses under this name inside its own workdir.
+_WORKER_OUTPUT = "LIG_POSES_OUT.pdb"
+
+# Appended by the orientation screen to the output name for the poses it rejects.
+_REJECTED_SUFFIX = "_BAD_ORNT.pdb"
+
+
+def _failure_message(result: UniDesignRunResult) -> str:
+    return result.stderr.strip() or f"no ligand poses written (exit code {result.returncode})"
+
+
+@dataclass(slots=True)
+class LigandPoseResult:
+    """Merged pose file produced by a pose placement or screening job."""
+
+    pose_file: Path
+    """Pose file ready for ``--read_lig_poses``."""
+
+    pose_count: int
+    """Number of poses in :attr:`pose_file`."""
+
+    workspace: Path
+    """Directory holding :attr:`pose_file`."""
+
+    failures: dict[str, str]
+    """Error message for every input that produced no poses."""
+
+    cleanup: Callable[[], None] | None
+
+    rejected_pose_file: Path | None = None
+    """Poses the orientation screen rejected, like the binary's ``<output>_BAD_ORNT.pdb``."""
+
+    def energies(self) -> np.ndarray:
+        """Return the internal and backbone VDW energy of every pose."""
+
+        return pose_energies(self.pose_file)
+
+    def configure(self, config: ProteinDesignConfig) -> ProteinDesignConfig:
+        """Return a copy of ``config`` that designs against these poses."""
+
+        return replace(config, ligand_pose_input=self.pose_file)
+
+    def close(self) -> None:
+        if self.cleanup is not None:
+            self.cleanup()
+            self.cleanup = None
+
+
+def _pose_result(
+    destination: Path,
+    pose_file: Path,
+    count: int,
+    failures: dict[str, str],
+    rejected_pose_file: Path | None = None,
+) -> LigandPoseResult:
+    return LigandPoseResult(
+        pose_file=pose_file,
+        pose_count=count,
+        workspace=destination,
+        failures=failures,
+        cleanup=lambda: shutil.rmtree(destination, ignore_errors=True),
+        rejected_pose_file=rejected_pose_file,
+    )
+
+
+class _PoseWorkers:
+    """Run pose commands that write :data:`_WORKER_OUTPUT` into their workdir."""
+
+    def __init__(self, runner: UniDesignRunner, max_workers: int | None) -> None:
+        self._runner = runner
+        self._batch = UniDesignBatchRunner(runner, max_workers=max_workers)
+
+    def _execute(
+        self, config: CommandConfig, env: Mapping[str, str] | None
+    ) -> UniDesignRunResult:
+        result = self._runner.run(config.to_cli_args(), env=env, persist_workdir=True)
+        if not (result.workdir / _WORKER_OUTPUT).is_file():
+            shutil.rmtree(result.workdir, ignore_errors=True)
+            raise UniDesignError(_failure_message(result))
+        return result
+
+    def run(
+        self, configs: Sequence[CommandConfig], env: Mapping[str, str] | None
+    ) -> tuple[list[Path | None], dict[int, str], list[Path]]:
+        """Return the output of every config in order, failures by index and the workdirs."""
+
+        outputs: list[Path | None] = [None] * len(configs)
+        errors: dict[int, str] = {}
+        workdirs: list[Path] = []
+        for outcome in self._batch.map(
+            configs, execute=lambda config: self._execute(config, env)
+        ):
+            if not outcome.ok:
+                errors[outcome.index] = str(outcome.error) or repr(outcome.error)
+                continue
+            workdirs.append(outcome.result.workdir)
+            outputs[outcome.index] = outcome.result.workdir / _WORKER_OUTPUT
+        return outputs, errors, workdirs
+
+
+class LigandPosePlacementJob:
+    """Run ``MakeLigPoses`` for many ligand conformers in parallel.
+
+    ``MakeLigPoses`` places the single ``--mol2`` ligand it is given, so a
+    conformer set supplied as one ``mol2`` file per conformer is fanned out as
+    one process per conformer through
+    :class:`~unidesign.batch.UniDesignBatchRunner`. The poses of all
+    conformers are merged, in conformer order, into one renumbered pose file.
+    Without ``conformers`` the configured ``mol2_path`` is placed on its own.
+    """
+
+    def __init__(
+        self,
+        runner: UniDesignRunner,
+        config: MakeLigPosesConfig,
+        conformers: Iterable[str | Path] | None = None,
+    ) -> None:
+        self._runner = runner
+        self._config = config
+        self._conformers = [Path(conformer) for conformer in conformers or ()]
+
+    def run(
+        self,
+        *,
+        max_workers: int | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> LigandPoseResult:
+        """Place every conformer and return the merged poses.
+
+        Conformers that produce no poses are reported in
+        :attr:`LigandPoseResult.failures` keyed by their ``mol2`` path.
+        """
+
+        conformers = self._conformers or [Path(self._config.mol2_path)]
+        configs = [
+            replace(self._config, mol2_path=conformer, ligand_pose_output=_WORKER_OUTPUT)
+            for conformer in conformers
+        ]
+        workers = _PoseWorkers(self._runner, max_workers)
+        destination = Path(tempfile.mkdtemp(prefix="unidesign_ligand_poses_"))
+        workdirs: list[Path] = []
+        try:
+            outputs, errors, workdirs = workers.run(configs, env)
+            pose_file = destination / Path(self._config.ligand_pose_output).name
+            count = merge_pose_files((path for path in outputs if path is not None), pose_file)
+        except BaseException:
+            shutil.rmtree(destination, ignore_errors=True)
+            raise
+        finally:
+            for workdir in workdirs:
+                shutil.rmtree(workdir, ignore_errors=True)
+        failures = {str(conformers[index]): message for index, message in errors.items()}
+        return _pose_result(destination, pose_file, count, failures)
+
+
+class LigandPoseScreeningJob:
+    """Screen a large pose file with ``ScreenLigPoses`` in parallel chunks.
+
+    The orientation screen judges every pose on its own, so chunks are screened
+    independently and the survivors, and the rejected poses, concatenated in
+    input order. The RMSD screen is greedy over the whole file, so by default
+    it runs as one ``ScreenLigPoses`` process, exactly like the binary. With an
+    explicit ``chunk_size`` the chunks are screened in parallel and the merged
+    survivors once more in a single process, so that no two kept poses are
+    closer than the cutoff; on dense pose sets this keeps fewer poses than the
+    single pass, since a pose dropped against a neighbour in its chunk stays
+    dropped even if that neighbour is later removed. The VDW-percentile screen
+    ranks every pose globally; it is evaluated exactly in-process with
+    :func:`~unidesign.poses.vdw_percentile_mask` instead of by the binary.
+    """
+
+    def __init__(self, runner: UniDesignRunner, config: ScreenLigPosesConfig) -> None:
+        self._runner = runner
+        self._config = config
+
+    def _chunk_config(self, pose_input: Path) -> ScreenLigPosesConfig:
+        return replace(
+            self._config,
+            ligand_pose_input=pose_input,
+            ligand_pose_output=_WORKER_OUTPUT,
+        )
+
+    def _screen_by_vdw(self, pose_file: Path) -> int:
+        source = Path(self._config.ligand_pose_input)
+        keep = vdw_percentile_mask(pose_energies(source), self._config.ligand_vdw_percentile)
+        blocks = (block for block, kept in zip(iter_pose_blocks(source), keep) if kept)
+        return write_pose_blocks(blocks, pose_file)
+
+    def _screen_in_chunks(
+        self,
+        pose_file: Path,
+        staging: Path,
+        max_workers: int | None,
+        chunk_size: int | None,
+        env: Mapping[str, str] | None,
+    ) -> tuple[int, Path | None]:
+        workers = max_workers if max_workers is not None else default_worker_count()
+        source = Path(self._config.ligand_pose_input)
+        if chunk_size is None and self._config.ligand_rmsd_cutoff is not None:
+            chunks = [source]
+        else:
+            if chunk_size is None:
+                total = sum(1 for _ in iter_pose_blocks(source))
+                chunk_size = max(1, -(-total // workers))
+            chunks = split_pose_file(source, staging, chunk_size=chunk_size)
+
+        runner = _PoseWorkers(self._runner, workers)
+        workdirs: list[Path] = []
+        try:
+            outputs, errors, workdirs = runner.run(
+                [self._chunk_config(chunk) for chunk in chunks], env
+            )
+            if errors:
+                index, message = min(errors.items())
+                raise UniDesignError(f"screening {chunks[index].name} failed: {message}")
+            if self._config.ligand_orientation_screen is not None:
+                rejected_file = pose_file.with_name(pose_file.name + _REJECTED_SUFFIX)
+                rejected = [path.with_name(path.name + _REJECTED_SUFFIX) for path in outputs]
+                merge_pose_files((path for path in rejected if path.is_file()), rejected_file)
+                return merge_pose_files(outputs, pose_file), rejected_file
+            if self._config.ligand_rmsd_cutoff is None or len(chunks) <= 1:
+                return merge_pose_files(outputs, pose_file), None
+            merged = staging / "survivors.pdb"
+            merge_pose_files(outputs, merged)
+            outputs, errors, final_workdirs = runner.run([self._chunk_config(merged)], env)
+            workdirs.extend(final_workdirs)
+            if errors:
+                raise UniDesignError(f"screening merged poses failed: {errors[0]}")
+            return merge_pose_files(outputs, pose_file), None
+        finally:
+            for workdir in workdirs:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    def run(
+        self,
+        *,
+        max_workers: int | None = None,
+        chunk_size: int | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> LigandPoseResult:
+        """Screen the configured pose file and return the surviving poses.
+
+        Parameters
+        ----------
+        max_workers:
+            Concurrent ``ScreenLigPoses`` processes (defaults to the available cores).
+        chunk_size:
+            Poses per process. By default the orientation screen splits the
+            file into one chunk per worker and the RMSD screen runs as a
+            single process; a ``chunk_size`` for the RMSD screen trades some
+            kept poses for parallelism.
+        env:
+            Environment overrides for every process.
+
+        Raises :class:`~unidesign.exceptions.UniDesignError` when any chunk
+        fails, since dropping a chunk would silently lose poses.
+        """
+
+        destination = Path(tempfile.mkdtemp(prefix="unidesign_ligand_poses_"))
+        pose_file = destination / Path(self._config.ligand_pose_output).name
+        staging = Path(tempfile.mkdtemp(prefix="unidesign_pose_chunks_"))
+        rejected_file: Path | None = None
+        try:
+            if self._config.ligand_vdw_percentile is not None:
+                count = self._screen_by_vdw(pose_file)
+            else:
+                count, rejected_file = self._screen_in_chunks(
+                    pose_file, staging, max_workers, chunk_size, env
+                )
+        except BaseException:
+            shutil.rmtree(destination, ignore_errors=True)
+            raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return _pose_result(destination, pose_file, count, {}, rejected_file)
+
+
+@dataclass(slots=True)
+class LigandPoseAnalysisResult:
+    """Outputs for ``AnalyzeLigPoses`` executions."""
+
+    run: UniDesignRunResult
+
+    def summary(self) -> LigandPoseAnalysis | None:
+        """Parse the "Summary of ligand pose analysis" block from the captured output."""
+
+        return parse_pose_analysis(self.run.stdout)
+
+
+class LigandPoseAnalysisJob:
+    """Execute the ``AnalyzeLigPoses`` command."""
+
+    def __init__(self, runner: UniDesignRunner, config: AnalyzeLigPosesConfig) -> None:
+        self._runner = runner
+        self._config = config
+
+    def run(self, *, env: Mapping[str, str] | None = None) -> LigandPoseAnalysisResult:
+        return LigandPoseAnalysisResult(
+            run=self._runner.run(self._config.to_cli_args(), env=env)
+        )
+
+
+__all__ = [
+    "LigandPoseAnalysisJob",
+    "LigandPoseAnalysisResult",
+    "LigandPosePlacementJob",
+    "LigandPoseResult",
+    "LigandPoseScreeningJob",
+]
@@ -0,0 +1,630 @@
+"""Crash-safe checkpointing of long design campaigns.
+
+A :class:`CampaignJournal` is an append-only JSON-lines file; every record is
+flushed and ``fsync``\\ ed before the call returns, so after a crash the
+journal lists exactly the work whose outputs are safely on disk. Records are
+keyed by :func:`~unidesign.config.config_hash` of the configuration.
+
+:class:`DesignCampaign` runs configurations against a journal. ``ProteinDesign``
+configurations are split into trajectory windows of ``window_size``
+trajectories; each finished window is moved to the campaign's output
+directory and journaled, and once every window of a configuration is done
+they are merged with :func:`~unidesign.jobs.design.merge_trajectory_workdirs`
+into ``<output_dir>/<config_hash>/result``. Restarting the same campaign
+skips configurations that are complete and only runs the windows that are
+missing, so a crash costs at most the windows that were in flight::
+
+    python -m unidesign.journal run campaign.jsonl configs.jsonl --output designs
+    python -m unidesign.journal status campaign.jsonl
+
+Only one process may append to a journal at a time: an open journal holds an
+exclusive lock on its file, so a second campaign started on it fails at once
+instead of interleaving records; ``status`` reads it without the lock.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+from .batch import UniDesignBatchRunner
+from .config import CommandConfig, ProteinDesignConfig, config_from_dict, config_hash
+from .exceptions import UniDesignError
+from .jobs.design import merge_trajectory_workdirs, trajectory_windows, window_configs
+from .inputs import InputCache
+from .paths import discover_binary
+from .results import ResultStore
+from .runner import UniDesignRunner, UniDesignRunResult
+from .service import result_from_dict, result_to_dict
+from .workdirs import TmpfsWorkdirs
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+JOURNAL_EVENTS: tuple[str, ...] = ("window", "complete", "failed")
+"""Kinds of journal records."""
+
+_STDOUT_LOG = "stdout.log"
+_STDERR_LOG = "stderr.log"
+
+
+def _fsync_directory(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class CampaignJournal:
+    """Append-only, fsync'd log of finished campaign work.
+
+    Opening a journal replays it; a record cut short by a crash is ignored.
+    Use :meth:`completed` and :meth:`windows` to query the replayed state and
+    the ``record_*`` methods to append to it.
+
+    The journal holds an exclusive :func:`fcntl.flock` on its file until
+    :meth:`close`; opening a journal that another instance holds raises
+    :class:`~unidesign.exceptions.UniDesignError`. A ``read_only`` journal
+    takes no lock and cannot be appended to; a missing file reads as empty.
+    """
+
+    def __init__(self, path: os.PathLike[str] | str, *, read_only: bool = False) -> None:
+        self._path = Path(path)
+        self._read_only = read_only
+        self._lock = threading.Lock()
+        self._complete: dict[str, dict[str, Any]] = {}
+        self._windows: dict[str, dict[tuple[int, int], dict[str, Any]]] = {}
+        self._failures: dict[str, dict[str, Any]] = {}
+        self._fd: int | None = None
+        if not read_only:
+            created = not self._path.exists()
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                self._lock_exclusively(self._fd)
+            except BaseException:
+                os.close(self._fd)
+                raise
+            if created:
+                _fsync_directory(self._path.parent)
+        self._replay()
+
+    def _lock_exclusively(self, fd: int) -> None:
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UniDesignError(
+                f"journal {self._path} is already open in another campaign"
+            ) from None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _replay(self) -> None:
+        try:
+            with self._path.open("rb") as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            if not self._read_only:
+                raise
+            data = b""
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record.get("event") in JOURNAL_EVENTS:
+                self._apply(record)
+        if data and not data.endswith(b"\n") and not self._read_only:
+            # Terminate a record torn by a crash so the next append starts cleanly.
+            self._write(b"\n")
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        key = record["key"]
+        event = record["event"]
+        if event == "complete":
+            self._complete[key] = record
+            self._windows.pop(key, None)
+            self._failures.pop(key, None)
+        elif event == "window":
+            first, last = record["window"]
+            self._windows.setdefault(key, {})[(first, last)] = record
+        else:
+            self._failures[key] = record
+
+    def _write(self, data: bytes) -> None:
+        if self._read_only:
+            raise ValueError("journal is read-only")
+        if self._fd is None:
+            raise ValueError("journal is closed")
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+        os.fsync(self._fd)
+
+    def _append(self, record: dict[str, Any]) -> dict[str, Any]:
+        record = {"time": time.time(), **record}
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            self._write(line)
+            self._apply(record)
+        return record
+
+    @staticmethod
+    def _run_record(run: UniDesignRunResult) -> dict[str, Any]:
+        document = result_to_dict(run)
+        # Captured output can be large; it is kept next to the artifacts instead.
+        del document["stdout"], document["stderr"]
+        return document
+
+    def record_window(
+        self, key: str, window: tuple[int, int], run: UniDesignRunResult
+    ) -> None:
+        """Record that trajectory ``window`` of ``key`` finished with outputs in ``run.workdir``."""
+
+        self._append(
+            {
+                "event": "window",
+                "key": key,
+                "window": list(window),
+                "artifacts": str(run.workdir),
+                "run": self._run_record(run),
+            }
+        )
+
+    def record_complete(self, key: str, run: UniDesignRunResult) -> None:
+        """Record that ``key`` is finished with its final outputs in ``run.workdir``."""
+
+        self._append(
+            {
+                "event": "complete",
+                "key": key,
+                "artifacts": str(run.workdir),
+                "run": self._run_record(run),
+            }
+        )
+
+    def record_failure(
+        self, key: str, error: str, *, window: tuple[int, int] | None = None
+    ) -> None:
+        """Record a failed attempt; failed work is retried when the campaign is rerun."""
+
+        record: dict[str, Any] = {"event": "failed", "key": key, "error": error}
+        if window is not None:
+            record["window"] = list(window)
+        self._append(record)
+
+    def completed(self, key: str) -> dict[str, Any] | None:
+        """Return the completion record of ``key``, or ``None`` if it is not complete."""
+
+        with self._lock:
+            return self._complete.get(key)
+
+    def windows(self, key: str) -> dict[tuple[int, int], dict[str, Any]]:
+        """Return the journaled windows of an incomplete ``key`` by ``(first, last)``."""
+
+        with self._lock:
+            return dict(self._windows.get(key, {}))
+
+    def status(self) -> dict[str, int]:
+        """Return counts of complete, partly done and failed configurations."""
+
+        with self._lock:
+            return {
+                "complete": len(self._complete),
+                "partial": len(self._windows),
+                "failed": len(self._failures),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+
+    def __enter__(self) -> CampaignJournal:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def run_from_record(record: Mapping[str, Any]) -> UniDesignRunResult:
+    """Rebuild the run result of a journal record, reading its saved output logs."""
+
+    workdir = Path(record["artifacts"])
+
+    def _log(name: str) -> str:
+        try:
+            return (workdir / name).read_text(encoding="utf-8")
+        except OSError:
+            return ""
+
+    return result_from_dict(
+        {
+            **record["run"],
+            "workdir": str(workdir),
+            "stdout": _log(_STDOUT_LOG),
+            "stderr": _log(_STDERR_LOG),
+        }
+    )
+
+
+def _link_or_copy(source: str, destination: str) -> str:
+    # ``_bestseqs.txt`` is rewritten in place by the merge, so it must not share
+    # an inode with the journaled window.
+    if not source.endswith("_bestseqs.txt"):
+        try:
+            os.link(source, destination)
+            return destination
+        except OSError:
+            pass
+    return shutil.copy2(source, destination)
+
+
+def _write_logs(run: UniDesignRunResult) -> None:
+    for name, text in ((_STDOUT_LOG, run.stdout), (_STDERR_LOG, run.stderr)):
+        path = run.workdir / name
+        path.unlink(missing_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+@dataclass(slots=True)
+class CampaignOutcome:
+    """What :meth:`DesignCampaign.run` did with one configuration."""
+
+    key: str
+    """Config hash that keys the configuration in the journal."""
+
+    config: CommandConfig
+    """The configuration."""
+
+    status: str
+    """``"skipped"`` (complete in the journal), ``"completed"`` or ``"failed"``."""
+
+    artifacts: Path | None = None
+    """Directory holding the final outputs of a complete configuration."""
+
+    run: UniDesignRunResult | None = None
+    """Run result of the complete configuration, rebuilt from the journal when skipped."""
+
+    error: str | None = None
+    """First error of a failed configuration."""
+
+
+@dataclass(slots=True)
+class _Unit:
+    key: str
+    config: CommandConfig
+    window: tuple[int, int] | None
+
+
+class DesignCampaign:
+    """Run configurations under a :class:`CampaignJournal` so a rerun resumes them.
+
+    Parameters
+    ----------
+    runner:
+        Runner executing every unit of work.
+    journal:
+        Journal recording finished work.
+    output_dir:
+        Directory receiving ``<config_hash>/window-<first>-<last>`` for
+        journaled windows and ``<config_hash>/result`` for final outputs.
+    window_size:
+        Trajectories per ``ProteinDesign`` process. Each window repeats the
+        per-process setup, so larger windows run faster but lose more work
+        to a crash.
+    max_workers:
+        Number of units run concurrently.
+    results:
+        Store receiving a :func:`~unidesign.results.result_row` for every
+        configuration completed by this campaign.
+    """
+
+    def __init__(
+        self,
+        runner: UniDesignRunner,
+        journal: CampaignJournal,
+        output_dir: os.PathLike[str] | str,
+        *,
+        window_size: int = 1,
+        max_workers: int | None = None,
+        results: ResultStore | None = None,
+    ) -> None:
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        self._runner = runner
+        self._journal = journal
+        self._output_dir = Path(output_dir)
+        self._window_size = window_size
+        self._batch = UniDesignBatchRunner(runner, max_workers=max_workers)
+        self._results = results
+
+    @property
+    def journal(self) -> CampaignJournal:
+        return self._journal
+
+    def _pending_windows(self, key: str, config: ProteinDesignConfig) -> list[tuple[int, int]]:
+        """Split the trajectories not covered by journaled windows into new windows."""
+
+        start = config.n_trajectory_start_index or 1
+        end = config.n_trajectories or 1
+        covered = sorted(self._journal.windows(key))
+        gaps: list[tuple[int, int]] = []
+        first = start
+        for done_first, done_last in covered:
+            if done_first > first:
+                gaps.append((first, min(done_first - 1, end)))
+            first = max(first, done_last + 1)
+        if first <= end:
+            gaps.append((first, end))
+        return [
+            window
+            for gap_first, gap_last in gaps
+            if gap_first <= gap_last
+            for window in trajectory_windows(
+                gap_first,
+                gap_last,
+                math.ceil((gap_last - gap_first + 1) / self._window_size),
+            )
+        ]
+
+    def _store(self, unit: _Unit, run: UniDesignRunResult) -> None:
+        """Move a finished unit's workdir into the output directory and journal it."""
+
+        UniDesignRunner.detach_resources(run.workdir)
+        _write_logs(run)
+        if unit.window is None:
+            target = self._output_dir / unit.key / "result"
+        else:
+            first, last = unit.window
+            target = self._output_dir / unit.key / f"window-{first:06d}-{last:06d}"
+        if target.exists():
+            # Left behind by an attempt that crashed before journaling.
+            shutil.rmtree(target, ignore_errors=True)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(run.workdir), str(target))
+        run.workdir = target
+        if unit.window is None:
+            self._journal.record_complete(unit.key, run)
+        else:
+            self._journal.record_window(unit.key, unit.window, run)
+
+    def _finalize(self, key: str, config: CommandConfig) -> UniDesignRunResult:
+        """Merge the journaled windows of ``key`` into its ``result`` directory.
+
+        The merge works on hard-linked copies, so the journaled windows stay
+        intact until the completion record is on disk.
+        """
+
+        windows = sorted(self._journal.windows(key).items())
+        key_dir = self._output_dir / key
+        staging = Path(tempfile.mkdtemp(prefix=".merge-", dir=key_dir))
+        try:
+            runs = []
+            for index, (_, record) in enumerate(windows):
+                copy = staging / str(index)
+                shutil.copytree(record["artifacts"], copy, copy_function=_link_or_copy)
+                run = run_from_record(record)
+                run.workdir = copy
+                runs.append(run)
+            merged = merge_trajectory_workdirs(runs, config.to_cli_args())
+            _write_logs(merged)
+            target = key_dir / "result"
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(merged.workdir, target)
+            merged.workdir = target
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self._journal.record_complete(key, merged)
+        for _, record in windows:
+            shutil.rmtree(record["artifacts"], ignore_errors=True)
+        return merged
+
+    def _execute(
+        self, env: Mapping[str, str] | None
+    ) -> Callable[[CommandConfig], UniDesignRunResult]:
+        def _run(config: CommandConfig) -> UniDesignRunResult:
+            run = self._runner.run(config.to_cli_args(), env=env, persist_workdir=True)
+            if run.returncode != 0:
+                shutil.rmtree(run.workdir, ignore_errors=True)
+                raise RuntimeError(
+                    f"UniDesign exited with status {run.returncode}: {run.stderr.strip()}"
+                )
+            return run
+
+        return _run
+
+    def run(
+        self,
+        configs: Iterable[CommandConfig],
+        *,
+        env: Mapping[str, str] | None = None,
+    ) -> list[CampaignOutcome]:
+        """Run every configuration that the journal does not list as complete.
+
+        Returns one outcome per distinct configuration in submission order.
+        Failures are journaled and do not stop the remaining work; run the
+        campaign again to retry them.
+        """
+
+        outcomes: dict[str, CampaignOutcome] = {}
+        remaining: dict[str, int] = {}
+        units: list[_Unit] = []
+        for config in configs:
+            key = config_hash(config.to_cli_args())
+            if key in outcomes:
+                continue
+            record = self._journal.completed(key)
+            if record is not None:
+                outcomes[key] = CampaignOutcome(
+                    key=key,
+                    config=config,
+                    status="skipped",
+                    artifacts=Path(record["artifacts"]),
+                    run=run_from_record(record),
+                )
+                continue
+            outcomes[key] = CampaignOutcome(key=key, config=config, status="completed")
+            if isinstance(config, ProteinDesignConfig):
+                windows = self._pending_windows(key, config)
+                # Without an explicit seed, seeding from the key gives a resumed
+                # window the seed it had before and every other window another one.
+                base_seed = config.random_seed
+                if base_seed is None:
+                    base_seed = int(key[:8], 16)
+                seeded = window_configs(config, windows, base_seed=base_seed)
+                pending = [
+                    _Unit(key, window_config, window)
+                    for window_config, window in zip(seeded, windows)
+                ]
+            else:
+                pending = [_Unit(key, config, None)]
+            remaining[key] = len(pending)
+            units.extend(pending)
+
+        for key in [key for key, count in remaining.items() if count == 0]:
+            # Every window was journaled before the previous attempt could merge them.
+            self._settle(outcomes[key])
+
+        for batch_outcome in self._batch.map(
+            (unit.config for unit in units), execute=self._execute(env)
+        ):
+            unit = units[batch_outcome.index]
+            outcome = outcomes[unit.key]
+            try:
+                self._store(unit, batch_outcome.unwrap())
+            except Exception as exc:  # noqa: BLE001 - journaled and reported
+                if batch_outcome.ok:
+                    shutil.rmtree(batch_outcome.result.workdir, ignore_errors=True)
+                error = str(exc) or repr(exc)
+                self._journal.record_failure(unit.key, error, window=unit.window)
+                if outcome.error is None:
+                    outcome.status, outcome.error = "failed", error
+            remaining[unit.key] -= 1
+            if remaining[unit.key] == 0 and outcome.error is None:
+                self._settle(outcome)
+        if self._results is not None:
+            self._results.flush()
+        return list(outcomes.values())
+
+    def _settle(self, outcome: CampaignOutcome) -> None:
+        try:
+            record = self._journal.completed(outcome.key)
+            if record is not None:
+                run = run_from_record(record)
+            else:
+                run = self._finalize(outcome.key, outcome.config)
+        except Exception as exc:  # noqa: BLE001 - journaled and reported
+            outcome.status, outcome.error = "failed", str(exc) or repr(exc)
+            self._journal.record_failure(outcome.key, outcome.error)
+            return
+        outcome.run, outcome.artifacts = run, run.workdir
+        if self._results is not None:
+            self._results.add(run, outcome.config)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m unidesign.journal", description="Resumable UniDesign campaigns."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run (or resume) a campaign")
+    run.add_argument("journal", type=Path)
+    run.add_argument(
+        "configs", type=Path, help="one config_to_dict() document per line ('-' for stdin)"
+    )
+    run.add_argument("--output", type=Path, required=True, help="campaign output directory")
+    run.add_argument("--binary", type=Path, help="UniDesign executable")
+    run.add_argument("--window-size", type=int, default=1)
+    run.add_argument("--workers", type=int)
+    run.add_argument("--results", type=Path, help="result store for completed configurations")
+    run.add_argument(
+        "--input-cache", type=Path, help="node-local directory to stage input files through"
+    )
+    run.add_argument(
+        "--tmpfs", type=Path, help="RAM-backed directory for workdirs while memory allows"
+    )
+
+    status = commands.add_parser("status", help="print journal counts as JSON")
+    status.add_argument("journal", type=Path)
+    return parser.parse_args(argv)
+
+
+def _read_configs(path: Path) -> Iterator[CommandConfig]:
+    handle = sys.stdin if str(path) == "-" else path.open(encoding="utf-8")
+    with handle:
+        for line in handle:
+            if line.strip():
+                yield config_from_dict(json.loads(line))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+
+    args = _parse_args(argv)
+    if args.command == "status":
+        # Read without the lock so a running campaign can be inspected.
+        with CampaignJournal(args.journal, read_only=True) as journal:
+            print(json.dumps(journal.status()))
+        return 0
+    with CampaignJournal(args.journal) as journal:
+        runner = UniDesignRunner(
+            args.binary or discover_binary(),
+            input_cache=InputCache(args.input_cache) if args.input_cache is not None else None,
+            tmpfs_workdirs=TmpfsWorkdirs(args.tmpfs) if args.tmpfs is not None else None,
+        )
+        campaign = DesignCampaign(
+            runner,
+            journal,
+            args.output,
+            window_size=args.window_size,
+            max_workers=args.workers,
+            results=ResultStore(args.results) if args.results is not None else None,
+        )
+        outcomes = campaign.run(_read_configs(args.configs))
+    counts = {status: 0 for status in ("skipped", "completed", "failed")}
+    for outcome in outcomes:
+        counts[outcome.status] += 1
+        if outcome.error is not None:
+            print(f"{outcome.key}: {outcome.error}", file=sys.stderr)
+    print(json.dumps(counts))
+    return 1 if counts["failed"] else 0
+
+
+__all__ = [
+    "JOURNAL_EVENTS",
+    "CampaignJournal",
+    "CampaignOutcome",
+    "DesignCampaign",
+    "main",
+    "run_from_record",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
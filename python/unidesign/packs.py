@@ -0,0 +1,383 @@
+"""Append-only packed archives for run outputs.
+
+Job wrappers normally move the outputs of every run into their own
+``unidesign_artifacts_*`` directory. On a shared filesystem a large campaign
+turns that into millions of small files. A runner created with an
+:class:`ArtifactPack` instead streams each run's outputs into one tar
+archive as members named ``<workdir name>/<filename>`` and removes the workdir.
+Artifacts returned by the jobs then read their member straight from the
+archive (see :attr:`~unidesign.artifacts.UniDesignArtifact.member`).
+
+The archive is a POSIX (pax) tar without end-of-archive blocks, so appending
+never rewrites earlier data and ``tar -tf``/``tar -xf`` still read it. A
+JSON-lines ``<archive>.index`` sidecar maps member names to data offsets for
+random access; it is rebuilt from the archive when missing or behind. With
+``compression="zstd"`` every member is compressed on its own (and stored with
+a ``.zst`` suffix), which needs the optional :mod:`zstandard` package.
+
+Appends hold an exclusive ``fcntl`` lock on the archive, so several processes
+may share one pack; one pack per worker avoids contending for it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import tarfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Literal, Mapping
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from .exceptions import UniDesignError
+
+
+PackCompression = Literal["none", "zstd"]
+"""How member data is stored in an :class:`ArtifactPack`."""
+
+_BLOCK = tarfile.BLOCKSIZE
+_ZSTD_SUFFIX = ".zst"
+
+
+def _padded(size: int) -> int:
+    return -(-size // _BLOCK) * _BLOCK
+
+
+@dataclass(frozen=True, slots=True)
+class PackedMember:
+    """Location of one member's data inside an :class:`ArtifactPack`."""
+
+    pack: ArtifactPack
+    """Archive holding the member."""
+
+    name: str
+    """Member name without the compression suffix, ``<workdir name>/<filename>``."""
+
+    offset: int
+    """Byte offset of the stored data in the archive."""
+
+    size: int
+    """Number of stored (possibly compressed) bytes."""
+
+    compression: PackCompression = "none"
+    """Codec of the stored bytes."""
+
+    def read_bytes(self) -> bytes:
+        """Return the member's original contents."""
+
+        data = self.pack._pread(self.offset, self.size)
+        if self.compression == "zstd":
+            return _require_zstd().ZstdDecompressor().decompress(data)
+        return data
+
+    def open(self) -> io.BufferedIOBase:
+        """Return a binary reader over the member's contents."""
+
+        if self.compression == "none":
+            return io.BufferedReader(_MemberReader(self))
+        return io.BytesIO(self.read_bytes())
+
+
+class _MemberReader(io.RawIOBase):
+    """Unbuffered reader over one uncompressed member using positional reads."""
+
+    def __init__(self, member: PackedMember) -> None:
+        self._member = member
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._member.size}
+        self._position = max(0, base[whence] + offset)
+        return self._position
+
+    def readinto(self, buffer: Any) -> int:
+        remaining = self._member.size - self._position
+        if remaining <= 0:
+            return 0
+        view = memoryview(buffer).cast("B")
+        data = self._member.pack._pread(
+            self._member.offset + self._position, min(len(view), remaining)
+        )
+        view[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+@contextlib.contextmanager
+def _flock(fd: int) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _require_zstd() -> Any:
+    if zstandard is None:
+        raise UniDesignError("zstd-compressed packs require the 'zstandard' package")
+    return zstandard
+
+
+class ArtifactPack:
+    """Append-only tar archive with a random-access index.
+
+    Parameters
+    ----------
+    path:
+        Archive file; created when missing.
+    compression:
+        ``"zstd"`` compresses every new member; existing members keep the
+        codec they were written with.
+    fsync:
+        Flush the archive and index to stable storage after every append, so
+        a journal entry written afterwards never points at lost data.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike[str] | str,
+        *,
+        compression: PackCompression = "none",
+        fsync: bool = True,
+    ) -> None:
+        if compression not in ("none", "zstd"):
+            raise ValueError(f"Unknown pack compression: {compression!r}")
+        if compression == "zstd":
+            _require_zstd()
+        self._path = Path(path)
+        self._index_path = self._path.with_name(self._path.name + ".index")
+        self._compression: PackCompression = compression
+        self._fsync = fsync
+        self._lock = threading.Lock()
+        self._members: dict[str, PackedMember] = {}
+        self._indexed_end = 0
+        self._index_read = 0
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd: int | None = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._lock, _flock(self._descriptor()):
+            self._load_index()
+            self._recover()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def compression(self) -> PackCompression:
+        return self._compression
+
+    def _descriptor(self) -> int:
+        if self._fd is None:
+            raise ValueError("pack is closed")
+        return self._fd
+
+    def _pread(self, offset: int, size: int) -> bytes:
+        fd = self._descriptor()
+        chunks: list[bytes] = []
+        while size > 0:
+            chunk = os.pread(fd, size, offset)
+            if not chunk:
+                raise UniDesignError(f"{self._path} is truncated at byte {offset}")
+            chunks.append(chunk)
+            offset += len(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def _add(self, name: str, offset: int, size: int, compression: PackCompression) -> None:
+        self._members[name] = PackedMember(self, name, offset, size, compression)
+        self._indexed_end = max(self._indexed_end, offset + _padded(size))
+
+    def _load_index(self) -> None:
+        """Read index entries appended since the last call."""
+
+        try:
+            with self._index_path.open("rb") as handle:
+                handle.seek(self._index_read)
+                data = handle.read()
+        except FileNotFoundError:
+            return
+        complete = data[: data.rfind(b"\n") + 1]
+        self._index_read += len(complete)
+        for line in complete.splitlines():
+            try:
+                entry = json.loads(line)
+                self._add(entry["name"], entry["offset"], entry["size"], entry["compression"])
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    def _recover(self) -> None:
+        """Index members written after the last index entry and drop a torn tail."""
+
+        fd = self._descriptor()
+        end = os.fstat(fd).st_size
+        if end <= self._indexed_end:
+            return
+        recovered: list[dict[str, Any]] = []
+        good_end = self._indexed_end
+        with os.fdopen(os.dup(fd), "rb") as handle:
+            handle.seek(self._indexed_end)
+            try:
+                archive = tarfile.TarFile(fileobj=handle, mode="r")
+                for info in archive:
+                    if info.offset_data + _padded(info.size) > end:
+                        break
+                    name, compression = info.name, "none"
+                    if name.endswith(_ZSTD_SUFFIX):
+                        name, compression = name[: -len(_ZSTD_SUFFIX)], "zstd"
+                    recovered.append(
+                        {
+                            "name": name,
+                            "offset": info.offset_data,
+                            "size": info.size,
+                            "compression": compression,
+                        }
+                    )
+                    good_end = info.offset_data + _padded(info.size)
+            except tarfile.TarError:
+                pass
+        if good_end < end:
+            # A writer died mid-append; nothing indexed lives past this point.
+            os.ftruncate(fd, good_end)
+        self._append_index(recovered)
+
+    def _append_index(self, entries: list[dict[str, Any]]) -> None:
+        if not entries:
+            return
+        data = b"".join(
+            json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n" for entry in entries
+        )
+        fd = os.open(self._index_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                # Terminate an entry torn by a crash so it cannot swallow the next one.
+                data = b"\n" + data
+            os.write(fd, data)
+            if self._fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._load_index()
+
+    def add_files(self, files: Mapping[str, os.PathLike[str] | str]) -> dict[str, PackedMember]:
+        """Append ``{member name: source file}`` in one locked write and return the members."""
+
+        encoded: list[tuple[str, bytes, os.stat_result]] = []
+        compressor = (
+            _require_zstd().ZstdCompressor() if self._compression == "zstd" else None
+        )
+        for name, source in files.items():
+            data = Path(source).read_bytes()
+            if compressor is not None:
+                data = compressor.compress(data)
+            encoded.append((name, data, os.stat(source)))
+
+        with self._lock, _flock(self._descriptor()):
+            fd = self._descriptor()
+            self._load_index()
+            self._recover()
+            offset = os.fstat(fd).st_size
+            chunks: list[bytes] = []
+            entries: list[dict[str, Any]] = []
+            for name, data, stat in encoded:
+                info = tarfile.TarInfo(name + (_ZSTD_SUFFIX if compressor is not None else ""))
+                info.size = len(data)
+                info.mtime = int(stat.st_mtime)
+                info.mode = 0o644
+                header = info.tobuf(format=tarfile.PAX_FORMAT)
+                chunks.append(header)
+                chunks.append(data)
+                chunks.append(b"\0" * (_padded(len(data)) - len(data)))
+                entries.append(
+                    {
+                        "name": name,
+                        "offset": offset + len(header),
+                        "size": len(data),
+                        "compression": self._compression,
+                    }
+                )
+                offset += len(header) + _padded(len(data))
+            view = memoryview(b"".join(chunks))
+            position = os.fstat(fd).st_size
+            while view:
+                written = os.pwrite(fd, view, position)
+                view = view[written:]
+                position += written
+            if self._fsync:
+                os.fsync(fd)
+            self._append_index(entries)
+            return {entry["name"]: self._members[entry["name"]] for entry in entries}
+
+    def member(self, name: str) -> PackedMember:
+        """Return member ``name``, re-reading the index once if another process added it."""
+
+        with self._lock:
+            member = self._members.get(name)
+            if member is None:
+                self._load_index()
+                member = self._members.get(name)
+        if member is None:
+            raise KeyError(name)
+        return member
+
+    def __contains__(self, name: object) -> bool:
+        try:
+            self.member(name)  # type: ignore[arg-type]
+        except KeyError:
+            return False
+        return True
+
+    def names(self) -> list[str]:
+        """Return every member name known to this process."""
+
+        with self._lock:
+            self._load_index()
+            return list(self._members)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def read_bytes(self, name: str) -> bytes:
+        return self.member(name).read_bytes()
+
+    def close(self) -> None:
+        with self._lock:
+            fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+
+    def __enter__(self) -> ArtifactPack:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+__all__ = ["ArtifactPack", "PackCompression", "PackedMember"]
@@ -0,0 +1,224 @@
+"""Streaming helpers for ligand pose files (``--read_lig_poses``/``--write_lig_poses``)."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+import numpy as np
+
+
+POSE_ENERGY_COLUMNS: tuple[str, ...] = ("internal", "backbone")
+"""VDW energies written on the ``ENERGY`` line of every pose, in file order."""
+
+
+def iter_pose_blocks(source: os.PathLike[str] | str | IO[str]) -> Iterator[list[str]]:
+    """Yield the lines of every ``MODEL`` ... ``ENDMDL`` block of a pose file.
+
+    The ``MODEL`` and ``ENDMDL`` lines themselves are dropped so blocks can be
+    renumbered when written back. Lines outside a block are ignored, as the
+    binary does.
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        with Path(source).open("r", encoding="utf-8") as handle:
+            yield from iter_pose_blocks(handle)
+        return
+    block: list[str] | None = None
+    for line in source:
+        keyword = line[:4]
+        if keyword == "MODE":
+            block = []
+        elif keyword == "ENDM":
+            if block is not None:
+                yield block
+            block = None
+        elif block is not None:
+            block.append(line if line.endswith("\n") else line + "\n")
+
+
+def write_pose_blocks(blocks: Iterable[list[str]], target: os.PathLike[str] | str) -> int:
+    """Write ``blocks`` as consecutively numbered models and return how many were written."""
+
+    count = 0
+    with Path(target).open("w", encoding="utf-8") as handle:
+        for block in blocks:
+            count += 1
+            handle.write(f"MODEL     {count}\n")
+            handle.writelines(block)
+            handle.write("ENDMDL\n")
+    return count
+
+
+def split_pose_file(
+    source: os.PathLike[str] | str,
+    directory: os.PathLike[str] | str,
+    *,
+    chunk_size: int,
+) -> list[Path]:
+    """Stream ``source`` into pose files of at most ``chunk_size`` models each."""
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    directory = Path(directory)
+    chunks: list[Path] = []
+    handle: IO[str] | None = None
+    written = 0
+    try:
+        for block in iter_pose_blocks(source):
+            if handle is None or written == chunk_size:
+                if handle is not None:
+                    handle.close()
+                path = directory / f"poses_{len(chunks):05d}.pdb"
+                chunks.append(path)
+                handle = path.open("w", encoding="utf-8")
+                written = 0
+            written += 1
+            handle.write(f"MODEL     {written}\n")
+            handle.writelines(block)
+            handle.write("ENDMDL\n")
+    finally:
+        if handle is not None:
+            handle.close()
+    return chunks
+
+
+def merge_pose_files(
+    sources: Iterable[os.PathLike[str] | str], target: os.PathLike[str] | str
+) -> int:
+    """Concatenate pose files into ``target``, renumbering models; returns the pose count."""
+
+    def _blocks() -> Iterator[list[str]]:
+        for source in sources:
+            yield from iter_pose_blocks(source)
+
+    return write_pose_blocks(_blocks(), target)
+
+
+def _energy_row(block: list[str]) -> tuple[float, float]:
+    for line in block:
+        if line.startswith("ENERGY"):
+            words = line.split()
+            try:
+                return float(words[2]), float(words[4])
+            except (IndexError, ValueError):
+                break
+    return float("nan"), float("nan")
+
+
+def pose_energies(source: os.PathLike[str] | str | IO[str]) -> np.ndarray:
+    """Return an ``(n_poses, 2)`` array of :data:`POSE_ENERGY_COLUMNS` (``NaN`` when absent)."""
+
+    rows = [_energy_row(block) for block in iter_pose_blocks(source)]
+    return np.asarray(rows, dtype=np.float64).reshape(-1, len(POSE_ENERGY_COLUMNS))
+
+
+def vdw_percentile_mask(energies: np.ndarray, percentile: float) -> np.ndarray:
+    """Return which poses ``ScreenLigPoses --scrn_by_vdw_pctl`` keeps.
+
+    A pose survives when it is among the ``int(n * percentile)`` lowest
+    energies by internal VDW and also by backbone VDW, matching
+    ``SmallMolRotamersGetBothHighRankOfBackboneVdwAndInternalVdw``. The
+    ranking is global, so this selection cannot be computed chunk by chunk.
+    """
+
+    energies = np.asarray(energies, dtype=np.float64).reshape(-1, len(POSE_ENERGY_COLUMNS))
+    count = energies.shape[0]
+    threshold = int(count * percentile)
+    keep = np.zeros(count, dtype=bool)
+    if threshold <= 0:
+        return keep
+    internal = np.argsort(energies[:, 0], kind="stable")[:threshold]
+    backbone = np.argsort(energies[:, 1], kind="stable")[:threshold]
+    keep[np.intersect1d(internal, backbone, assume_unique=True)] = True
+    return keep
+
+
+@dataclass(slots=True)
+class LigandPoseAnalysis:
+    """Summary printed by ``AnalyzeLigPoses``."""
+
+    total_poses: int
+    """Number of poses in the analysed file."""
+
+    rmsd_counts: dict[float, int]
+    """Number of poses in each RMSD bin, keyed by the bin's upper bound in Å."""
+
+    min_rmsd: float
+    """Lowest RMSD to the reference ligand, in Å."""
+
+    min_rmsd_pose: int
+    """One-based index of the lowest-RMSD pose."""
+
+    min_internal_vdw: float
+    """Lowest internal VDW energy."""
+
+    min_internal_vdw_pose: int
+    """One-based index of the pose with the lowest internal VDW energy."""
+
+    min_backbone_vdw: float
+    """Lowest backbone VDW energy."""
+
+    min_backbone_vdw_pose: int
+    """One-based index of the pose with the lowest backbone VDW energy."""
+
+
+_ANALYSIS_FIELDS = {
+    "No. of total poses": "total_poses",
+    "minRMSD (angstroms)": "min_rmsd",
+    "Index of minRMSD pose (from 1)": "min_rmsd_pose",
+    "minInternalVDW": "min_internal_vdw",
+    "Index of MinInternalVDW pose": "min_internal_vdw_pose",
+    "minBackboneVDW": "min_backbone_vdw",
+    "Index of MinBackboneVDW pose": "min_backbone_vdw_pose",
+}
+
+
+def parse_pose_analysis(stdout: str) -> LigandPoseAnalysis | None:
+    """Parse the "Summary of ligand pose analysis" block, or return ``None``."""
+
+    marker = stdout.find("Summary of ligand pose analysis:")
+    if marker < 0:
+        return None
+    values: dict[str, float] = {}
+    rmsd_counts: dict[float, int] = {}
+    for line in stdout[marker:].splitlines()[1:]:
+        label, separator, value = line.partition(":")
+        if not separator:
+            continue
+        label = label.strip()
+        try:
+            number = float(value)
+        except ValueError:
+            continue
+        if label.startswith("No. of poses <"):
+            rmsd_counts[float(label.split("<")[1].split()[0])] = int(number)
+        elif label in _ANALYSIS_FIELDS:
+            values[_ANALYSIS_FIELDS[label]] = number
+    if len(values) != len(_ANALYSIS_FIELDS):
+        return None
+    return LigandPoseAnalysis(
+        total_poses=int(values["total_poses"]),
+        rmsd_counts=rmsd_counts,
+        min_rmsd=values["min_rmsd"],
+        min_rmsd_pose=int(values["min_rmsd_pose"]),
+        min_internal_vdw=values["min_internal_vdw"],
+        min_internal_vdw_pose=int(values["min_internal_vdw_pose"]),
+        min_backbone_vdw=values["min_backbone_vdw"],
+        min_backbone_vdw_pose=int(values["min_backbone_vdw_pose"]),
+    )
+
+
+__all__ = [
+    "LigandPoseAnalysis",
+    "POSE_ENERGY_COLUMNS",
+    "iter_pose_blocks",
+    "merge_pose_files",
+    "parse_pose_analysis",
+    "pose_energies",
+    "split_pose_file",
+    "vdw_percentile_mask",
+    "write_pose_blocks",
+]
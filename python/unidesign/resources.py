@@ -0,0 +1,263 @@
+"""Per-run resource accounting and batch-level summaries."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+
+RESOURCE_METRICS: tuple[str, ...] = (
+    "wall_time",
+    "user_time",
+    "system_time",
+    "max_rss",
+    "workdir_bytes",
+)
+"""Fields of :class:`RunResources` aggregated by :class:`ResourceSummary`."""
+
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass(slots=True)
+class RunResources:
+    """Resources consumed by one UniDesign process."""
+
+    wall_time: float
+    """Seconds between starting the process and reaping it."""
+
+    user_time: float | None = None
+    """CPU seconds spent in user mode (``None`` when the platform cannot report it)."""
+
+    system_time: float | None = None
+    """CPU seconds spent in the kernel (``None`` when the platform cannot report it)."""
+
+    max_rss: int | None = None
+    """Peak resident set size in bytes (``None`` when the platform cannot report it)."""
+
+    workdir_bytes: int = 0
+    """Bytes of regular files left in the workdir when the process exited."""
+
+    @property
+    def cpu_time(self) -> float | None:
+        """User plus system CPU seconds."""
+
+        if self.user_time is None or self.system_time is None:
+            return None
+        return self.user_time + self.system_time
+
+    @classmethod
+    def from_rusage(cls, wall_time: float, usage: Any, workdir_bytes: int) -> RunResources:
+        """Build from a ``resource.struct_rusage`` returned by :func:`os.wait4`."""
+
+        # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+        scale = 1 if sys.platform == "darwin" else 1024
+        return cls(
+            wall_time=wall_time,
+            user_time=usage.ru_utime,
+            system_time=usage.ru_stime,
+            max_rss=usage.ru_maxrss * scale,
+            workdir_bytes=workdir_bytes,
+        )
+
+    @classmethod
+    def combine(cls, parts: Sequence[RunResources]) -> RunResources:
+        """Fold the resources of concurrently executed shards of one logical run.
+
+        CPU time and workdir bytes add up; wall time and peak RSS are the
+        largest of any shard since the shards ran side by side.
+        """
+
+        if not parts:
+            raise ValueError("at least one part is required")
+
+        def _known(values: list[Any]) -> list[Any] | None:
+            return None if any(value is None for value in values) else values
+
+        user = _known([part.user_time for part in parts])
+        system = _known([part.system_time for part in parts])
+        rss = _known([part.max_rss for part in parts])
+        return cls(
+            wall_time=max(part.wall_time for part in parts),
+            user_time=None if user is None else sum(user),
+            system_time=None if system is None else sum(system),
+            max_rss=None if rss is None else max(rss),
+            workdir_bytes=sum(part.workdir_bytes for part in parts),
+        )
+
+
+def directory_bytes(path: os.PathLike[str] | str, *, exclude: Iterable[str] = ()) -> int:
+    """Return the total size of the regular files below ``path``.
+
+    Symbolic links are not followed, and top-level entries named in
+    ``exclude`` are skipped.
+    """
+
+    excluded = set(exclude)
+    total = 0
+    stack = [(Path(path), True)]
+    while stack:
+        directory, top = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if top and entry.name in excluded:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((Path(entry.path), False))
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return total
+
+
+def _resources_of(item: Any) -> RunResources | None:
+    """Find the :class:`RunResources` of a run result, job result or batch outcome."""
+
+    for _ in range(3):
+        if item is None or isinstance(item, RunResources):
+            return item
+        resources = getattr(item, "resources", None)
+        if isinstance(resources, RunResources):
+            return resources
+        if hasattr(item, "run"):
+            item = item.run
+        elif hasattr(item, "result"):
+            item = item.result
+        else:
+            return None
+    return None
+
+
+def _label_of(item: Any) -> str:
+    config = getattr(item, "config", None)
+    if config is not None:
+        return repr(config)
+    run = getattr(item, "run", item)
+    args = getattr(run, "args", None)
+    if args is None:
+        return ""
+    args = tuple(args)
+    if args[:1] == ("--prefix",):
+        args = args[2:]
+    return " ".join(args)
+
+
+class ResourceSummary:
+    """Columnar resource usage of many runs with summary statistics.
+
+    Rows keep a label (the configuration ``repr`` for batch outcomes, the
+    argument vector otherwise) so the runs that dominate a budget can be
+    traced back to their inputs. Metrics a platform cannot report are stored
+    as ``NaN`` and ignored by the statistics.
+    """
+
+    __slots__ = ("labels", "metrics")
+
+    def __init__(self, labels: Sequence[str], metrics: np.ndarray) -> None:
+        self.labels = np.asarray(labels, dtype=object)
+        self.metrics = np.asarray(metrics, dtype=np.float64).reshape(-1, len(RESOURCE_METRICS))
+        if self.labels.shape[0] != self.metrics.shape[0]:
+            raise ValueError("labels and metrics must have one row per run")
+
+    @classmethod
+    def from_runs(cls, items: Iterable[Any]) -> ResourceSummary:
+        """Collect the resources of run results, job results or batch outcomes.
+
+        Items without resource data (failed batch outcomes, cache hits) are
+        skipped.
+        """
+
+        labels: list[str] = []
+        rows: list[list[float]] = []
+        for item in items:
+            resources = _resources_of(item)
+            if resources is None:
+                continue
+            labels.append(_label_of(item))
+            rows.append(
+                [
+                    np.nan if value is None else float(value)
+                    for value in (getattr(resources, name) for name in RESOURCE_METRICS)
+                ]
+            )
+        return cls(labels, np.asarray(rows, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return self.metrics.shape[0]
+
+    def column(self, name: str) -> np.ndarray:
+        """Return one of :data:`RESOURCE_METRICS` for every run."""
+
+        return self.metrics[:, RESOURCE_METRICS.index(name)]
+
+    def top_k(self, k: int, metric: str = "max_rss") -> np.ndarray:
+        """Return the indices of the ``k`` runs with the largest ``metric``, largest first."""
+
+        values = np.nan_to_num(self.column(metric), nan=-np.inf)
+        return np.argsort(-values, kind="stable")[: max(k, 0)]
+
+    def statistics(self) -> dict[str, dict[str, float]]:
+        """Return ``{metric: {count, total, mean, min, p50, p90, p99, max}}``."""
+
+        summary: dict[str, dict[str, float]] = {}
+        for index, name in enumerate(RESOURCE_METRICS):
+            values = self.metrics[:, index]
+            values = values[~np.isnan(values)]
+            if not values.size:
+                summary[name] = {"count": 0}
+                continue
+            stats = {
+                "count": int(values.size),
+                "total": float(values.sum()),
+                "mean": float(values.mean()),
+                "min": float(values.min()),
+            }
+            for quantile, value in zip(_QUANTILES, np.quantile(values, _QUANTILES)):
+                stats[f"p{round(quantile * 100)}"] = float(value)
+            stats["max"] = float(values.max())
+            summary[name] = stats
+        return summary
+
+    def as_columns(self) -> dict[str, np.ndarray]:
+        """Return ``{column: array}`` with the label and every metric per run."""
+
+        columns: dict[str, np.ndarray] = {"label": self.labels}
+        for index, name in enumerate(RESOURCE_METRICS):
+            columns[name] = self.metrics[:, index]
+        return columns
+
+    def to_json(self, *, include_runs: bool = False) -> str:
+        """Serialise the statistics, and optionally every run, as JSON."""
+
+        document: dict[str, Any] = {"runs": len(self), "statistics": self.statistics()}
+        if include_runs:
+            document["rows"] = [
+                {
+                    "label": label,
+                    **{
+                        name: None if np.isnan(value) else float(value)
+                        for name, value in zip(RESOURCE_METRICS, row)
+                    },
+                }
+                for label, row in zip(self.labels.tolist(), self.metrics)
+            ]
+        return json.dumps(document, indent=2)
+
+
+__all__ = [
+    "RESOURCE_METRICS",
+    "ResourceSummary",
+    "RunResources",
+    "directory_bytes",
+]
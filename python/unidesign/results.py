@@ -0,0 +1,545 @@
+"""Columnar store of campaign results with a streaming query API.
+
+A :class:`ResultStore` is a directory of immutable chunks, each holding a
+block of rows as one array per column. Rows are flat ``{column: scalar}``
+mappings; :func:`result_row` builds one from a job result or run result
+with the configuration fields (``config.*``), run resources
+(``resources.*``), energy terms parsed from standard output (``energy.*``),
+the best designed sequence (``best.*``) and artifact locations
+(``artifact.*``).
+
+Chunks are written as uncompressed NumPy ``.npz`` archives, or as Parquet
+files when :mod:`pyarrow` is installed. Members of an ``.npz`` chunk are
+memory-mapped in place, so a :class:`ResultQuery` only pages in the columns
+it touches and keeps at most one chunk's matching rows (or ``k`` rows for
+:meth:`ResultQuery.top_k`, or one accumulator per group for
+:meth:`ResultQuery.group_by`) in memory.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import math
+import operator
+import os
+import struct
+import threading
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Iterator, Literal, Mapping, Sequence
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+from .artifacts import DesignSequenceSet, TrajectoryArtifacts, UniDesignArtifact
+from .config import CommandConfig, config_hash
+from .energy_terms import ENERGY_TERMS, parse_energy_breakdown
+from .resources import RESOURCE_METRICS
+from .runner import UniDesignRunResult
+from .sequences import ENERGY_COLUMNS
+
+
+ChunkFormat = Literal["npz", "parquet"]
+"""On-disk format of a :class:`ResultStore` chunk."""
+
+_SUFFIXES: dict[str, ChunkFormat] = {".npz": "npz", ".parquet": "parquet"}
+
+_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda column, values: np.isin(column, list(values)),
+}
+
+_AGGREGATIONS = ("count", "sum", "mean", "min", "max")
+
+
+def _scalar(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    if isinstance(value, tuple):
+        value = list(value)
+    return json.dumps(value, default=str)
+
+
+def _best_sequence_row(sequences: DesignSequenceSet) -> dict[str, Any]:
+    store = sequences.to_store()
+    row: dict[str, Any] = {"best.count": len(store)}
+    best = store.top_k(1)
+    if best.size:
+        record = store[int(best[0])]
+        row["best.sequence"] = record.sequence
+        row["best.trajectory"] = record.trajectory
+        row["best.recovery"] = record.recovery
+        for name in ENERGY_COLUMNS:
+            row[f"best.{name}"] = getattr(record, name)
+    return row
+
+
+def result_row(result: Any, config: CommandConfig | None = None) -> dict[str, Any]:
+    """Flatten a job result or :class:`~unidesign.runner.UniDesignRunResult` into a row.
+
+    ``result`` may be any job result with a ``run`` field (such as
+    :class:`~unidesign.jobs.ProteinDesignResult`); its artifact fields become
+    ``artifact.<name>`` paths and its ``best_sequences`` supply the ``best.*``
+    columns. For a bare run result the ``<prefix>_bestseqs.txt`` of its
+    workdir is used when present.
+    """
+
+    run: UniDesignRunResult = getattr(result, "run", result)
+    row: dict[str, Any] = {
+        "recorded": time.time(),
+        "prefix": run.prefix,
+        "returncode": run.returncode,
+        "workdir": str(run.workdir),
+        "config_hash": config_hash(
+            config.to_cli_args() if config is not None else run.args
+        ),
+    }
+    if config is not None:
+        row["config_type"] = type(config).__name__
+        for entry in dataclasses.fields(config):  # type: ignore[arg-type]
+            value = getattr(config, entry.name)
+            if value is not None:
+                row[f"config.{entry.name}"] = _scalar(value)
+    if run.resources is not None:
+        for name in RESOURCE_METRICS:
+            value = getattr(run.resources, name)
+            if value is not None:
+                row[f"resources.{name}"] = value
+    breakdown = parse_energy_breakdown(run.stdout)
+    if breakdown is not None:
+        row["energy.Total"] = breakdown.total
+        row.update(zip((f"energy.{term}" for term in ENERGY_TERMS), breakdown.values.tolist()))
+
+    sequences: DesignSequenceSet | None = None
+    if result is not run and dataclasses.is_dataclass(result):
+        for entry in dataclasses.fields(result):
+            value = getattr(result, entry.name)
+            if isinstance(value, UniDesignArtifact):
+                row[f"artifact.{entry.name}"] = str(value.path)
+            elif isinstance(value, TrajectoryArtifacts) and len(value):
+                row[f"artifact.{entry.name}"] = str(value.directory)
+        sequences = getattr(result, "best_sequences", None)
+    else:
+        path = run.workdir / f"{run.prefix}_bestseqs.txt"
+        if path.is_file():
+            sequences = DesignSequenceSet(
+                path=path, prefix=run.prefix, logical_name="best_sequences"
+            )
+    if isinstance(sequences, DesignSequenceSet):
+        row.update(_best_sequence_row(sequences))
+    return row
+
+
+def _column_array(values: list[Any]) -> np.ndarray:
+    """Convert one column of scalars (``None`` for missing) to a typed array."""
+
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        if len(present) == len(values):
+            return np.asarray(values, dtype=bool)
+        return np.asarray([np.nan if v is None else float(v) for v in values])
+    if present and all(isinstance(value, (int, float)) for value in present):
+        if len(present) == len(values) and all(isinstance(v, int) for v in present):
+            return np.asarray(values, dtype=np.int64)
+        return np.asarray([np.nan if v is None else float(v) for v in values])
+    return np.asarray(["" if value is None else str(value) for value in values], dtype=str)
+
+
+def _missing(rows: int, like: np.dtype) -> np.ndarray:
+    if like.kind in "US":
+        return np.full(rows, "", dtype=like)
+    if like.kind == "O":
+        return np.full(rows, None, dtype=object)
+    return np.full(rows, np.nan)
+
+
+def _npz_members(path: Path) -> dict[str, np.ndarray]:
+    """Memory-map every member of an uncompressed ``.npz`` file in place."""
+
+    members: dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as archive, path.open("rb") as handle:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED or not info.filename.endswith(".npy"):
+                continue
+            handle.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", handle.read(4))
+            handle.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(handle)
+            if version == (1, 0):
+                header = np.lib.format.read_array_header_1_0(handle)
+            else:
+                header = np.lib.format.read_array_header_2_0(handle)
+            shape, fortran, dtype = header
+            name = info.filename[: -len(".npy")]
+            if dtype.hasobject:
+                continue
+            if not math.prod(shape):
+                members[name] = np.empty(shape, dtype=dtype)
+                continue
+            members[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=handle.tell(),
+                shape=shape,
+                order="F" if fortran else "C",
+            )
+    return members
+
+
+class _Chunk:
+    __slots__ = ("path", "format", "rows", "_columns", "_schema")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.format = _SUFFIXES[path.suffix]
+        self._columns: dict[str, np.ndarray] = {}
+        if self.format == "npz":
+            self._columns = _npz_members(path)
+            self._schema = list(self._columns)
+            self.rows = next(iter(self._columns.values())).shape[0] if self._columns else 0
+        else:
+            metadata = _require_pyarrow().parquet.read_metadata(path)
+            self._schema = list(metadata.schema.names)
+            self.rows = metadata.num_rows
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._schema)
+
+    def column(self, name: str) -> np.ndarray | None:
+        column = self._columns.get(name)
+        if column is None and self.format == "parquet" and name in self._schema:
+            table = _require_pyarrow().parquet.read_table(
+                self.path, columns=[name], memory_map=True
+            )
+            column = table.column(0).to_numpy(zero_copy_only=False)
+            self._columns[name] = column
+        return column
+
+
+def _require_pyarrow() -> Any:
+    if pyarrow is None:
+        raise ImportError("Parquet result chunks require the 'pyarrow' package")
+    return pyarrow
+
+
+class ResultStore:
+    """Append-only directory of columnar result chunks.
+
+    Parameters
+    ----------
+    path:
+        Store directory; created when missing.
+    chunk_rows:
+        Rows buffered in memory before a chunk is written.
+    format:
+        ``"parquet"`` (the default when :mod:`pyarrow` is installed) or
+        ``"npz"``. Stores may mix both.
+
+    Chunks are written to a temporary name and renamed into place, so several
+    processes can append to one store and readers never see partial chunks.
+    Call :meth:`flush` (or use the store as a context manager) to write the
+    last partial chunk.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike[str] | str,
+        *,
+        chunk_rows: int = 1024,
+        format: ChunkFormat | None = None,
+    ) -> None:
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        if format is None:
+            format = "parquet" if pyarrow is not None else "npz"
+        if format not in ("npz", "parquet"):
+            raise ValueError(f"Unknown chunk format: {format!r}")
+        if format == "parquet":
+            _require_pyarrow()
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._chunk_rows = chunk_rows
+        self._format: ChunkFormat = format
+        self._pending: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._chunks: dict[Path, _Chunk] = {}
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def format(self) -> ChunkFormat:
+        return self._format
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Buffer one row, writing a chunk once ``chunk_rows`` are pending."""
+
+        with self._lock:
+            self._pending.append({key: _scalar(value) for key, value in row.items()})
+            if len(self._pending) >= self._chunk_rows:
+                self._write_chunk()
+
+    def add(self, result: Any, config: CommandConfig | None = None, **extra: Any) -> None:
+        """Append :func:`result_row` of ``result`` plus ``extra`` columns."""
+
+        self.append({**result_row(result, config), **extra})
+
+    def flush(self) -> None:
+        """Write the buffered rows as a chunk."""
+
+        with self._lock:
+            if self._pending:
+                self._write_chunk()
+
+    def _write_chunk(self) -> None:
+        rows, self._pending = self._pending, []
+        names: dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        columns = {name: _column_array([row.get(name) for row in rows]) for name in names}
+        stem = f"chunk-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        suffix = ".npz" if self._format == "npz" else ".parquet"
+        target = self._path / f"{stem}{suffix}"
+        staging = self._path / f".{stem}{suffix}.tmp"
+        try:
+            if self._format == "npz":
+                with staging.open("wb") as handle:
+                    np.savez(handle, **columns)
+            else:
+                arrow = _require_pyarrow()
+                arrow.parquet.write_table(arrow.table(columns), staging)
+            os.replace(staging, target)
+        except BaseException:
+            staging.unlink(missing_ok=True)
+            raise
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def chunks(self) -> list[_Chunk]:
+        """Open the chunks written so far, oldest first."""
+
+        paths = sorted(
+            path
+            for path in self._path.iterdir()
+            if path.name.startswith("chunk-") and path.suffix in _SUFFIXES
+        )
+        with self._lock:
+            self._chunks = {path: self._chunks.get(path) or _Chunk(path) for path in paths}
+            return list(self._chunks.values())
+
+    def columns(self) -> list[str]:
+        """Return every column name, in order of first appearance."""
+
+        names: dict[str, None] = {}
+        for chunk in self.chunks():
+            names.update(dict.fromkeys(chunk.names))
+        return list(names)
+
+    def __len__(self) -> int:
+        return sum(chunk.rows for chunk in self.chunks())
+
+    def query(self) -> ResultQuery:
+        """Start a query over every chunk."""
+
+        return ResultQuery(self)
+
+
+def _concat(pieces: list[tuple[int, np.ndarray | None]]) -> np.ndarray:
+    like = next((piece.dtype for _, piece in pieces if piece is not None), np.dtype(float))
+    arrays = [piece if piece is not None else _missing(rows, like) for rows, piece in pieces]
+    if not arrays:
+        return np.empty(0, dtype=like)
+    return np.concatenate(arrays)
+
+
+class ResultQuery:
+    """Filters over a :class:`ResultStore`, evaluated chunk by chunk.
+
+    ``where`` calls combine with AND. Rows of chunks without a filtered
+    column never match. Results are ``{column: array}`` mappings like
+    :meth:`~unidesign.resources.ResourceSummary.as_columns`; string columns
+    missing from a chunk read as ``""`` and numeric ones as ``NaN``.
+    """
+
+    def __init__(self, store: ResultStore) -> None:
+        self._store = store
+        self._filters: list[tuple[str, Callable[[Any, Any], Any], Any]] = []
+
+    def where(self, column: str, op: str, value: Any) -> ResultQuery:
+        """Keep rows where ``column <op> value``; ``op`` is a comparison or ``"in"``."""
+
+        try:
+            function = _OPERATORS[op]
+        except KeyError:
+            raise ValueError(f"Unknown operator {op!r}; expected one of {list(_OPERATORS)}")
+        self._filters.append((column, function, value))
+        return self
+
+    def _matches(self) -> Iterator[tuple[_Chunk, np.ndarray]]:
+        """Yield every chunk with the indices of its matching rows."""
+
+        for chunk in self._store.chunks():
+            mask = np.ones(chunk.rows, dtype=bool)
+            for column, function, value in self._filters:
+                values = chunk.column(column)
+                if values is None:
+                    mask[:] = False
+                    break
+                mask &= np.asarray(function(values, value), dtype=bool)
+            yield chunk, np.flatnonzero(mask)
+
+    def count(self) -> int:
+        return sum(rows.size for _, rows in self._matches())
+
+    def rows(self, columns: Sequence[str] | None = None) -> dict[str, np.ndarray]:
+        """Return the matching rows; all columns when ``columns`` is omitted."""
+
+        names = list(columns) if columns is not None else self._store.columns()
+        pieces: dict[str, list[tuple[int, np.ndarray | None]]] = {name: [] for name in names}
+        for chunk, rows in self._matches():
+            for name in names:
+                values = chunk.column(name)
+                pieces[name].append((rows.size, None if values is None else values[rows]))
+        return {name: _concat(parts) for name, parts in pieces.items()}
+
+    def top_k(
+        self,
+        k: int,
+        column: str,
+        *,
+        columns: Sequence[str] | None = None,
+        descending: bool = False,
+    ) -> dict[str, np.ndarray]:
+        """Return the ``k`` matching rows with the lowest (or highest) ``column``, in order.
+
+        ``NaN`` values rank last. Only ``k`` candidate rows are kept between chunks.
+        """
+
+        names = list(columns) if columns is not None else self._store.columns()
+        if column not in names:
+            names.append(column)
+        best_keys = np.empty(0)
+        best: dict[str, list[tuple[int, np.ndarray | None]]] = {name: [] for name in names}
+        for chunk, rows in self._matches():
+            values = chunk.column(column)
+            if values is None or not rows.size or k <= 0:
+                continue
+            keys = np.asarray(values[rows], dtype=np.float64)
+            keys = np.nan_to_num(-keys if descending else keys, nan=np.inf)
+            if keys.size > k:
+                keep = np.argpartition(keys, k - 1)[:k]
+                rows, keys = rows[keep], keys[keep]
+            for name in names:
+                chunk_values = chunk.column(name)
+                best[name].append(
+                    (rows.size, None if chunk_values is None else chunk_values[rows])
+                )
+            merged_keys = np.concatenate([best_keys, keys])
+            order = np.argsort(merged_keys, kind="stable")[:k]
+            best_keys = merged_keys[order]
+            for name in names:
+                # Keep a column no chunk has had yet as missing, so its fill
+                # follows the dtype of the first chunk that does have it.
+                merged = None
+                if any(piece is not None for _, piece in best[name]):
+                    merged = _concat(best[name])[order]
+                best[name] = [(order.size, merged)]
+        return {name: _concat(parts) for name, parts in best.items()}
+
+    def group_by(
+        self, column: str, aggregations: Mapping[str, tuple[str, str]]
+    ) -> dict[str, np.ndarray]:
+        """Aggregate matching rows per distinct value of ``column``.
+
+        ``aggregations`` maps output names to ``(source column, function)``
+        with functions ``count``, ``sum``, ``mean``, ``min`` and ``max``;
+        ``NaN`` values are ignored. Groups are returned sorted by key.
+        """
+
+        for source, function in aggregations.values():
+            if function not in _AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation {function!r}; expected {_AGGREGATIONS}")
+        sources = sorted({source for source, _ in aggregations.values()})
+        groups: dict[Any, dict[str, list[float]]] = {}
+        for chunk, rows in self._matches():
+            keys = chunk.column(column)
+            if keys is None or not rows.size:
+                continue
+            unique, inverse = np.unique(keys[rows], return_inverse=True)
+            for source in sources:
+                values = chunk.column(source)
+                data = (
+                    np.full(rows.size, np.nan)
+                    if values is None
+                    else np.asarray(values[rows], dtype=np.float64)
+                )
+                valid = ~np.isnan(data)
+                counts = np.bincount(inverse[valid], minlength=unique.size)
+                sums = np.bincount(inverse[valid], weights=data[valid], minlength=unique.size)
+                minima = np.full(unique.size, np.inf)
+                maxima = np.full(unique.size, -np.inf)
+                np.minimum.at(minima, inverse[valid], data[valid])
+                np.maximum.at(maxima, inverse[valid], data[valid])
+                for position, key in enumerate(unique.tolist()):
+                    state = groups.setdefault(key, {}).setdefault(
+                        source, [0.0, 0.0, np.inf, -np.inf]
+                    )
+                    state[0] += counts[position]
+                    state[1] += sums[position]
+                    state[2] = min(state[2], minima[position])
+                    state[3] = max(state[3], maxima[position])
+        keys = sorted(groups)
+        result: dict[str, np.ndarray] = {column: np.asarray(keys)}
+        for name, (source, function) in aggregations.items():
+            values = []
+            for key in keys:
+                count, total, minimum, maximum = groups[key].get(
+                    source, [0.0, 0.0, np.inf, -np.inf]
+                )
+                if function == "count":
+                    values.append(count)
+                elif not count:
+                    values.append(np.nan)
+                else:
+                    values.append(
+                        {"sum": total, "mean": total / count, "min": minimum, "max": maximum}[
+                            function
+                        ]
+                    )
+            result[name] = np.asarray(values, dtype=np.float64)
+        return result
+
+
+__all__ = [
+    "ChunkFormat",
+    "ResultQuery",
+    "ResultStore",
+    "result_row",
+]
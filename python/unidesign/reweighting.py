@@ -0,0 +1,270 @@
+"""Offline re-scoring of cached unweighted energy terms under new weight sets."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+
+from . import paths
+from .batch import UniDesignBatchRunner
+from .config import ComputeStabilityConfig
+from .energy_terms import (
+    ENERGY_TERMS,
+    NATIVE_TERM_INDICES,
+    EnergyBreakdown,
+    EnergyBreakdownBatch,
+    parse_energy_breakdown,
+)
+from .runner import UniDesignRunner
+from .sequences import _npz_path
+
+
+MAX_ENERGY_TERM = 100
+"""Size of the native ``WEIGHTS``/``energyTerms`` arrays (``EnergyFunction.h``)."""
+
+UNIT_WEIGHT_FILE = "weight_one.wgt"
+"""Bundled weight file with every weight set to ``1.0``; runs under it print unweighted terms."""
+
+WEIGHT_FILE_TERMS: dict[str, int] = {
+    **{
+        name: index
+        for name, index in zip(ENERGY_TERMS, NATIVE_TERM_INDICES)
+        if not name.startswith("prolig_")
+    },
+    "ligand_vdwatt": 71,
+    "ligand_vdwrep": 72,
+    "ligand_electr": 73,
+    "ligand_deslvP": 74,
+    "ligand_deslvH": 75,
+    "ligand_hbscbb_dis": 84,
+    "ligand_hbscbb_the": 85,
+    "ligand_hbscbb_phi": 86,
+    "ligand_hbscsc_dis": 87,
+    "ligand_hbscsc_the": 88,
+    "ligand_hbscsc_phi": 89,
+}
+"""Native ``WEIGHTS`` slot assigned to each ``.wgt`` term name by ``EnergyWeightRead``.
+
+The ligand hydrogen-bond names are shifted relative to the printed
+``prolig_*`` terms exactly as in the binary, so re-scoring reproduces its
+totals rather than the intent of the file.
+"""
+
+
+@dataclass(slots=True)
+class EnergyWeights:
+    """A ``wread`` weight set expanded to the native ``WEIGHTS`` array."""
+
+    native: np.ndarray = field(default_factory=lambda: np.ones(MAX_ENERGY_TERM))
+    """Weights indexed like the native ``WEIGHTS`` array; unspecified slots are ``1.0``."""
+
+    name: str = "custom"
+    """Label used when reporting scores for this weight set."""
+
+    @classmethod
+    def from_mapping(cls, weights: Mapping[str, float], *, name: str = "custom") -> EnergyWeights:
+        """Build weights from ``.wgt`` term names; unknown names are ignored like the binary does."""
+
+        native = np.ones(MAX_ENERGY_TERM)
+        for term, value in weights.items():
+            index = WEIGHT_FILE_TERMS.get(term)
+            if index is not None:
+                native[index] = float(value)
+        return cls(native=native, name=name)
+
+    @classmethod
+    def from_file(cls, path: os.PathLike[str] | str) -> EnergyWeights:
+        """Parse a ``.wgt`` file (``<term> <value>`` per line)."""
+
+        path = Path(path)
+        weights: dict[str, float] = {}
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                fields = line.split()
+                if len(fields) < 2:
+                    continue
+                try:
+                    weights[fields[0]] = float(fields[1])
+                except ValueError:
+                    continue
+        return cls.from_mapping(weights, name=path.stem)
+
+    @classmethod
+    def bundled(cls, name: str) -> EnergyWeights:
+        """Load one of the weight files shipped in ``wread`` (e.g. ``"weight_all1"``)."""
+
+        filename = name if name.endswith(".wgt") else f"{name}.wgt"
+        return cls.from_file(paths.wread_dir() / filename)
+
+    def vector(self) -> np.ndarray:
+        """Return the weight of each printed term, aligned with :data:`ENERGY_TERMS`."""
+
+        return self.native[list(NATIVE_TERM_INDICES)]
+
+    def as_mapping(self) -> dict[str, float]:
+        """Return the weights keyed by ``.wgt`` term name."""
+
+        return {term: float(self.native[index]) for term, index in WEIGHT_FILE_TERMS.items()}
+
+    def write(self, path: os.PathLike[str] | str) -> Path:
+        """Write the weights as a ``.wgt`` file usable through ``--wread``."""
+
+        path = Path(path)
+        lines = [f"{term:<24}{value:>10.3f}\n" for term, value in self.as_mapping().items()]
+        path.write_text("".join(lines), encoding="utf-8")
+        return path
+
+
+def _weight_vector(weights: EnergyWeights | np.ndarray) -> np.ndarray:
+    if isinstance(weights, EnergyWeights):
+        return weights.vector()
+    vector = np.asarray(weights, dtype=np.float64)
+    if vector.shape != (len(ENERGY_TERMS),):
+        raise ValueError(f"weight vectors must have {len(ENERGY_TERMS)} entries")
+    return vector
+
+
+class ReweightingEngine:
+    """Score a campaign under arbitrary weight sets from unweighted energy terms.
+
+    ``terms`` must hold unweighted values, i.e. breakdowns captured with
+    :data:`UNIT_WEIGHT_FILE`; :meth:`capture` produces them. Scoring is then a
+    single matrix-vector (or matrix-matrix) product with no subprocesses.
+    """
+
+    __slots__ = ("terms", "keys", "failures")
+
+    def __init__(
+        self,
+        terms: EnergyBreakdownBatch,
+        keys: Sequence[str] | None = None,
+        *,
+        failures: Mapping[str, str] | None = None,
+    ) -> None:
+        self.terms = terms
+        self.keys = np.asarray(
+            list(keys) if keys is not None else [str(i) for i in range(len(terms))],
+            dtype=object,
+        )
+        if self.keys.shape[0] != len(terms):
+            raise ValueError("keys must have one entry per row of terms")
+        self.failures = dict(failures or {})
+
+    @classmethod
+    def capture(
+        cls,
+        runner: UniDesignRunner,
+        pdb_paths: Iterable[os.PathLike[str] | str],
+        *,
+        use_bbdep_rotlib: bool | None = None,
+        rotamer_library: str | None = None,
+        max_workers: int | None = None,
+    ) -> ReweightingEngine:
+        """Run ``ComputeStability`` once per structure under unit weights.
+
+        Structures whose run fails or prints no energy block are reported in
+        :attr:`failures` instead of aborting the capture.
+        """
+
+        unit_weights = paths.wread_dir() / UNIT_WEIGHT_FILE
+        configs = [
+            ComputeStabilityConfig(
+                pdb_path=path,
+                use_bbdep_rotlib=use_bbdep_rotlib,
+                rotamer_library=rotamer_library,
+                weight_file=unit_weights,
+            )
+            for path in pdb_paths
+        ]
+        rows: dict[int, tuple[str, EnergyBreakdown]] = {}
+        failures: dict[str, str] = {}
+        batch = UniDesignBatchRunner(runner, max_workers=max_workers)
+        for outcome in batch.map(configs):
+            key = str(outcome.config.pdb_path)
+            if not outcome.ok:
+                failures[key] = repr(outcome.error)
+                continue
+            breakdown = parse_energy_breakdown(outcome.result.stdout)
+            if outcome.result.returncode != 0 or breakdown is None:
+                failures[key] = outcome.result.stderr.strip() or "no energy details"
+                continue
+            rows[outcome.index] = (key, breakdown)
+        ordered = [rows[index] for index in sorted(rows)]
+        return cls(
+            EnergyBreakdownBatch.from_breakdowns(breakdown for _, breakdown in ordered),
+            [key for key, _ in ordered],
+            failures=failures,
+        )
+
+    def score(self, weights: EnergyWeights | np.ndarray) -> np.ndarray:
+        """Return the weighted total of every structure under ``weights``."""
+
+        return self.terms.matrix @ _weight_vector(weights)
+
+    def score_many(self, weight_sets: Sequence[EnergyWeights | np.ndarray]) -> np.ndarray:
+        """Return an ``(n_structures, n_weight_sets)`` matrix of weighted totals."""
+
+        if not weight_sets:
+            return np.empty((len(self.terms), 0))
+        weight_matrix = np.stack([_weight_vector(weights) for weights in weight_sets], axis=1)
+        return self.terms.matrix @ weight_matrix
+
+    def top_k(self, weights: EnergyWeights | np.ndarray, k: int) -> list[tuple[str, float]]:
+        """Return the ``k`` lowest-scoring structures under ``weights``."""
+
+        scores = self.score(weights)
+        k = min(k, scores.shape[0])
+        if k <= 0:
+            return []
+        order = np.argpartition(scores, k - 1)[:k]
+        order = order[np.argsort(scores[order], kind="stable")]
+        return [(self.keys[i], float(scores[i])) for i in order]
+
+    def save(self, path: os.PathLike[str] | str) -> Path:
+        """Persist the unweighted terms and :attr:`failures` to a ``.npz`` archive.
+
+        ``.npz`` is appended to ``path`` unless present; the written path is returned.
+        """
+
+        path = _npz_path(path)
+        np.savez(
+            path,
+            matrix=self.terms.matrix,
+            totals=self.terms.totals,
+            labels=self.terms.labels.astype(str),
+            keys=self.keys.astype(str),
+            terms=np.asarray(ENERGY_TERMS),
+            failure_keys=np.asarray(list(self.failures), dtype=str),
+            failure_errors=np.asarray(list(self.failures.values()), dtype=str),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: os.PathLike[str] | str) -> ReweightingEngine:
+        """Load terms written by :meth:`save`."""
+
+        with np.load(_npz_path(path), allow_pickle=False) as data:
+            if tuple(data["terms"].tolist()) != ENERGY_TERMS:
+                raise ValueError("saved energy terms do not match this version")
+            terms = EnergyBreakdownBatch(
+                data["matrix"], data["totals"], data["labels"].tolist()
+            )
+            failures = (
+                dict(zip(data["failure_keys"].tolist(), data["failure_errors"].tolist()))
+                if "failure_keys" in data.files
+                else None
+            )
+            return cls(terms, data["keys"].tolist(), failures=failures)
+
+
+__all__ = [
+    "MAX_ENERGY_TERM",
+    "UNIT_WEIGHT_FILE",
+    "WEIGHT_FILE_TERMS",
+    "EnergyWeights",
+    "ReweightingEngine",
+]
@@ -2,16 +2,53 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
 import os
+import re
 import shutil
 import subprocess
+import tempfile
+import threading
+import time
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Mapping, MutableMapping, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    Literal,
+    Mapping,
+    MutableMapping,
+    Sequence,
+    get_args,
+)
 
 from . import paths
+from .config import command_name, config_hash
+from .exceptions import UniDesignError, UniDesignTimeoutError
+from .inputs import STAGED_INPUTS_DIR, InputCache, resolve_input_paths
+from .resources import RunResources, directory_bytes
+from .tracing import NOOP_TRACER, Tracer
+from .workdirs import PooledWorkdir, TmpfsWorkdir, TmpfsWorkdirs, WorkdirPool
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .cache import ResultCache
+    from .packs import ArtifactPack
+
+
+RelocationStrategy = Literal["rename", "hardlink", "copy"]
+"""How job wrappers move artifacts out of a discarded workdir.
+
+``"rename"`` and ``"hardlink"`` avoid rewriting file contents when the
+destination shares a filesystem with the workdir and fall back to copying
+across devices; ``"copy"`` always duplicates the data.
+"""
 
 
 @dataclass(slots=True)
@@ -36,6 +73,115 @@ class UniDesignRunResult:
     prefix: str
     """Prefix automatically injected into CLI arguments for unique output names."""
 
+    resources: RunResources | None = None
+    """Wall time, CPU time, peak RSS and workdir size of the process.
+
+    ``None`` for replayed cache hits. Runs started through
+    :meth:`UniDesignRunner.run_async` or :meth:`UniDesignRunner.stream_async`
+    are reaped by asyncio, so only their wall time and workdir size are known.
+    """
+
+
+_RUN_TIMEOUT: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "unidesign_run_timeout", default=None
+)
+
+
+@contextlib.contextmanager
+def run_timeout(seconds: float | None) -> Iterator[None]:
+    """Limit every run started in this context that does not pass its own ``timeout``.
+
+    Job wrappers call :meth:`UniDesignRunner.run` internally, so this is how
+    a time limit reaches their processes; see
+    :class:`~unidesign.batch.UniDesignBatchRunner`.
+    """
+
+    if seconds is not None and seconds <= 0:
+        raise ValueError("timeout must be positive")
+    token = _RUN_TIMEOUT.set(seconds)
+    try:
+        yield
+    finally:
+        _RUN_TIMEOUT.reset(token)
+
+
+def _timeout_error(argv: Sequence[str], timeout: float) -> UniDesignTimeoutError:
+    return UniDesignTimeoutError(
+        f"{command_name(argv) or argv[0]} did not finish within {timeout:g} s and was killed",
+        timeout=timeout,
+    )
+
+
+def _run_measured(
+    argv: Sequence[str], cwd: Path, env: Mapping[str, str], timeout: float | None = None
+) -> tuple[int, str, str, float, object | None]:
+    """Run ``argv`` to completion and return its exit code, output and resource usage.
+
+    Where :func:`os.wait4` exists the child is reaped with it so its own
+    ``rusage`` is captured, which :func:`subprocess.run` would discard. A
+    child still running after ``timeout`` seconds is killed and
+    :class:`~unidesign.exceptions.UniDesignTimeoutError` is raised.
+    """
+
+    started = time.perf_counter()
+    if not hasattr(os, "wait4"):
+        try:
+            completed = subprocess.run(
+                argv,
+                cwd=str(cwd),
+                env=env,
+                check=False,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise _timeout_error(argv, timeout) from None
+        wall_time = time.perf_counter() - started
+        return completed.returncode, completed.stdout, completed.stderr, wall_time, None
+
+    with subprocess.Popen(
+        argv,
+        cwd=str(cwd),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    ) as process:
+        assert process.stdout is not None and process.stderr is not None
+        # The lock keeps the timer from signalling a pid that was already reaped.
+        lock = threading.Lock()
+        expired = False
+
+        def _expire() -> None:
+            nonlocal expired
+            with lock:
+                if process.returncode is None:
+                    expired = True
+                    process.kill()
+
+        killer = threading.Timer(timeout, _expire) if timeout is not None else None
+        stderr_parts: list[str] = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_parts.append(process.stderr.read()), daemon=True
+        )
+        stderr_reader.start()
+        if killer is not None:
+            killer.start()
+        try:
+            stdout = process.stdout.read()
+            stderr_reader.join()
+            _, status, usage = os.wait4(process.pid, 0)
+            with lock:
+                process.returncode = os.waitstatus_to_exitcode(status)
+        finally:
+            if killer is not None:
+                killer.cancel()
+    if expired:
+        raise _timeout_error(argv, timeout)
+    wall_time = time.perf_counter() - started
+    return process.returncode, stdout, "".join(stderr_parts), wall_time, usage
+
 
 class UniDesignRunner:
     """Convenience wrapper around the UniDesign command line binary."""
@@ -46,21 +192,120 @@ class UniDesignRunner:
         ("extbin", paths.extbin_dir()),
     )
 
+    _PROBED_OPTIONS: tuple[str, ...] = ("--random_seed",)
+    """Options this package added to the binary; older builds must not receive them.
+
+    A build without such an option prints its help and exits 0, so the run
+    would look successful; each is checked against ``--help`` before use.
+    """
+
     def __init__(
         self,
         binary_path: os.PathLike[str] | str,
         *,
         default_env: Mapping[str, str] | None = None,
         base_working_dir: os.PathLike[str] | str | None = None,
+        cache: ResultCache | None = None,
+        relocation: RelocationStrategy = "rename",
+        tracer: Tracer | None = None,
+        prewarmed_workdirs: int = 0,
+        artifact_pack: ArtifactPack | None = None,
+        input_cache: InputCache | None = None,
+        tmpfs_workdirs: TmpfsWorkdirs | None = None,
     ) -> None:
+        if relocation not in get_args(RelocationStrategy):
+            raise ValueError(f"Unknown relocation strategy: {relocation!r}")
         self._binary_path = Path(binary_path)
         self._default_env = dict(default_env or {})
         self._base_working_dir = Path(base_working_dir) if base_working_dir else None
+        self._cache = cache
+        self._relocation: RelocationStrategy = relocation
+        self._tracer = tracer if tracer is not None else NOOP_TRACER
+        self._artifact_pack = artifact_pack
+        self._input_cache = input_cache
+        self._tmpfs_workdirs = tmpfs_workdirs
+        self._workdir_pool: WorkdirPool | None = None
+        self._help_options: frozenset[str] | None = None
+        self._help_lock = threading.Lock()
+        if prewarmed_workdirs < 0:
+            raise ValueError("prewarmed_workdirs must not be negative")
+        if prewarmed_workdirs:
+            self._workdir_pool = WorkdirPool(
+                self._link_resources,
+                (name for name, _ in self._STATIC_RESOURCES),
+                size=prewarmed_workdirs,
+                base_dir=self._base_working_dir,
+            )
 
     @property
     def binary_path(self) -> Path:
         return self._binary_path
 
+    @property
+    def cache(self) -> ResultCache | None:
+        return self._cache
+
+    @property
+    def relocation_strategy(self) -> RelocationStrategy:
+        return self._relocation
+
+    @property
+    def artifact_pack(self) -> ArtifactPack | None:
+        """Archive receiving the outputs job wrappers relocate; see :mod:`unidesign.packs`."""
+
+        return self._artifact_pack
+
+    @property
+    def input_cache(self) -> InputCache | None:
+        """Node-local cache that input files are staged from; see :mod:`unidesign.inputs`."""
+
+        return self._input_cache
+
+    @property
+    def tmpfs_workdirs(self) -> TmpfsWorkdirs | None:
+        """RAM-backed filesystem that workdirs are placed on while it has room."""
+
+        return self._tmpfs_workdirs
+
+    def spill_dir(self, workdir: os.PathLike[str] | str) -> Path | None:
+        """Return the on-disk directory that outputs of a tmpfs ``workdir`` are flushed to.
+
+        ``None`` when ``workdir`` is not on :attr:`tmpfs_workdirs`, i.e. when
+        its outputs can stay where they are.
+        """
+
+        if self._tmpfs_workdirs is None or not self._tmpfs_workdirs.owns(workdir):
+            return None
+        if self._base_working_dir is not None:
+            return self._base_working_dir
+        return Path(tempfile.gettempdir())
+
+    def _observe_workdir(self, workdir: Path, resources: RunResources | None) -> None:
+        if (
+            self._tmpfs_workdirs is not None
+            and resources is not None
+            and self._tmpfs_workdirs.owns(workdir)
+        ):
+            self._tmpfs_workdirs.observe(resources.workdir_bytes)
+
+    @property
+    def workdir_pool(self) -> WorkdirPool | None:
+        """Pool of pre-warmed workdirs, when ``prewarmed_workdirs`` was given."""
+
+        return self._workdir_pool
+
+    def close(self) -> None:
+        """Delete the idle workdirs of :attr:`workdir_pool`, if any."""
+
+        if self._workdir_pool is not None:
+            self._workdir_pool.close()
+
+    @property
+    def tracer(self) -> Tracer:
+        """Sink for the spans of every run; see :mod:`unidesign.tracing`."""
+
+        return self._tracer
+
     def _prepare_environment(
         self, overrides: Mapping[str, str] | None = None
     ) -> MutableMapping[str, str]:
@@ -82,55 +327,447 @@ class UniDesignRunner:
             else:
                 shutil.copy2(source, target)
 
-    def _prepare_workdir(self, persist: bool) -> tuple[TemporaryDirectory, Path]:
-        tmp_dir = TemporaryDirectory(
-            prefix="unidesign_",
-            dir=str(self._base_working_dir) if self._base_working_dir else None,
-            delete=not persist,
-        )
-        workdir = Path(tmp_dir.name)
+    def _link_resources(self, workdir: Path) -> None:
         for name, source in self._STATIC_RESOURCES:
             self._ensure_resource(workdir, name, source)
+
+    def _prepare_workdir(
+        self, persist: bool
+    ) -> tuple[TemporaryDirectory | PooledWorkdir | TmpfsWorkdir, Path]:
+        if self._tmpfs_workdirs is not None:
+            with self._tracer.span("runner.workdir.tmpfs") as span:
+                workdir = self._tmpfs_workdirs.create()
+                span.set(admitted=workdir is not None)
+            if workdir is not None:
+                tmp_mgr = TmpfsWorkdir(workdir, persist=persist)
+                try:
+                    with self._tracer.span(
+                        "runner.workdir.link", resources=len(self._STATIC_RESOURCES)
+                    ):
+                        self._link_resources(workdir)
+                except BaseException:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                    raise
+                return tmp_mgr, workdir
+        if self._workdir_pool is not None:
+            with self._tracer.span("runner.workdir.acquire"):
+                workdir = self._workdir_pool.acquire()
+            return PooledWorkdir(self._workdir_pool, workdir, persist=persist), workdir
+        with self._tracer.span("runner.workdir.create"):
+            tmp_dir = TemporaryDirectory(
+                prefix="unidesign_",
+                dir=str(self._base_working_dir) if self._base_working_dir else None,
+                delete=not persist,
+            )
+        workdir = Path(tmp_dir.name)
+        with self._tracer.span("runner.workdir.link", resources=len(self._STATIC_RESOURCES)):
+            self._link_resources(workdir)
         return tmp_dir, workdir
 
+    def _start(
+        self, args: Sequence[str] | None, persist_workdir: bool
+    ) -> tuple[
+        tuple[str, ...], str, TemporaryDirectory | PooledWorkdir | TmpfsWorkdir, Path
+    ]:
+        extra_args = tuple(args or ())
+        if any(arg.startswith("--prefix") for arg in extra_args):
+            raise ValueError("UniDesignRunner manages the --prefix argument automatically.")
+
+        for flag in self._PROBED_OPTIONS:
+            given = any(arg == flag or arg.startswith(f"{flag}=") for arg in extra_args)
+            if given and not self.supports_option(flag):
+                raise UniDesignError(
+                    f"{self._binary_path} does not support {flag}; rebuild UniDesign "
+                    "from this source tree"
+                )
+
+        prefix = f"unidesign_{uuid.uuid4().hex}"
+        extra_args = resolve_input_paths(extra_args)
+        tmp_mgr, workdir = self._prepare_workdir(persist_workdir)
+        if self._input_cache is not None:
+            try:
+                with self._tracer.span("runner.inputs.stage"):
+                    extra_args = self._input_cache.stage(extra_args, workdir)
+            except BaseException:
+                tmp_mgr.cleanup()
+                raise
+        argv = (str(self._binary_path), "--prefix", prefix, *extra_args)
+        return argv, prefix, tmp_mgr, workdir
+
+    def supports_option(self, flag: str) -> bool:
+        """Whether the binary lists ``flag``, such as ``"--random_seed"``, in its ``--help``.
+
+        The help text is read once per runner.
+        """
+
+        with self._help_lock:
+            if self._help_options is None:
+                completed = subprocess.run(
+                    [str(self._binary_path), "--help"],
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True,
+                    text=True,
+                    errors="replace",
+                    timeout=60,
+                    check=False,
+                )
+                self._help_options = frozenset(re.findall(r"--\w+", completed.stdout))
+        return flag in self._help_options
+
+    def _cache_key(self, argv: Sequence[str]) -> str | None:
+        if self._cache is None:
+            return None
+        return self._cache.key_for(self._binary_path, argv[3:])
+
+    @classmethod
+    def _linked_entries(cls) -> tuple[str, ...]:
+        """Top-level workdir entries that are links to shared data, not run outputs."""
+
+        return (*(name for name, _ in cls._STATIC_RESOURCES), STAGED_INPUTS_DIR)
+
+    @classmethod
+    def detach_resources(cls, workdir: os.PathLike[str] | str) -> None:
+        """Remove the ``library``/``wread``/``extbin`` entries and staged inputs from a workdir.
+
+        Call this before moving a workdir to long-term storage so only the
+        run's own files travel with it.
+        """
+
+        for name in cls._linked_entries():
+            entry = Path(workdir) / name
+            if entry.is_symlink() or entry.is_file():
+                entry.unlink()
+            elif entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+
+    @classmethod
+    def workdir_bytes(cls, workdir: os.PathLike[str] | str) -> int:
+        """Return the size of the run's own files in ``workdir``.
+
+        The linked ``library``/``wread``/``extbin`` entries and staged inputs
+        are not counted.
+        """
+
+        return directory_bytes(workdir, exclude=cls._linked_entries())
+
+    def _store_in_cache(self, key: str | None, result: UniDesignRunResult) -> None:
+        if key is not None and self._cache is not None:
+            self._cache.store(key, result, exclude=self._linked_entries())
+
     def run(
         self,
         args: Sequence[str] | None = None,
         *,
         env: Mapping[str, str] | None = None,
         persist_workdir: bool = False,
+        timeout: float | None = None,
     ) -> UniDesignRunResult:
-        """Invoke the UniDesign binary and capture its output."""
+        """Invoke the UniDesign binary and capture its output.
 
-        extra_args = tuple(args or ())
-        if any(arg.startswith("--prefix") for arg in extra_args):
-            raise ValueError("UniDesignRunner manages the --prefix argument automatically.")
+        A process still running after ``timeout`` seconds (by default the
+        limit of the enclosing :func:`run_timeout`, if any) is killed and
+        :class:`~unidesign.exceptions.UniDesignTimeoutError` is raised. A run
+        that fails with any exception removes its workdir even when
+        ``persist_workdir`` is set.
+        """
 
-        prefix = f"unidesign_{uuid.uuid4().hex}"
-        tmp_mgr, workdir = self._prepare_workdir(persist_workdir)
+        if timeout is None:
+            timeout = _RUN_TIMEOUT.get()
+        with self._tracer.span("runner.run") as span:
+            argv, prefix, tmp_mgr, workdir = self._start(args, persist_workdir)
+            try:
+                self._describe_run(span, argv, prefix)
+                return self._run_started(argv, prefix, workdir, env, span, timeout)
+            except BaseException:
+                if persist_workdir:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                raise
+            finally:
+                if not persist_workdir:
+                    with self._tracer.span("runner.workdir.cleanup"):
+                        tmp_mgr.cleanup()
+
+    def _describe_run(self, span: Any, argv: Sequence[str], prefix: str) -> None:
+        if self._tracer.enabled:
+            span.set(
+                command=command_name(argv),
+                prefix=prefix,
+                config_hash=config_hash(argv[1:]),
+            )
+
+    def _run_started(
+        self,
+        argv: tuple[str, ...],
+        prefix: str,
+        workdir: Path,
+        env: Mapping[str, str] | None,
+        span: Any,
+        timeout: float | None = None,
+    ) -> UniDesignRunResult:
+        tracer = self._tracer
         prepared_env = self._prepare_environment(env)
+        cache_key = self._cache_key(argv)
+        if cache_key is not None:
+            with tracer.span("runner.cache.restore"):
+                cached = self._cache.restore(cache_key, workdir, prefix, argv[1:])
+            if cached is not None:
+                span.set(cache_hit=True)
+                return cached
+        with tracer.span("runner.subprocess") as process_span:
+            returncode, stdout, stderr, wall_time, usage = _run_measured(
+                argv, workdir, prepared_env, timeout
+            )
+            if tracer.enabled:
+                process_span.set(
+                    returncode=returncode,
+                    stdout_bytes=len(stdout.encode("utf-8")),
+                    stderr_bytes=len(stderr.encode("utf-8")),
+                )
+        with tracer.span("runner.workdir.measure") as measure_span:
+            workdir_bytes = self.workdir_bytes(workdir)
+            measure_span.set(workdir_bytes=workdir_bytes)
+        if usage is not None:
+            resources = RunResources.from_rusage(wall_time, usage, workdir_bytes)
+        else:
+            resources = RunResources(wall_time=wall_time, workdir_bytes=workdir_bytes)
+        self._observe_workdir(workdir, resources)
+        result = UniDesignRunResult(
+            args=argv[1:],
+            returncode=returncode,
+            stdout=stdout,
+            stderr=stderr,
+            workdir=workdir,
+            prefix=prefix,
+            resources=resources,
+        )
+        if cache_key is not None:
+            with tracer.span("runner.cache.store"):
+                self._store_in_cache(cache_key, result)
+        return result
 
-        try:
-            argv = (str(self._binary_path), "--prefix", prefix, *extra_args)
-            completed = subprocess.run(
-                argv,
-                cwd=str(workdir),
-                env=prepared_env,
-                check=False,
-                capture_output=True,
-                text=True,
+    def stream_async(
+        self,
+        args: Sequence[str] | None = None,
+        *,
+        env: Mapping[str, str] | None = None,
+        persist_workdir: bool = False,
+        capture_stdout: bool = True,
+    ) -> UniDesignRunStream:
+        """Prepare an asyncio execution whose standard output can be iterated line by line.
+
+        The process starts on first iteration (or on :meth:`UniDesignRunStream.wait`).
+        Use the returned object as an async context manager so the child is
+        terminated and the workdir released if the consumer stops early.
+        """
+
+        argv, prefix, tmp_mgr, workdir = self._start(args, persist_workdir)
+        return UniDesignRunStream(
+            argv=argv,
+            prefix=prefix,
+            tmp_mgr=tmp_mgr,
+            workdir=workdir,
+            env=self._prepare_environment(env),
+            persist_workdir=persist_workdir,
+            capture_stdout=capture_stdout,
+        )
+
+    async def run_async(
+        self,
+        args: Sequence[str] | None = None,
+        *,
+        env: Mapping[str, str] | None = None,
+        persist_workdir: bool = False,
+        on_stdout_line: Callable[[str], None] | None = None,
+        timeout: float | None = None,
+    ) -> UniDesignRunResult:
+        """Asyncio counterpart of :meth:`run` built on ``asyncio.create_subprocess_exec``."""
+
+        if timeout is None:
+            timeout = _RUN_TIMEOUT.get()
+        tracer = self._tracer
+        with tracer.span("runner.run") as span:
+            async with self.stream_async(
+                args, env=env, persist_workdir=persist_workdir
+            ) as stream:
+                try:
+                    self._describe_run(span, stream.argv, stream.prefix)
+                    cache_key = self._cache_key(stream.argv)
+                    if cache_key is not None:
+                        with tracer.span("runner.cache.restore"):
+                            cached = self._cache.restore(
+                                cache_key, stream.workdir, stream.prefix, stream.argv[1:]
+                            )
+                        if cached is not None:
+                            span.set(cache_hit=True)
+                            if on_stdout_line is not None:
+                                for line in cached.stdout.splitlines():
+                                    on_stdout_line(line)
+                            stream.close()
+                            return cached
+                    with tracer.span("runner.subprocess") as process_span:
+                        try:
+                            async with asyncio.timeout(timeout):
+                                async for line in stream:
+                                    if on_stdout_line is not None:
+                                        on_stdout_line(line)
+                                # Keep the workdir until the cache has copied its outputs.
+                                result = await stream.wait(release=False)
+                        except TimeoutError:
+                            raise _timeout_error(stream.argv, timeout) from None
+                        self._observe_workdir(result.workdir, result.resources)
+                        if tracer.enabled:
+                            process_span.set(
+                                returncode=result.returncode,
+                                stdout_bytes=len(result.stdout.encode("utf-8")),
+                                stderr_bytes=len(result.stderr.encode("utf-8")),
+                            )
+                    if cache_key is not None:
+                        with tracer.span("runner.cache.store"):
+                            self._store_in_cache(cache_key, result)
+                    return result
+                except BaseException:
+                    if persist_workdir:
+                        shutil.rmtree(stream.workdir, ignore_errors=True)
+                    raise
+
+
+class UniDesignRunStream:
+    """Asynchronous UniDesign execution with line-by-line access to standard output."""
+
+    _LINE_LIMIT = 1 << 20
+
+    def __init__(
+        self,
+        *,
+        argv: tuple[str, ...],
+        prefix: str,
+        tmp_mgr: TemporaryDirectory | PooledWorkdir | TmpfsWorkdir,
+        workdir: Path,
+        env: Mapping[str, str],
+        persist_workdir: bool,
+        capture_stdout: bool,
+    ) -> None:
+        self._argv = argv
+        self._prefix = prefix
+        self._tmp_mgr = tmp_mgr
+        self._workdir = workdir
+        self._env = env
+        self._persist_workdir = persist_workdir
+        self._capture_stdout = capture_stdout
+        self._process: asyncio.subprocess.Process | None = None
+        self._stderr_task: asyncio.Task[bytes] | None = None
+        self._stdout_parts: list[str] = []
+        self._result: UniDesignRunResult | None = None
+        self._started_at: float | None = None
+        self._released = False
+
+    @property
+    def argv(self) -> tuple[str, ...]:
+        return self._argv
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    @property
+    def workdir(self) -> Path:
+        return self._workdir
+
+    def close(self) -> None:
+        """Release the workdir of a stream that will never be started or has finished."""
+
+        if self._process is None or self._result is not None:
+            self._release()
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        if self._process is None:
+            self._started_at = time.perf_counter()
+            self._process = await asyncio.create_subprocess_exec(
+                *self._argv,
+                cwd=str(self._workdir),
+                env=dict(self._env),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=self._LINE_LIMIT,
             )
-            return UniDesignRunResult(
-                args=argv[1:],
-                returncode=completed.returncode,
-                stdout=completed.stdout,
-                stderr=completed.stderr,
-                workdir=workdir,
-                prefix=prefix,
+            assert self._process.stderr is not None
+            self._stderr_task = asyncio.ensure_future(self._process.stderr.read())
+        return self._process
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._lines()
+
+    async def _lines(self) -> AsyncIterator[str]:
+        process = await self._ensure_started()
+        assert process.stdout is not None
+        async for raw in process.stdout:
+            line = raw.decode("utf-8", errors="replace")
+            if self._capture_stdout:
+                self._stdout_parts.append(line)
+            yield line.rstrip("\r\n")
+
+    async def wait(self, *, release: bool = True) -> UniDesignRunResult:
+        """Drain remaining output, wait for the process, and return its result.
+
+        With ``release=False`` the workdir outlives a successful wait until
+        :meth:`close` or the end of the ``async with`` block.
+        """
+
+        if self._result is not None:
+            return self._result
+        try:
+            process = await self._ensure_started()
+            async for _ in self._lines():
+                pass
+            returncode = await process.wait()
+            assert self._stderr_task is not None and self._started_at is not None
+            stderr = (await self._stderr_task).decode("utf-8", errors="replace")
+            wall_time = time.perf_counter() - self._started_at
+            self._result = UniDesignRunResult(
+                args=self._argv[1:],
+                returncode=returncode,
+                stdout="".join(self._stdout_parts),
+                stderr=stderr,
+                workdir=self._workdir,
+                prefix=self._prefix,
+                resources=RunResources(
+                    wall_time=wall_time,
+                    workdir_bytes=UniDesignRunner.workdir_bytes(self._workdir),
+                ),
             )
+            return self._result
         finally:
-            if not persist_workdir:
-                tmp_mgr.cleanup()
+            if release or self._result is None:
+                self._release()
+
+    def _release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if not self._persist_workdir:
+            self._tmp_mgr.cleanup()
+
+    async def __aenter__(self) -> UniDesignRunStream:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._result is not None:
+            self._release()
+            return
+        process = self._process
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+        if self._stderr_task is not None and not self._stderr_task.done():
+            self._stderr_task.cancel()
+        self._release()
 
 
-__all__ = ["UniDesignRunner", "UniDesignRunResult"]
+__all__ = [
+    "RelocationStrategy",
+    "UniDesignRunner",
+    "UniDesignRunResult",
+    "UniDesignRunStream",
+    "run_timeout",
+]
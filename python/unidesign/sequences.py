@@ -0,0 +1,316 @@
+"""Streaming parsers and compact storage for designed sequence files."""
+
+from __future__ import annotations
+
+import os
+import re
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+ENERGY_COLUMNS: tuple[str, ...] = ("total", "evolution", "physics", "binding")
+"""Energy columns written by ``SequenceWriteDesignFasta``, in file order."""
+
+_TRAJECTORY_DIGITS = re.compile(r"(\d+)$")
+
+
+@dataclass(slots=True)
+class SequenceRecord:
+    """One sequence line of a ``_bestseqs.txt`` / ``_desseqs`` file."""
+
+    sequence: str
+    """One-letter sequence of the designed chains, separated by ``;``."""
+
+    trajectory: int
+    """Index of the independent design trajectory, or ``-1`` when unknown."""
+
+    recovery: float
+    """Fraction of designable positions that kept the native amino acid."""
+
+    total: float
+    """Weighted total energy."""
+
+    evolution: float = float("nan")
+    """Unweighted evolutionary energy."""
+
+    physics: float = float("nan")
+    """Unweighted physical energy without binding."""
+
+    binding: float = float("nan")
+    """Unweighted binding energy."""
+
+    unsatisfied_constraints: int = 0
+    """Number of unsatisfied catalytic constraints (``0`` outside enzyme design)."""
+
+
+def _parse_trajectory(field: str) -> int:
+    match = _TRAJECTORY_DIGITS.search(field)
+    return int(match.group(1)) if match is not None else -1
+
+
+def _parse_line(line: str) -> SequenceRecord | None:
+    fields = line.split()
+    if len(fields) < 4 or fields[0].startswith("#"):
+        return None
+    try:
+        numbers = [float(value) for value in fields[2:7]]
+        unsatisfied = int(fields[7]) if len(fields) > 7 else 0
+    except ValueError:
+        return None
+    numbers.extend([float("nan")] * (5 - len(numbers)))
+    recovery, total, evolution, physics, binding = numbers
+    return SequenceRecord(
+        sequence=fields[0],
+        trajectory=_parse_trajectory(fields[1]),
+        recovery=recovery,
+        total=total,
+        evolution=evolution,
+        physics=physics,
+        binding=binding,
+        unsatisfied_constraints=unsatisfied,
+    )
+
+
+def iter_sequence_records(source: os.PathLike[str] | str | IO[str]) -> Iterator[SequenceRecord]:
+    """Yield the records of a sequence file one line at a time.
+
+    ``source`` may be a path or an open text handle. Comment lines, blank
+    lines and lines that do not carry at least a sequence, trajectory,
+    recovery and total energy are skipped.
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        with Path(source).open("r", encoding="utf-8") as handle:
+            yield from iter_sequence_records(handle)
+        return
+    for line in source:
+        record = _parse_line(line)
+        if record is not None:
+            yield record
+
+
+def _npz_path(path: os.PathLike[str] | str) -> Path:
+    path = Path(path)
+    return path if path.suffix == ".npz" else path.with_name(path.name + ".npz")
+
+
+class SequenceStore:
+    """Column-oriented store of many designed sequences.
+
+    Residues are kept as ASCII codes in one contiguous ``uint8`` buffer
+    indexed by ``offsets``, with energies, recoveries and trajectory indices
+    in parallel arrays, so millions of sequences cost a few bytes per residue
+    instead of one Python string each.
+    """
+
+    __slots__ = ("buffer", "offsets", "trajectories", "recovery", "energies", "unsatisfied")
+
+    def __init__(
+        self,
+        buffer: np.ndarray,
+        offsets: np.ndarray,
+        trajectories: np.ndarray,
+        recovery: np.ndarray,
+        energies: np.ndarray,
+        unsatisfied: np.ndarray,
+    ) -> None:
+        self.buffer = np.asarray(buffer, dtype=np.uint8)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.trajectories = np.asarray(trajectories, dtype=np.int32)
+        self.recovery = np.asarray(recovery, dtype=np.float64)
+        self.energies = np.asarray(energies, dtype=np.float64).reshape(-1, len(ENERGY_COLUMNS))
+        self.unsatisfied = np.asarray(unsatisfied, dtype=np.int32)
+        count = self.offsets.shape[0] - 1
+        if count < 0 or self.offsets[-1] != self.buffer.shape[0]:
+            raise ValueError("offsets must delimit the residue buffer")
+        if not (
+            self.trajectories.shape[0]
+            == self.recovery.shape[0]
+            == self.energies.shape[0]
+            == self.unsatisfied.shape[0]
+            == count
+        ):
+            raise ValueError("per-sequence arrays must have one entry per sequence")
+
+    @classmethod
+    def from_records(cls, records: Iterable[SequenceRecord]) -> SequenceStore:
+        """Pack ``records`` into a store, consuming them lazily."""
+
+        residues = bytearray()
+        offsets = array("q", [0])
+        trajectories = array("i")
+        recovery = array("d")
+        energies = array("d")
+        unsatisfied = array("i")
+        for record in records:
+            residues += record.sequence.encode("ascii")
+            offsets.append(len(residues))
+            trajectories.append(record.trajectory)
+            recovery.append(record.recovery)
+            energies.extend((record.total, record.evolution, record.physics, record.binding))
+            unsatisfied.append(record.unsatisfied_constraints)
+        return cls(
+            np.frombuffer(bytes(residues), dtype=np.uint8),
+            np.frombuffer(offsets, dtype=np.int64),
+            np.frombuffer(trajectories, dtype=np.int32),
+            np.frombuffer(recovery, dtype=np.float64),
+            np.frombuffer(energies, dtype=np.float64),
+            np.frombuffer(unsatisfied, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_file(cls, source: os.PathLike[str] | str | IO[str]) -> SequenceStore:
+        """Stream a sequence file straight into a store."""
+
+        return cls.from_records(iter_sequence_records(source))
+
+    def __len__(self) -> int:
+        return self.offsets.shape[0] - 1
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Weighted total energy of every sequence."""
+
+        return self.energies[:, 0]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return one of :data:`ENERGY_COLUMNS` for every sequence."""
+
+        return self.energies[:, ENERGY_COLUMNS.index(name)]
+
+    def sequence(self, index: int) -> str:
+        """Decode the sequence stored at ``index``."""
+
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.buffer[start:stop].tobytes().decode("ascii")
+
+    def __getitem__(self, index: int) -> SequenceRecord:
+        total, evolution, physics, binding = self.energies[index].tolist()
+        return SequenceRecord(
+            sequence=self.sequence(index),
+            trajectory=int(self.trajectories[index]),
+            recovery=float(self.recovery[index]),
+            total=total,
+            evolution=evolution,
+            physics=physics,
+            binding=binding,
+            unsatisfied_constraints=int(self.unsatisfied[index]),
+        )
+
+    def __iter__(self) -> Iterator[SequenceRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def residue_matrix(self) -> np.ndarray:
+        """Return an ``(n, max_length)`` ``uint8`` matrix, zero-padded on the right."""
+
+        lengths = self.lengths
+        width = int(lengths.max()) if lengths.size else 0
+        if lengths.size and np.all(lengths == width):
+            return self.buffer.reshape(len(self), width)
+        matrix = np.zeros((len(self), width), dtype=np.uint8)
+        columns = np.arange(self.buffer.shape[0]) - np.repeat(self.offsets[:-1], lengths)
+        matrix[np.repeat(np.arange(len(self)), lengths), columns] = self.buffer
+        return matrix
+
+    def select(self, rows: np.ndarray | Sequence[int]) -> SequenceStore:
+        """Return a new store holding the rows picked by an index array or boolean mask."""
+
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        lengths = self.lengths[rows]
+        offsets = np.zeros(rows.shape[0] + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if rows.size:
+            gather = np.repeat(self.offsets[rows] - offsets[:-1], lengths) + np.arange(offsets[-1])
+            buffer = self.buffer[gather]
+        else:
+            buffer = np.empty(0, dtype=np.uint8)
+        return SequenceStore(
+            buffer,
+            offsets,
+            self.trajectories[rows],
+            self.recovery[rows],
+            self.energies[rows],
+            self.unsatisfied[rows],
+        )
+
+    def rank(self, column: str = "total") -> np.ndarray:
+        """Return row indices ordered by ``column``, lowest energy first."""
+
+        return np.argsort(self.column(column), kind="stable")
+
+    def top_k(self, k: int, column: str = "total") -> np.ndarray:
+        """Return the indices of the ``k`` lowest values of ``column``, sorted."""
+
+        values = self.column(column)
+        k = min(k, values.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        candidates = np.argpartition(values, k - 1)[:k]
+        return candidates[np.argsort(values[candidates], kind="stable")]
+
+    def unique(self, column: str = "total") -> tuple[SequenceStore, np.ndarray]:
+        """Collapse identical sequences, keeping the lowest-energy occurrence of each.
+
+        Returns the deduplicated store (ordered by ``column``) together with how
+        many times each of its sequences occurred.
+        """
+
+        if len(self) == 0:
+            return self, np.empty(0, dtype=np.intp)
+        order = self.rank(column)
+        matrix = np.ascontiguousarray(self.residue_matrix()[order])
+        keys = matrix.view(np.dtype((np.void, matrix.shape[1]))).ravel()
+        _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        keep = np.argsort(first, kind="stable")
+        return self.select(order[first[keep]]), counts[keep]
+
+    def save(self, path: os.PathLike[str] | str) -> Path:
+        """Persist the store to a ``.npz`` archive and return the file written.
+
+        Like :func:`numpy.savez`, a ``.npz`` suffix is appended when missing.
+        """
+
+        path = _npz_path(path)
+        np.savez(
+            path,
+            buffer=self.buffer,
+            offsets=self.offsets,
+            trajectories=self.trajectories,
+            recovery=self.recovery,
+            energies=self.energies,
+            unsatisfied=self.unsatisfied,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: os.PathLike[str] | str) -> SequenceStore:
+        """Load a store written by :meth:`save`, from the same ``path`` it was given."""
+
+        with np.load(_npz_path(path), allow_pickle=False) as data:
+            return cls(
+                data["buffer"],
+                data["offsets"],
+                data["trajectories"],
+                data["recovery"],
+                data["energies"],
+                data["unsatisfied"],
+            )
+
+
+__all__ = [
+    "ENERGY_COLUMNS",
+    "SequenceRecord",
+    "SequenceStore",
+    "iter_sequence_records",
+]
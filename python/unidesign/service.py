@@ -0,0 +1,536 @@
+"""Long-lived local job service and its client.
+
+``python -m unidesign.service`` keeps one :class:`~unidesign.runner.UniDesignRunner`
+with a pool of pre-warmed workdirs and a worker pool alive, and accepts
+configurations serialised with :func:`~unidesign.config.config_to_dict` over
+loopback HTTP or a Unix socket. Orchestration code then pays the interpreter
+start-up, imports and workdir setup once per service instead of once per job.
+
+Endpoints
+---------
+``GET /health``
+    Worker count, job counters and idle workdirs as JSON.
+``POST /run``
+    ``{"config": ..., "env": {...}, "keep_workdir": false}``; responds with one
+    serialised :class:`~unidesign.runner.UniDesignRunResult`.
+``POST /batch``
+    ``{"configs": [...], "env": {...}, "keep_workdir": false}``; streams one
+    JSON line per configuration, ``{"index": i, "result": ...}`` or
+    ``{"index": i, "error": "..."}``, in completion order.
+
+With ``keep_workdir`` the run's workdir is left in place and its path returned
+so the client can collect artifacts; the client then owns the directory.
+``env`` may only set the variables in :data:`CLIENT_ENV_ALLOWLIST`; a request
+naming any other (``LD_PRELOAD``, ``PATH``, ...) is rejected with status 400,
+because it would otherwise run code of the client's choosing in the service.
+
+The service listens on loopback unless started with ``--allow-remote``, and a
+Unix socket is created with mode ``0600`` so only its owner can connect.
+
+The service resolves relative paths against its own working directory, so
+:class:`UniDesignServiceClient` makes the relative input paths of each
+configuration absolute with :func:`~unidesign.inputs.resolve_config_paths`
+before sending it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import ipaddress
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
+from urllib.parse import urlsplit
+
+from .batch import BatchOutcome, default_worker_count
+from .config import CommandConfig, config_from_dict, config_to_dict
+from .exceptions import UniDesignError
+from .inputs import InputCache, resolve_config_paths
+from .paths import discover_binary
+from .resources import RunResources
+from .runner import UniDesignRunner, UniDesignRunResult
+from .workdirs import TmpfsWorkdirs
+
+
+CLIENT_ENV_ALLOWLIST: frozenset[str] = frozenset(
+    {"OMP_NUM_THREADS", "OMP_PROC_BIND", "OMP_PLACES", "OMP_WAIT_POLICY"}
+)
+"""Environment variables a service client may set for its runs."""
+
+
+def result_to_dict(result: UniDesignRunResult) -> dict[str, Any]:
+    """Serialise a run result as a JSON-compatible mapping."""
+
+    return {
+        "args": list(result.args),
+        "returncode": result.returncode,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "workdir": str(result.workdir),
+        "prefix": result.prefix,
+        "resources": None if result.resources is None else asdict(result.resources),
+    }
+
+
+def result_from_dict(document: Mapping[str, Any]) -> UniDesignRunResult:
+    """Rebuild a run result serialised by :func:`result_to_dict`."""
+
+    resources = document.get("resources")
+    return UniDesignRunResult(
+        args=tuple(document["args"]),
+        returncode=int(document["returncode"]),
+        stdout=document["stdout"],
+        stderr=document["stderr"],
+        workdir=Path(document["workdir"]),
+        prefix=document["prefix"],
+        resources=None if resources is None else RunResources(**resources),
+    )
+
+
+class UniDesignService:
+    """Schedule serialised configurations on a shared runner and worker pool."""
+
+    def __init__(
+        self,
+        runner: UniDesignRunner,
+        *,
+        max_workers: int | None = None,
+    ) -> None:
+        workers = max_workers if max_workers is not None else default_worker_count()
+        if workers <= 0:
+            raise ValueError("max_workers must be positive")
+        self._runner = runner
+        self._workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="unidesign_service"
+        )
+        self._lock = threading.Lock()
+        self._counters = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+
+    @property
+    def runner(self) -> UniDesignRunner:
+        return self._runner
+
+    def _count(self, **changes: int) -> None:
+        with self._lock:
+            for name, delta in changes.items():
+                self._counters[name] += delta
+
+    def _execute(
+        self, config: CommandConfig, env: Mapping[str, str] | None, keep_workdir: bool
+    ) -> UniDesignRunResult:
+        self._count(queued=-1, running=1)
+        try:
+            result = self._runner.run(
+                config.to_cli_args(), env=env, persist_workdir=keep_workdir
+            )
+        except BaseException:
+            self._count(running=-1, failed=1)
+            raise
+        self._count(running=-1, completed=1)
+        return result
+
+    def submit(
+        self,
+        config: CommandConfig,
+        *,
+        env: Mapping[str, str] | None = None,
+        keep_workdir: bool = False,
+    ) -> Future[UniDesignRunResult]:
+        """Queue one configuration on the worker pool."""
+
+        self._count(queued=1)
+        return self._executor.submit(self._execute, config, env, keep_workdir)
+
+    def map(
+        self,
+        configs: Iterable[CommandConfig],
+        *,
+        env: Mapping[str, str] | None = None,
+        keep_workdir: bool = False,
+    ) -> Iterator[BatchOutcome[UniDesignRunResult]]:
+        """Run ``configs`` and yield outcomes as they complete.
+
+        At most twice the worker count is queued ahead of completion, so
+        concurrent batches share the workers fairly. Closing the iterator
+        early cancels the configurations that have not started.
+        """
+
+        iterator = enumerate(configs)
+        in_flight: dict[Future, tuple[int, CommandConfig]] = {}
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < 2 * self._workers:
+                    try:
+                        index, config = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = self.submit(config, env=env, keep_workdir=keep_workdir)
+                    in_flight[future] = (index, config)
+                if not in_flight:
+                    return
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, config = in_flight.pop(future)
+                    error = future.exception()
+                    yield BatchOutcome(
+                        index=index,
+                        config=config,
+                        result=None if error is not None else future.result(),
+                        error=error,
+                    )
+        finally:
+            for future in in_flight:
+                if future.cancel():
+                    self._count(queued=-1)
+
+    def health(self) -> dict[str, Any]:
+        """Return the worker count, job counters and idle workdirs."""
+
+        pool = self._runner.workdir_pool
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "workers": self._workers,
+            **counters,
+            "idle_workdirs": 0 if pool is None else pool.idle,
+        }
+
+    def make_server(
+        self, address: tuple[str, int] | os.PathLike[str] | str
+    ) -> socketserver.BaseServer:
+        """Bind an HTTP server to a ``(host, port)`` pair or a Unix socket path."""
+
+        handler = type("_Handler", (_ServiceHandler,), {"service": self})
+        if isinstance(address, tuple):
+            return ThreadingHTTPServer(address, handler)
+        path = Path(address)
+        if path.is_socket():
+            path.unlink()
+        return _UnixHTTPServer(str(path), handler)
+
+    def close(self) -> None:
+        """Stop accepting work, wait for running jobs and release the runner's workdirs."""
+
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._runner.close()
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        # bind() creates the socket file with the umask's permissions; narrow
+        # it so the file is never reachable by other users, even briefly.
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, 0o600)
+
+
+def _error_message(error: BaseException) -> str:
+    return str(error) or repr(error)
+
+
+def _client_env(value: Any) -> dict[str, str] | None:
+    """Validate the ``env`` of a request against :data:`CLIENT_ENV_ALLOWLIST`."""
+
+    if value is None:
+        return None
+    if not isinstance(value, dict) or not all(
+        isinstance(name, str) and isinstance(setting, str) for name, setting in value.items()
+    ):
+        raise ValueError("env must map variable names to strings")
+    refused = sorted(set(value) - CLIENT_ENV_ALLOWLIST)
+    if refused:
+        allowed = ", ".join(sorted(CLIENT_ENV_ALLOWLIST))
+        raise ValueError(f"env may not set {', '.join(refused)}; allowed: {allowed}")
+    return value
+
+
+def _is_loopback(host: str) -> bool:
+    """Whether every address ``host`` resolves to is a loopback address."""
+
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except socket.gaierror:
+        return False
+    return bool(infos) and all(
+        ipaddress.ip_address(info[4][0].split("%")[0]).is_loopback for info in infos
+    )
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    service: UniDesignService
+    server_version = "UniDesignService"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+    def _send_json(self, status: int, document: Any) -> None:
+        body = json.dumps(document).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_request(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        document = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(document, dict):
+            raise ValueError("request body must be a JSON object")
+        return document
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, self.service.health())
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path not in ("/run", "/batch"):
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            request = self._read_request()
+            env = _client_env(request.get("env"))
+            keep_workdir = bool(request.get("keep_workdir", False))
+            if self.path == "/run":
+                configs = [config_from_dict(request["config"])]
+            else:
+                configs = [config_from_dict(entry) for entry in request["configs"]]
+        except (KeyError, TypeError, ValueError) as exc:
+            self._send_json(400, {"error": _error_message(exc)})
+            return
+
+        if self.path == "/run":
+            try:
+                result = self.service.submit(
+                    configs[0], env=env, keep_workdir=keep_workdir
+                ).result()
+            except Exception as exc:  # noqa: BLE001 - reported to the client
+                self._send_json(500, {"error": _error_message(exc)})
+                return
+            self._send_json(200, result_to_dict(result))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        outcomes = self.service.map(configs, env=env, keep_workdir=keep_workdir)
+        try:
+            for outcome in outcomes:
+                line: dict[str, Any] = {"index": outcome.index}
+                if outcome.ok:
+                    line["result"] = result_to_dict(outcome.result)
+                else:
+                    line["error"] = _error_message(outcome.error)
+                self.wfile.write(json.dumps(line).encode("utf-8") + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            outcomes.close()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float | None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self._socket_path)
+        self.sock = sock
+
+
+class UniDesignServiceClient:
+    """Submit configurations to a running :class:`UniDesignService`.
+
+    ``address`` is an ``http://host:port`` URL, a ``unix:///path`` URL or the
+    path of a Unix socket.
+    """
+
+    def __init__(self, address: str | os.PathLike[str], *, timeout: float | None = None) -> None:
+        self._address = str(address)
+        self._timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        parts = urlsplit(self._address)
+        if parts.scheme == "http":
+            return http.client.HTTPConnection(
+                parts.hostname or "127.0.0.1", parts.port, timeout=self._timeout
+            )
+        path = parts.path if parts.scheme == "unix" else self._address
+        return _UnixHTTPConnection(path, self._timeout)
+
+    def _request(
+        self, method: str, path: str, body: Mapping[str, Any] | None = None
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        connection = self._connection()
+        payload = None if body is None else json.dumps(body).encode("utf-8")
+        headers = {} if payload is None else {"Content-Type": "application/json"}
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        if response.status != 200:
+            try:
+                message = json.loads(response.read()).get("error", response.reason)
+            except ValueError:
+                message = response.reason
+            connection.close()
+            raise UniDesignError(f"service returned {response.status}: {message}")
+        return connection, response
+
+    def health(self) -> dict[str, Any]:
+        connection, response = self._request("GET", "/health")
+        try:
+            return json.loads(response.read())
+        finally:
+            connection.close()
+
+    def run(
+        self,
+        config: CommandConfig,
+        *,
+        env: Mapping[str, str] | None = None,
+        keep_workdir: bool = False,
+    ) -> UniDesignRunResult:
+        """Run one configuration on the service and return its result."""
+
+        body = {
+            "config": config_to_dict(resolve_config_paths(config)),
+            "env": env,
+            "keep_workdir": keep_workdir,
+        }
+        connection, response = self._request("POST", "/run", body)
+        try:
+            return result_from_dict(json.loads(response.read()))
+        finally:
+            connection.close()
+
+    def map(
+        self,
+        configs: Iterable[CommandConfig],
+        *,
+        env: Mapping[str, str] | None = None,
+        keep_workdir: bool = False,
+    ) -> Iterator[BatchOutcome[UniDesignRunResult]]:
+        """Run ``configs`` on the service and yield outcomes as they complete."""
+
+        configs = list(configs)
+        body = {
+            "configs": [config_to_dict(resolve_config_paths(config)) for config in configs],
+            "env": env,
+            "keep_workdir": keep_workdir,
+        }
+        connection, response = self._request("POST", "/batch", body)
+        try:
+            for raw in response:
+                line = json.loads(raw)
+                index = line["index"]
+                error = line.get("error")
+                yield BatchOutcome(
+                    index=index,
+                    config=configs[index],
+                    result=None if error is not None else result_from_dict(line["result"]),
+                    error=None if error is None else UniDesignError(error),
+                )
+        finally:
+            connection.close()
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m unidesign.service",
+        description="Serve UniDesign jobs from one long-lived process.",
+    )
+    parser.add_argument("--binary", type=Path, help="UniDesign executable")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--socket", type=Path, help="listen on this Unix socket")
+    target.add_argument("--port", type=int, default=0, help="loopback TCP port (0 picks one)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind with --port")
+    parser.add_argument(
+        "--allow-remote",
+        action="store_true",
+        help="permit a --host that is not a loopback address (the service is unauthenticated)",
+    )
+    parser.add_argument("--workers", type=int, help="concurrent UniDesign processes")
+    parser.add_argument(
+        "--prewarm", type=int, help="idle workdirs to keep ready (default: twice --workers)"
+    )
+    parser.add_argument("--workdir-base", type=Path, help="parent directory for workdirs")
+    parser.add_argument(
+        "--input-cache", type=Path, help="node-local directory to stage input files through"
+    )
+    parser.add_argument(
+        "--tmpfs", type=Path, help="RAM-backed directory for workdirs while memory allows"
+    )
+    args = parser.parse_args(argv)
+    if args.socket is None and not args.allow_remote and not _is_loopback(args.host):
+        parser.error(f"--host {args.host} is not a loopback address; pass --allow-remote")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point; serves until interrupted."""
+
+    args = _parse_args(argv)
+    workers = args.workers if args.workers is not None else default_worker_count()
+    runner = UniDesignRunner(
+        args.binary or discover_binary(),
+        base_working_dir=args.workdir_base,
+        prewarmed_workdirs=args.prewarm if args.prewarm is not None else 2 * workers,
+        input_cache=InputCache(args.input_cache) if args.input_cache is not None else None,
+        tmpfs_workdirs=TmpfsWorkdirs(args.tmpfs) if args.tmpfs is not None else None,
+    )
+    if runner.workdir_pool is not None:
+        runner.workdir_pool.warm()
+    service = UniDesignService(runner, max_workers=workers)
+    server = service.make_server(args.socket or (args.host, args.port))
+    if args.socket:
+        print(f"unix://{args.socket.resolve()}", flush=True)
+    else:
+        host, port = server.server_address[:2]
+        print(f"http://{host}:{port}", flush=True)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket:
+            args.socket.unlink(missing_ok=True)
+    return 0
+
+
+__all__ = [
+    "CLIENT_ENV_ALLOWLIST",
+    "UniDesignService",
+    "UniDesignServiceClient",
+    "main",
+    "result_from_dict",
+    "result_to_dict",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
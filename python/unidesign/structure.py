@@ -0,0 +1,198 @@
+"""Fixed-column PDB reader producing NumPy structured atom arrays."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+ATOM_DTYPE = np.dtype(
+    [
+        ("hetero", np.bool_),
+        ("serial", np.int32),
+        ("name", "S4"),
+        ("resname", "S3"),
+        ("chain", "S1"),
+        ("resseq", np.int32),
+        ("icode", "S1"),
+        ("xyz", np.float64, (3,)),
+        ("element", "S2"),
+    ]
+)
+"""Layout of the arrays returned by :func:`parse_pdb_atoms`."""
+
+SIDECAR_SUFFIX = ".atoms.npy"
+"""Suffix appended to a PDB file name for its cached atom array."""
+
+_LINE_WIDTH = 80
+
+_HYBRID36_UPPER = frozenset("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_HYBRID36_LOWER = frozenset("0123456789abcdefghijklmnopqrstuvwxyz")
+
+
+def _columns(matrix: np.ndarray, start: int, stop: int) -> np.ndarray:
+    width = stop - start
+    return np.ascontiguousarray(matrix[:, start:stop]).view(f"S{width}").ravel()
+
+
+def _hybrid36(text: str, width: int) -> int:
+    """Decode one hybrid-36 field of ``width`` characters; ``-1`` if it is not one.
+
+    Decimal values come first, then ``A000..ZZZZ`` and ``a000..zzzz`` continue
+    the count, as written by programs that overflow the serial and residue
+    number columns. Overflow markers such as ``*****`` and blank fields are
+    not numbers.
+    """
+
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    if len(text) != width or not text[0].isalpha():
+        return -1
+    offset = 10 * 36 ** (width - 1)
+    if set(text) <= _HYBRID36_UPPER:
+        return int(text, 36) - offset + 10**width
+    if set(text) <= _HYBRID36_LOWER:
+        return int(text, 36) - offset + 10**width + 26 * 36 ** (width - 1)
+    return -1
+
+
+def _integers(field: np.ndarray) -> np.ndarray:
+    """Convert a fixed-width byte column to ``int32``, leniently.
+
+    The vectorised conversion handles plain decimal columns; only when it
+    fails are the distinct values decoded one by one with :func:`_hybrid36`.
+    """
+
+    try:
+        return field.astype(np.int32)
+    except ValueError:
+        pass
+    values, inverse = np.unique(field, return_inverse=True)
+    width = field.dtype.itemsize
+    decoded = np.array(
+        [_hybrid36(value.decode("ascii", "replace"), width) for value in values],
+        dtype=np.int32,
+    )
+    return decoded[inverse]
+
+
+def _record_matrix(data: bytes) -> np.ndarray:
+    """Return the first-model ``ATOM``/``HETATM`` lines as an ``(n, 80)`` byte matrix."""
+
+    raw = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(raw == ord("\n"))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [raw.shape[0]]))
+    keep = starts < raw.shape[0]
+    starts, ends = starts[keep], ends[keep]
+    padded = np.concatenate((raw, np.zeros(_LINE_WIDTH, dtype=np.uint8)))
+    ends = ends - ((ends > starts) & (padded[np.maximum(ends - 1, 0)] == ord("\r")))
+
+    heads = padded[starts[:, None] + np.arange(6)].view("S6").ravel()
+    model_ends = np.flatnonzero(heads == b"ENDMDL")
+    selected = (heads == b"ATOM  ") | (heads == b"HETATM")
+    if model_ends.size:
+        selected[model_ends[0] :] = False
+    starts, lengths = starts[selected], ends[selected] - starts[selected]
+
+    columns = np.arange(_LINE_WIDTH)
+    matrix = padded[starts[:, None] + columns]
+    matrix[columns >= lengths[:, None]] = ord(" ")
+    return matrix
+
+
+def parse_pdb_atoms(data: bytes) -> np.ndarray:
+    """Parse the ``ATOM``/``HETATM`` records of PDB text into an :data:`ATOM_DTYPE` array.
+
+    Line boundaries are located on the raw bytes, coordinate records are
+    gathered into an 80-column byte matrix and every field is sliced out of it
+    at once, so there is no per-line Python work. Only the first ``MODEL`` is
+    read. Serial and residue numbers in hybrid-36 are decoded; ones that are
+    not numbers at all (``*****``, blanks) become ``-1``.
+    """
+
+    matrix = _record_matrix(data)
+    atoms = np.empty(matrix.shape[0], dtype=ATOM_DTYPE)
+    if not atoms.size:
+        return atoms
+
+    atoms["hetero"] = matrix[:, 0] == ord("H")
+    atoms["serial"] = _integers(_columns(matrix, 6, 11))
+    atoms["name"] = np.char.strip(_columns(matrix, 12, 16))
+    atoms["resname"] = np.char.strip(_columns(matrix, 17, 20))
+    atoms["chain"] = _columns(matrix, 21, 22)
+    atoms["resseq"] = _integers(_columns(matrix, 22, 26))
+    atoms["icode"] = np.char.strip(_columns(matrix, 26, 27))
+    for axis, start in enumerate((30, 38, 46)):
+        atoms["xyz"][:, axis] = _columns(matrix, start, start + 8).astype(np.float64)
+    atoms["element"] = np.char.strip(_columns(matrix, 76, 78))
+    return atoms
+
+
+def sidecar_path(path: Path) -> Path:
+    """Return where the cached atom array of ``path`` is stored."""
+
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def _sidecar_is_fresh(path: Path, sidecar: Path) -> bool:
+    try:
+        return sidecar.stat().st_mtime_ns >= path.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def _write_sidecar(atoms: np.ndarray, sidecar: Path) -> bool:
+    try:
+        fd, temporary = tempfile.mkstemp(prefix=".atoms_", suffix=".npy", dir=sidecar.parent)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.save(handle, atoms, allow_pickle=False)
+        os.replace(temporary, sidecar)
+    except OSError:
+        Path(temporary).unlink(missing_ok=True)
+        return False
+    return True
+
+
+def load_atoms(path: os.PathLike[str] | str, *, cache: bool = True) -> np.ndarray:
+    """Return the atoms of the PDB file at ``path``.
+
+    With ``cache`` enabled the parsed array is written next to the file as a
+    ``.atoms.npy`` sidecar and later calls memory-map it read-only instead of
+    parsing again. The sidecar is ignored once the PDB file is newer than it,
+    and caching is skipped silently when the directory is not writable.
+    """
+
+    path = Path(path)
+    sidecar = sidecar_path(path)
+    if cache and _sidecar_is_fresh(path, sidecar):
+        try:
+            atoms = np.load(sidecar, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            pass
+        else:
+            if atoms.dtype == ATOM_DTYPE:
+                return atoms
+
+    atoms = parse_pdb_atoms(path.read_bytes())
+    if cache and atoms.size and _write_sidecar(atoms, sidecar):
+        return np.load(sidecar, mmap_mode="r", allow_pickle=False)
+    return atoms
+
+
+__all__ = [
+    "ATOM_DTYPE",
+    "SIDECAR_SUFFIX",
+    "load_atoms",
+    "parse_pdb_atoms",
+    "sidecar_path",
+]
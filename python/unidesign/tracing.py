@@ -0,0 +1,268 @@
+"""Span-based tracing of the phases of UniDesign runs and jobs.
+
+A :class:`~unidesign.runner.UniDesignRunner` created with a ``tracer`` reports
+the phases of every execution as nested spans: workdir creation, resource
+linking, cache lookups, the subprocess itself, workdir measurement and
+cleanup. Job wrappers add spans around the whole job and around artifact
+relocation. The default :data:`NOOP_TRACER` records nothing, and its spans
+cost one method call. Attributes that are expensive to compute (byte counts)
+are only gathered when :attr:`Tracer.enabled` is true.
+
+:class:`InMemoryTracer` collects finished spans for inspection and
+:func:`write_chrome_trace` exports them in the Chrome trace event format read
+by ``chrome://tracing`` and Perfetto.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed phase; times are :func:`time.perf_counter_ns` readings."""
+
+    name: str
+    """Phase name, such as ``"runner.subprocess"``."""
+
+    span_id: int
+    """Identifier unique within the tracer."""
+
+    parent_id: int | None
+    """Identifier of the enclosing span, or ``None`` for a root span."""
+
+    start_ns: int
+    """When the phase began."""
+
+    end_ns: int = 0
+    """When the phase ended (``0`` while it is still open)."""
+
+    thread_id: int = 0
+    """Native identifier of the thread that opened the span."""
+
+    attributes: dict[str, Any] = field(default_factory=dict)
+    """Free-form details such as the run prefix, config hash or byte counts."""
+
+    @property
+    def duration(self) -> float:
+        """Length of the phase in seconds."""
+
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, **attributes: Any) -> None:
+        """Attach or overwrite attributes."""
+
+        self.attributes.update(attributes)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set(self, **attributes: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Interface of span sinks; this base class records nothing.
+
+    Subclasses override :meth:`span` to return a context manager whose value
+    has a ``set(**attributes)`` method.
+    """
+
+    enabled: bool = False
+    """Whether spans are recorded; instrumented code skips costly attributes otherwise."""
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Return a context manager timing the phase ``name``."""
+
+        return _NOOP_SPAN
+
+
+NOOP_TRACER = Tracer()
+"""Tracer used when none is configured."""
+
+
+_CURRENT_SPAN: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "unidesign_current_span", default=None
+)
+
+
+class _RecordingSpan:
+    __slots__ = ("_tracer", "_span", "_token")
+
+    def __init__(self, tracer: InMemoryTracer, span: Span) -> None:
+        self._tracer = tracer
+        self._span = span
+        self._token: contextvars.Token | None = None
+
+    def __enter__(self) -> Span:
+        self._token = _CURRENT_SPAN.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._span.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self._span.attributes["error"] = exc_type.__name__
+        if self._token is not None:
+            _CURRENT_SPAN.reset(self._token)
+        self._tracer._finish(self._span)
+
+
+class InMemoryTracer(Tracer):
+    """Keep finished spans in memory.
+
+    Nesting follows :mod:`contextvars`, so spans opened in a thread or an
+    asyncio task attach to the span that was current there.
+    :class:`~unidesign.batch.UniDesignBatchRunner` runs each configuration in
+    a copy of the submitting thread's context, so the runs of a batch nest
+    under the span that was current when it was submitted. With
+    ``max_spans`` only the most recent spans are kept.
+    """
+
+    enabled = True
+
+    def __init__(self, *, max_spans: int | None = None) -> None:
+        if max_spans is not None and max_spans <= 0:
+            raise ValueError("max_spans must be positive")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self.dropped = 0
+        """Number of finished spans discarded because of ``max_spans``."""
+
+    def span(self, name: str, **attributes: Any) -> _RecordingSpan:
+        parent = _CURRENT_SPAN.get()
+        return _RecordingSpan(
+            self,
+            Span(
+                name=name,
+                span_id=next(self._ids),
+                parent_id=None if parent is None else parent.span_id,
+                start_ns=time.perf_counter_ns(),
+                thread_id=threading.get_native_id(),
+                attributes=attributes,
+            ),
+        )
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            if len(self._spans) == self._spans.maxlen:
+                self.dropped += 1
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> list[Span]:
+        """Finished spans in the order they ended."""
+
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __iter__(self) -> Iterator[Span]:
+        return iter(self.spans)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return ``{name: {count, total, mean, p50, p90, max}}`` of span durations in seconds.
+
+        Totals of nested spans overlap their parents, so compare spans at the
+        same depth to see where wall-clock time goes.
+        """
+
+        by_name: dict[str, list[int]] = {}
+        for span in self.spans:
+            by_name.setdefault(span.name, []).append(span.end_ns - span.start_ns)
+        summary: dict[str, dict[str, float]] = {}
+        for name, durations in sorted(by_name.items()):
+            values = np.asarray(durations, dtype=np.float64) / 1e9
+            p50, p90 = np.quantile(values, (0.5, 0.9))
+            summary[name] = {
+                "count": int(values.size),
+                "total": float(values.sum()),
+                "mean": float(values.mean()),
+                "p50": float(p50),
+                "p90": float(p90),
+                "max": float(values.max()),
+            }
+        return summary
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    return repr(value)
+
+
+def chrome_trace(spans: Iterable[Span]) -> dict[str, Any]:
+    """Return spans as a Chrome trace document of complete (``"X"``) events.
+
+    Timestamps are microseconds on the :func:`time.perf_counter_ns` clock and
+    each span is drawn on the row of the thread that opened it.
+    """
+
+    pid = os.getpid()
+    events = [
+        {
+            "name": span.name,
+            "cat": span.name.partition(".")[0],
+            "ph": "X",
+            "ts": span.start_ns / 1000,
+            "dur": (span.end_ns - span.start_ns) / 1000,
+            "pid": pid,
+            "tid": span.thread_id,
+            "args": {
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                **{key: _json_value(value) for key, value in span.attributes.items()},
+            },
+        }
+        for span in sorted(spans, key=lambda span: (span.start_ns, span.span_id))
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(spans: Iterable[Span], path: os.PathLike[str] | str) -> Path:
+    """Write :func:`chrome_trace` of ``spans`` to ``path`` and return it."""
+
+    path = Path(path)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(chrome_trace(spans), handle)
+    return path
+
+
+__all__ = [
+    "InMemoryTracer",
+    "NOOP_TRACER",
+    "Span",
+    "Tracer",
+    "chrome_trace",
+    "write_chrome_trace",
+]
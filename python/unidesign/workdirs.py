@@ -0,0 +1,352 @@
+"""Reusable and RAM-backed UniDesign working directories."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+class WorkdirPool:
+    """Keep pre-warmed working directories ready for :class:`~unidesign.runner.UniDesignRunner`.
+
+    Creating a workdir means a ``mkdtemp`` plus linking the ``library``,
+    ``wread`` and ``extbin`` resources, which a long-lived process only needs
+    to pay once per directory. Released workdirs are scrubbed down to the
+    entries named in ``keep`` and handed out again; workdirs that leave the
+    pool for good (persisted runs whose outputs are relocated) are replaced
+    by a background refill once fewer than half of ``size`` are idle.
+
+    Parameters
+    ----------
+    prepare:
+        Called on every new directory to populate it, e.g. with resource links.
+    keep:
+        Top-level names that :meth:`prepare` creates and scrubbing preserves.
+    size:
+        Number of idle workdirs to keep ready.
+    base_dir:
+        Parent directory for the workdirs (the system temp dir by default).
+    """
+
+    def __init__(
+        self,
+        prepare: Callable[[Path], None],
+        keep: Iterable[str],
+        *,
+        size: int,
+        base_dir: os.PathLike[str] | str | None = None,
+    ) -> None:
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self._prepare = prepare
+        self._keep = frozenset(keep)
+        self._size = size
+        self._base_dir = Path(base_dir) if base_dir is not None else None
+        self._idle: deque[Path] = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """Number of workdirs ready to be acquired."""
+
+        with self._lock:
+            return len(self._idle)
+
+    def _create(self) -> Path:
+        workdir = Path(
+            tempfile.mkdtemp(
+                prefix="unidesign_",
+                dir=str(self._base_dir) if self._base_dir is not None else None,
+            )
+        )
+        try:
+            self._prepare(workdir)
+        except BaseException:
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise
+        return workdir
+
+    def warm(self) -> int:
+        """Create workdirs until :attr:`size` are idle; returns how many were created."""
+
+        created = 0
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= self._size:
+                    return created
+            workdir = self._create()
+            with self._lock:
+                if self._closed or len(self._idle) >= self._size:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                    return created
+                self._idle.append(workdir)
+            created += 1
+
+    def _refill(self) -> None:
+        try:
+            self.warm()
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def acquire(self) -> Path:
+        """Return an idle workdir, creating one when none is ready."""
+
+        with self._lock:
+            workdir = self._idle.popleft() if self._idle else None
+            start_refill = (
+                not self._closed
+                and not self._refilling
+                and len(self._idle) < (self._size + 1) // 2
+            )
+            if start_refill:
+                self._refilling = True
+        if start_refill:
+            threading.Thread(
+                target=self._refill, name="unidesign_workdir_refill", daemon=True
+            ).start()
+        return workdir if workdir is not None else self._create()
+
+    def _scrub(self, workdir: Path) -> bool:
+        try:
+            with os.scandir(workdir) as entries:
+                for entry in entries:
+                    if entry.name in self._keep:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+        except OSError:
+            return False
+        return all((workdir / name).exists() for name in self._keep)
+
+    def release(self, workdir: os.PathLike[str] | str) -> None:
+        """Scrub ``workdir`` and return it to the pool, or delete it if the pool is full."""
+
+        workdir = Path(workdir)
+        reusable = self._scrub(workdir)
+        with self._lock:
+            if reusable and not self._closed and len(self._idle) < self._size:
+                self._idle.append(workdir)
+                return
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    def close(self) -> None:
+        """Delete every idle workdir; later releases delete their workdir."""
+
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for workdir in idle:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def __enter__(self) -> WorkdirPool:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class PooledWorkdir:
+    """Workdir handle with the ``name``/``cleanup()`` interface of ``TemporaryDirectory``."""
+
+    __slots__ = ("name", "_pool", "_persist")
+
+    def __init__(self, pool: WorkdirPool, workdir: Path, *, persist: bool) -> None:
+        self.name = str(workdir)
+        self._pool: WorkdirPool | None = pool
+        self._persist = persist
+
+    def cleanup(self) -> None:
+        """Return the workdir to its pool unless the run asked to keep it."""
+
+        pool, self._pool = self._pool, None
+        if pool is not None and not self._persist:
+            pool.release(self.name)
+
+
+def _available_memory() -> int | None:
+    """Return ``MemAvailable`` from ``/proc/meminfo`` in bytes, if the kernel reports it."""
+
+    try:
+        with open("/proc/meminfo", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class TmpfsWorkdirs:
+    """Admit workdirs onto a RAM-backed filesystem while memory allows it.
+
+    Every admitted workdir reserves an estimate of its size, recorded in its
+    name (``unidesign_ram<bytes>_*``), so the reservations of all processes
+    sharing ``base_dir`` are visible to each other and vanish with the
+    directories, including ones left behind by a crash. :meth:`create`
+    refuses a workdir when the reservations would exceed ``max_bytes`` or
+    when free space on ``base_dir`` or available memory would fall below
+    ``min_free_bytes``; the runner then creates the workdir on disk instead.
+
+    The estimate starts at ``reserve_bytes`` and grows to the largest workdir
+    reported to :meth:`observe`.
+
+    Parameters
+    ----------
+    base_dir:
+        Mount point of the tmpfs, ``/dev/shm`` by default.
+    max_bytes:
+        Cap on the reservations of all workdirs under ``base_dir``; half the
+        size of the filesystem by default.
+    reserve_bytes:
+        Initial size estimate of one workdir.
+    min_free_bytes:
+        Free space and available memory to leave untouched.
+    """
+
+    _PREFIX = "unidesign_ram"
+    _NAME = re.compile(rf"{_PREFIX}(\d+)_")
+    _LOCK_NAME = ".unidesign_tmpfs.lock"
+
+    def __init__(
+        self,
+        base_dir: os.PathLike[str] | str = "/dev/shm",
+        *,
+        max_bytes: int | None = None,
+        reserve_bytes: int = 64 << 20,
+        min_free_bytes: int = 256 << 20,
+    ) -> None:
+        self._base_dir = Path(base_dir)
+        if not self._base_dir.is_dir():
+            raise ValueError(f"{self._base_dir} is not a directory")
+        if reserve_bytes <= 0:
+            raise ValueError("reserve_bytes must be positive")
+        if min_free_bytes < 0:
+            raise ValueError("min_free_bytes must not be negative")
+        if max_bytes is None:
+            stat = os.statvfs(self._base_dir)
+            max_bytes = stat.f_blocks * stat.f_frsize // 2
+        self._max_bytes = max_bytes
+        self._min_free_bytes = min_free_bytes
+        self._estimate = reserve_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def base_dir(self) -> Path:
+        return self._base_dir
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def estimate(self) -> int:
+        """Bytes reserved for the next admitted workdir."""
+
+        return self._estimate
+
+    def owns(self, workdir: os.PathLike[str] | str) -> bool:
+        """Whether ``workdir`` was admitted onto this filesystem."""
+
+        workdir = Path(workdir)
+        return workdir.parent == self._base_dir and self._NAME.match(workdir.name) is not None
+
+    def reserved(self) -> int:
+        """Sum of the reservations of every workdir currently under :attr:`base_dir`."""
+
+        total = 0
+        try:
+            with os.scandir(self._base_dir) as entries:
+                for entry in entries:
+                    match = self._NAME.match(entry.name)
+                    if match is not None:
+                        total += int(match.group(1))
+        except OSError:
+            pass
+        return total
+
+    def observe(self, workdir_bytes: int) -> None:
+        """Raise the estimate to ``workdir_bytes`` if a finished run grew that large."""
+
+        with self._lock:
+            self._estimate = max(self._estimate, workdir_bytes)
+
+    @contextlib.contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(self._base_dir / self._LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def _admit(self) -> str | None:
+        """Return a ``mkdtemp`` prefix reserving room for one workdir, or ``None`` if full."""
+
+        estimate = self._estimate
+        if self.reserved() + estimate > self._max_bytes:
+            return None
+        stat = os.statvfs(self._base_dir)
+        if stat.f_bavail * stat.f_frsize - estimate < self._min_free_bytes:
+            return None
+        memory = _available_memory()
+        if memory is not None and memory - estimate < self._min_free_bytes:
+            return None
+        return f"{self._PREFIX}{estimate}_"
+
+    def create(self) -> Path | None:
+        """Create an admitted workdir under :attr:`base_dir`, or return ``None`` if full."""
+
+        with self._exclusive():
+            prefix = self._admit()
+            if prefix is None:
+                return None
+            return Path(tempfile.mkdtemp(prefix=prefix, dir=self._base_dir))
+
+
+class TmpfsWorkdir:
+    """Handle for a :class:`TmpfsWorkdirs` workdir with the ``TemporaryDirectory`` interface.
+
+    Deleting the directory is what releases its reservation, so a persisted
+    workdir keeps holding memory until it is relocated or removed.
+    """
+
+    __slots__ = ("name", "_persist")
+
+    def __init__(self, workdir: Path, *, persist: bool) -> None:
+        self.name = str(workdir)
+        self._persist = persist
+
+    def cleanup(self) -> None:
+        if not self._persist:
+            shutil.rmtree(self.name, ignore_errors=True)
+
+
+__all__ = ["PooledWorkdir", "TmpfsWorkdir", "TmpfsWorkdirs", "WorkdirPool"]
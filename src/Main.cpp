@@ -108,6 +108,8 @@ char MOL2[MAX_LEN_FILE_NAME + 1] = "mol2.mol2";
 char DES_CHAINS[10] = "A";
 int  NTRAJ = 1;
 int  NTRAJ_START_NDX = 1;
+// seed of the random number generator; negative means seeding from the clock
+int  RANDOM_SEED = -1;
 // parameters for PPI design
 double CUT_PPI_DIST_SHELL1 = 5.0;
 double CUT_PPI_DIST_SHELL2 = 8.0;
@@ -174,6 +176,7 @@ int PROT_LEN_NORM = 100;
 #define PROGRAM_FLAGS
 
 BOOL FLAG_PDB = FALSE;
+BOOL FLAG_PDBLIST = FALSE;
 BOOL FLAG_MOL2 = FALSE;
 
 BOOL FLAG_MONOMER = TRUE;
@@ -321,6 +324,7 @@ struct option LONG_OPTS[] = {
   {"resi_pair",            required_argument, NULL,   60},
   {"excl_resi",            required_argument, NULL,   61},
   {"lig_placing",          required_argument, NULL,   62},
+  {"random_seed",          required_argument, NULL,   64},
   {NULL,                   no_argument,       NULL,    0},
 };
 
@@ -516,6 +520,7 @@ int main(int argc, char* argv[])
       break;
     case 22:
       strcpy(PDBLIST, optarg);
+      FLAG_PDBLIST = TRUE;
       break;
     case 23:
       FLAG_WILDTYPE_ONLY = TRUE;
@@ -672,6 +677,9 @@ int main(int argc, char* argv[])
     case 62:
       strcpy(FILE_LIG_PLACEMENT, optarg);
       break;
+    case 64:
+      RANDOM_SEED = atoi(optarg);
+      break;
     case 37:
       strcpy(PREFIX, optarg);
       break;
@@ -966,7 +974,14 @@ int main(int argc, char* argv[])
     RamaTable ramatable;
     AApropensityTableReadFromFile(&aapptable, FILE_AAPROPENSITY);
     RamaTableReadFromFile(&ramatable, FILE_RAMACHANDRAN);
-    if (FLAG_BBDEP_ROTLIB == TRUE)
+    if (FLAG_PDBLIST == TRUE)
+    {
+      if (FAILED(ComputeStabilityOfPDBList(PDBLIST, FLAG_BBDEP_ROTLIB, FILE_ROTLIB_BIN, &atomParam, &resiTopo, &aapptable, &ramatable)))
+      {
+        exit(IOError);
+      }
+    }
+    else if (FLAG_BBDEP_ROTLIB == TRUE)
     {
       ComputeStructureStabilityByBBdepRotLib2(&structure, &aapptable, &ramatable, FILE_ROTLIB_BIN, energyTerms);
     }
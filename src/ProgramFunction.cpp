@@ -125,7 +125,8 @@ int PrintHelp()
     "   --rotate_hydroxyl=arg     arg = yes/no, turning on/off the flag for rotating Ser, Thr, and Tyr hydroxyl hydrogen (default: on)\n"
     "   --xdeviation=arg          arg is a float value cutoff for side-chain Chi angle deviation\n"
     "   --wread=arg               arg is a energy-weight file\n"
-    "   --pdblist=arg             arg is a file recording a list of PDB IDs, each in one line\n"
+    "   --pdblist=arg             arg is a file recording a list of PDB IDs, each in one line;\n"
+    "                             for command ComputeStability, a list of PDB files that are all scored in one run\n"
     "   --wildtype_only\n"
     "   --rotlib=arg              arg is the name of a rotamer lib\n"
     "   --pdb2=arg                arg is the 2nd PDB file for comparing side-chains by command CompareSideChain\n"
@@ -134,6 +135,7 @@ int PrintHelp()
     "   --pli_shell2=arg          arg is the distance cutoff for the 2nd shell of protein-ligand interaction (default: 8.0 Angstroms)\n"
     "   --clash_ratio=arg         arg is a float value cutoff for the command CheckClash[0-2] (default: 0.6)\n"
     "   --ntraj=arg               arg is an integer for the number of independent protein design trajectories (default: 1)\n"
+    "   --random_seed=arg         arg is a non-negative integer seed for the simulated annealing (default: seeded from the clock)\n"
     "   --excl_low_prob=arg       arg is a flat value cutoff for excluding low-probability rotamers (default: 0.03), 0~0.05 suggested\n"
     "   --interface_only\n"
     "   --seq=arg                 arg is a single-line plain-text FASTA protein sequence file\n"
@@ -476,6 +478,48 @@ int ComputeStructureStabilityByBBdepRotLib2(Structure* pStructure, AAppTable* pA
 }
 
 
+// score every PDB file listed in pdblist, one path per line, within a single process;
+// each energy block is preceded by "ComputeStability structure <n>: <path>"
+int ComputeStabilityOfPDBList(char* pdblist, BOOL bbdep, char* dunlibfile, AtomParamsSet* atomParams, ResiTopoSet* resiTopos, AAppTable* pAAppTable, RamaTable* pRama)
+{
+  FileReader fr;
+  if (FAILED(FileReaderCreate(&fr, pdblist)))
+  {
+    printf("in file %s line %d, failed to open pdb list %s\n", __FILE__, __LINE__, pdblist);
+    return IOError;
+  }
+  char line[MAX_LEN_ONE_LINE_CONTENT + 1];
+  int index = 0;
+  while (!FAILED(FileReaderGetNextLine(&fr, line)))
+  {
+    if (strlen(line) == 0) continue;
+    index++;
+    printf("\nComputeStability structure %d: %s\n", index, line);
+    Structure model;
+    StructureCreate(&model);
+    if (FAILED(StructureReadPDB(&model, line, atomParams, resiTopos)))
+    {
+      printf("failed to parse pdb file %s\n", line);
+      StructureDestroy(&model);
+      continue;
+    }
+    StructureCalcPhiPsi(&model);
+    double energyTerms[MAX_ENERGY_TERM] = { 0 };
+    if (bbdep == TRUE)
+    {
+      ComputeStructureStabilityByBBdepRotLib2(&model, pAAppTable, pRama, dunlibfile, energyTerms);
+    }
+    else
+    {
+      ComputeStructureStability(&model, pAAppTable, pRama, energyTerms);
+    }
+    StructureDestroy(&model);
+  }
+  FileReaderDestroy(&fr);
+  return Success;
+}
+
+
 int ComputeBinding(Structure* pStructure)
 {
   if (StructureGetChainCount(pStructure) > 2)
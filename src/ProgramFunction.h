@@ -28,6 +28,7 @@ int PrintOutProgramInformation();
 int ComputeStructureStability(Structure* pStructure, AAppTable* pAAppTable, RamaTable* pRama, double energyTerms[MAX_ENERGY_TERM]);
 int ComputeStructureStabilityByBBdepRotLib(Structure* pStructure, AAppTable* pAAppTable, RamaTable* pRama, BBdepRotamerLib* pRotLib, double energyTerms[MAX_ENERGY_TERM]);
 int ComputeStructureStabilityByBBdepRotLib2(Structure* pStructure, AAppTable* pAAppTable, RamaTable* pRama, char* dunlibfile, double energyTerms[MAX_ENERGY_TERM]);
+int ComputeStabilityOfPDBList(char* pdblist, BOOL bbdep, char* dunlibfile, AtomParamsSet* atomParams, ResiTopoSet* resiTopos, AAppTable* pAAppTable, RamaTable* pRama);
 
 int ComputeBinding(Structure* pStructure);
 int ComputeBindingWithChainSplitting(Structure* pStructure, char split1[], char split2[]);
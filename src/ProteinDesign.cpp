@@ -47,6 +47,7 @@ extern char FILE_CATACONS[MAX_LEN_FILE_NAME + 1];
 extern int PROT_LEN_NORM;
 extern int NTRAJ;
 extern int NTRAJ_START_NDX;
+extern int RANDOM_SEED;
 
 extern char PDBID[MAX_LEN_FILE_NAME + 1];
 extern char DES_CHAINS[MAX_LEN_ONE_LINE_CONTENT + 1];
@@ -1209,7 +1210,7 @@ int SimulatedAnnealing(Structure* pStruct, RotamerList* pList)
 {
   int result = Success;
   char errMsg[MAX_LEN_ERR_MSG + 1];
-  srand((unsigned int)time(NULL));
+  srand(RANDOM_SEED >= 0 ? (unsigned int)RANDOM_SEED : (unsigned int)time(NULL));
 
   StringArray* pRotTypes = (StringArray*)malloc(sizeof(StringArray) * pList->desSiteCount);
   IntArray* pRotCounts = (IntArray*)malloc(sizeof(IntArray) * pList->desSiteCount);